@@ -1,11 +1,29 @@
 import threading
 import time
 from Rengar import Rengar
+from LCUPoller import MATCHMAKING, shared_poller
 
 class autoaccept:
     def __init__(self):
-        self.auto_accept_enabled = False
+        self._enabled = False
         self.rengar = Rengar()
+        # Obtido só ao ligar: chamadas avulsas do api_bridge não iniciam threads de polling
+        self.poller = None
+
+    @property
+    def auto_accept_enabled(self):
+        return self._enabled
+
+    @auto_accept_enabled.setter
+    def auto_accept_enabled(self, value):
+        # O estado do matchmaking só é consultado enquanto o auto accept estiver ligado
+        self._enabled = bool(value)
+        if self._enabled:
+            if self.poller is None:
+                self.poller = shared_poller()
+            self.poller.subscribe(MATCHMAKING, self._on_matchmaking)
+        elif self.poller is not None:
+            self.poller.unsubscribe(MATCHMAKING, self._on_matchmaking)
 
     def toggle_auto_accept(self):
         self.auto_accept_enabled = not self.auto_accept_enabled
@@ -15,19 +33,14 @@ class autoaccept:
     def accept_match(self):
         response = self.rengar.lcu_request("POST", f"/lol-matchmaking/v1/ready-check/accept", "")
 
+    def _on_matchmaking(self, snapshot):
+        if self.auto_accept_enabled and snapshot.search_state == "Found":
+            self.accept_match()  # Não há um ID de partida, basta aceitar
+
     def monitor_queue(self):
+        # Compatibilidade: o polling agora fica no LCUPoller compartilhado
+        if self.poller is None:
+            self.poller = shared_poller()
+        self.poller.start()
         while True:
-            if self.auto_accept_enabled:
-                # Faz a requisição para verificar o estado da busca por partida
-                response = self.rengar.lcu_request("GET", "/lol-lobby/v2/lobby/matchmaking/search-state", "")
-                
-                if response.status_code == 200:
-                    match_data = response.json()
-                    #print(match_data)
-                    # Exibe o conteúdo da resposta para verificar o estado do matchmaking
-                    #print("Matchmaking Data:", match_data)
-
-                    if match_data.get("searchState") == "Found":
-                        self.accept_match()  # Não há um ID de partida, basta aceitar
-            
-            time.sleep(0.5)
\ No newline at end of file
+            time.sleep(60)
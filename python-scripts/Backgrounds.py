@@ -1,5 +1,12 @@
+from bisect import bisect_left
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, List, Set, Tuple
+
 import requests
+from Names import name_tokens, trigrams
 from Rengar import Rengar
+from SkinCatalog import SkinCatalog
 from termcolor import colored
 
 rengar = Rengar()
@@ -12,58 +19,20 @@ class Champ:
         self.skins = []
 
 
-def fetch_all_champion_skins():
-    """Fetch all champion skins from Community Dragon"""
-    url = "https://raw.communitydragon.org/latest/plugins/rcp-be-lol-game-data/global/default/v1/skins.json"
-    
+def fetch_all_champion_skins(catalog=None):
+    """Fetch all champion skins from the local skin catalog"""
+    if catalog is None:
+        catalog = SkinCatalog()
+
     try:
-        response = requests.get(url, timeout=10)
-        
-        if response.status_code != 200:
-            print(colored("Error while searching skins.", "red"))
-            return None
-        
-        skins_data = response.json()
+        catalog.ensure_loaded()
         champs = {}
 
-        for skin_id, current_skin in skins_data.items():
-            load_screen_path = current_skin.get("loadScreenPath", "")
-            
-            if "ASSETS/Characters/" not in load_screen_path:
-                continue
-                
-            name_start = load_screen_path.find("ASSETS/Characters/") + len("ASSETS/Characters/")
-            champ_name = load_screen_path[name_start:load_screen_path.find('/', name_start)]
-
-            name = current_skin.get("name", "")
-            skin = {}
-
-            if current_skin.get("isBase", False):
-                if champ_name not in champs:
-                    champs[champ_name] = Champ(name=champ_name)
-                
-                champ_key = skin_id
-                if champ_key.endswith("000"):
-                    champ_key = champ_key[:-3]
-                
-                champs[champ_name].key = int(champ_key)
-                skin["id"] = skin_id
-                skin["name"] = "default"
-                champs[champ_name].skins.insert(0, skin)
-            else:
-                if champ_name not in champs:
-                    champs[champ_name] = Champ(name=champ_name)
-                    
-                if current_skin.get("questSkinInfo"):
-                    skin_tiers = current_skin["questSkinInfo"].get("tiers", [])
-                    for skin_tier in skin_tiers:
-                        skin["id"] = skin_tier.get("id", "")
-                        skin["name"] = skin_tier.get("name", "")
-                        champs[champ_name].skins.append(skin.copy())
-                else:
-                    skin["id"] = skin_id
-                    skin["name"] = name
-                    champs[champ_name].skins.append(skin.copy())
+        for champ_name, key, first, count in catalog.champions():
+            champ = Champ(name=champ_name, key=key)
+            # The catalog stores ids as ints; skin dicts keep the string ids of skins.json
+            champ.skins = [{"id": str(skin_id), "name": name} for skin_id, name in catalog.skins(first, count)]
+            champs[champ_name] = champ
 
         return champs
         
@@ -75,20 +44,135 @@ def fetch_all_champion_skins():
         return None
 
 
+@dataclass
+class SkinSearchPage:
+    """One page of ranked skin search results."""
+    results: List[dict]
+    total: int
+    page: int
+    page_size: int
+
+    @property
+    def has_next(self):
+        return (self.page + 1) * self.page_size < self.total
+
+
+class SkinSearchIndex:
+    """
+    Token, prefix and trigram index over champion and skin names.
+
+    Results are ranked exact, then prefix, then substring, then fuzzy;
+    within a rank they keep catalog order. A skin also matches on its
+    champion's name, so searching a champion lists all of its skins.
+    """
+
+    FUZZY_CUTOFF = 0.35
+    CACHE_SIZE = 64
+
+    def __init__(self, champions):
+        self._skins: List[dict] = []
+        self._names: List[Tuple[str, str]] = []
+        self._compact: List[str] = []
+        self._gram_counts: List[int] = []
+        self._tokens: Dict[str, Set[int]] = {}
+        self._grams: Dict[str, Set[int]] = {}
+        self._cache: "OrderedDict[str, List[int]]" = OrderedDict()
+
+        for champ_name, champ_data in champions.items():
+            for skin in champ_data.skins:
+                doc = len(self._skins)
+                skin_tokens = name_tokens(skin["name"])
+                champ_tokens = name_tokens(champ_name)
+                self._skins.append(skin)
+                self._names.append((" ".join(skin_tokens), " ".join(champ_tokens)))
+                compact = "".join(skin_tokens) + " " + "".join(champ_tokens)
+                self._compact.append(compact)
+
+                for token in skin_tokens + champ_tokens:
+                    self._tokens.setdefault(token, set()).add(doc)
+                grams = trigrams(compact, padded=False)
+                self._gram_counts.append(len(grams))
+                for gram in grams:
+                    self._grams.setdefault(gram, set()).add(doc)
+
+        self._sorted_tokens = sorted(self._tokens)
+
+    def __len__(self):
+        return len(self._skins)
+
+    def _prefix_docs(self, prefix):
+        docs = set()
+        i = bisect_left(self._sorted_tokens, prefix)
+        while i < len(self._sorted_tokens) and self._sorted_tokens[i].startswith(prefix):
+            docs |= self._tokens[self._sorted_tokens[i]]
+            i += 1
+        return docs
+
+    def _rank(self, query):
+        tokens = name_tokens(query)
+        if not tokens:
+            return []
+
+        phrase = " ".join(tokens)
+        compact = "".join(tokens)
+        ranks: Dict[int, float] = {}
+
+        # Prefix: every query token starts some token of the skin or champion name;
+        # exact when the whole skin or champion name equals the query
+        prefixed = None
+        for token in tokens:
+            docs = self._prefix_docs(token)
+            prefixed = docs if prefixed is None else prefixed & docs
+        for doc in prefixed or ():
+            ranks[doc] = 0 if phrase in self._names[doc] else 1
+
+        # Substring and fuzzy matches share the trigram candidates
+        query_grams = trigrams(compact, padded=False)
+        shared: Dict[int, int] = {}
+        for gram in query_grams:
+            for doc in self._grams.get(gram, ()):
+                shared[doc] = shared.get(doc, 0) + 1
+
+        for doc, count in shared.items():
+            if doc in ranks:
+                continue
+            if count == len(query_grams) and compact in self._compact[doc]:
+                ranks[doc] = 2
+                continue
+            score = 2 * count / (len(query_grams) + self._gram_counts[doc])
+            if score >= self.FUZZY_CUTOFF:
+                ranks[doc] = 4 - score
+
+        return sorted(ranks, key=lambda doc: (ranks[doc], doc))
+
+    def _ranked(self, query):
+        key = " ".join(name_tokens(query))
+        if key in self._cache:
+            self._cache.move_to_end(key)
+            return self._cache[key]
+
+        ranked = self._rank(query)
+        self._cache[key] = ranked
+        if len(self._cache) > self.CACHE_SIZE:
+            self._cache.popitem(last=False)
+        return ranked
+
+    def search(self, query, page=0, page_size=20):
+        """Get one page of ranked results for query."""
+        ranked = self._ranked(query)
+        start = page * page_size
+        results = [self._skins[doc] for doc in ranked[start:start + page_size]]
+        return SkinSearchPage(results, len(ranked), page, page_size)
+
+    def search_all(self, query):
+        """Get every ranked result for query."""
+        return [self._skins[doc] for doc in self._ranked(query)]
+
+
 def search_skins_by_name(champions, search_query):
     """Search skins by champion name or skin name"""
-    found_skins = []
-    search_lower = search_query.lower()
-    
-    for champ_name, champ_data in champions.items():
-        if search_lower in champ_name.lower():
-            found_skins.extend(champ_data.skins)
-        else:
-            for skin in champ_data.skins:
-                if search_lower in skin['name'].lower():
-                    found_skins.append(skin)
-    
-    return found_skins
+    index = champions if isinstance(champions, SkinSearchIndex) else SkinSearchIndex(champions)
+    return index.search_all(search_query)
 
 
 def change_profile_background(skin_id):
@@ -123,7 +207,7 @@ def change_background():
         return False
 
     skin_name = input(colored("Type the champion or skin name: ", "magenta"))
-    skins = search_skins_by_name(champions, skin_name)
+    skins = search_skins_by_name(SkinSearchIndex(champions), skin_name)
 
     if not skins:
         print(colored("Skin not found.", "yellow"))
@@ -0,0 +1,130 @@
+"""
+Bounded-parallel bulk operations with rate limiting, retries and progress.
+"""
+
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterable, List, Optional, Tuple, Type
+
+
+class TransientError(Exception):
+    """Raised by an operation for failures worth retrying (timeouts, 429, 5xx)."""
+
+
+class TokenBucket:
+    """Token bucket allowing `rate` acquisitions per second with bursts of `capacity`."""
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Block until a token is available and take it."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+@dataclass
+class ItemOutcome:
+    """Result of the operation for a single item."""
+    item: Any
+    success: bool
+    attempts: int
+    error: Optional[str] = None
+
+
+@dataclass
+class BulkReport:
+    """Outcomes of a bulk run, in input order."""
+    outcomes: List[ItemOutcome] = field(default_factory=list)
+    elapsed: float = 0.0
+
+    @property
+    def succeeded(self) -> int:
+        return sum(1 for outcome in self.outcomes if outcome.success)
+
+    @property
+    def failed(self) -> int:
+        return len(self.outcomes) - self.succeeded
+
+
+ProgressCallback = Callable[[int, int, ItemOutcome], None]
+
+
+def run_bulk(items: Iterable[Any],
+             operation: Callable[[Any], bool],
+             concurrency: int = 8,
+             rate: Optional[float] = 20.0,
+             retries: int = 2,
+             backoff: float = 0.25,
+             retry_on: Tuple[Type[BaseException], ...] = (TransientError,),
+             on_progress: Optional[ProgressCallback] = None) -> BulkReport:
+    """
+    Run operation(item) for every item with bounded parallelism.
+
+    Args:
+        items: Items to process
+        operation: Returns True on success, False on a permanent failure; raises
+            one of retry_on for transient failures
+        concurrency: Maximum operations in flight
+        rate: Maximum operation starts per second (None for unlimited)
+        retries: Extra attempts for transient failures
+        backoff: Base delay of the exponential backoff between attempts
+        retry_on: Exception types treated as transient
+        on_progress: Called as on_progress(done, total, outcome) after each item
+
+    Returns:
+        BulkReport with one ItemOutcome per item
+    """
+    items = list(items)
+    bucket = TokenBucket(rate) if rate else None
+    outcomes: List[Optional[ItemOutcome]] = [None] * len(items)
+    done = 0
+    done_lock = threading.Lock()
+    start = time.monotonic()
+
+    def attempt(index: int) -> None:
+        nonlocal done
+        item = items[index]
+        outcome = None
+
+        for attempt_no in range(1, retries + 2):
+            if bucket:
+                bucket.acquire()
+            try:
+                success = bool(operation(item))
+                outcome = ItemOutcome(item, success, attempt_no, None if success else "failed")
+                break
+            except retry_on as e:
+                outcome = ItemOutcome(item, False, attempt_no, str(e) or type(e).__name__)
+                if attempt_no <= retries:
+                    time.sleep(backoff * (2 ** (attempt_no - 1)) * (0.5 + random.random()))
+            except Exception as e:
+                outcome = ItemOutcome(item, False, attempt_no, str(e) or type(e).__name__)
+                break
+
+        outcomes[index] = outcome
+        with done_lock:
+            done += 1
+            current = done
+        if on_progress:
+            on_progress(current, len(items), outcome)
+
+    with ThreadPoolExecutor(max_workers=max(1, concurrency), thread_name_prefix="Bulk") as pool:
+        list(pool.map(attempt, range(len(items))))
+
+    return BulkReport(outcomes, time.monotonic() - start)
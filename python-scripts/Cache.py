@@ -0,0 +1,186 @@
+"""
+Small thread-safe LRU cache with per-entry TTL, the per-endpoint response
+cache Rengar builds on it, and single-flight coalescing of in-flight calls.
+"""
+
+import fnmatch
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+_MISSING = object()
+
+
+class TTLCache:
+    """LRU cache whose entries expire ttl seconds after being set."""
+
+    def __init__(self, maxsize: int = 256, ttl: Optional[float] = 60.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Get a live entry, or default if it is missing or expired."""
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is not _MISSING:
+                expires_at, value = entry
+                if expires_at is None or expires_at > time.monotonic():
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._data[key]
+            self.misses += 1
+            return default
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = _MISSING) -> None:
+        """Store value; ttl overrides the cache default (None never expires)."""
+        if ttl is _MISSING:
+            ttl = self.ttl
+        expires_at = None if ttl is None else time.monotonic() + ttl
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def invalidate(self, key: Hashable = _MISSING) -> None:
+        """Drop one entry, or everything when no key is given."""
+        with self._lock:
+            if key is _MISSING:
+                self._data.clear()
+            else:
+                self._data.pop(key, None)
+
+    def keys(self) -> List[Hashable]:
+        """Get the keys currently stored (live or not yet evicted)."""
+        with self._lock:
+            return list(self._data)
+
+    def stats(self) -> dict:
+        """Get hit/miss counters and current size."""
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "size": len(self._data)}
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            entry = self._data.get(key)
+            return entry is not None and (entry[0] is None or entry[0] > time.monotonic())
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._data)
+
+
+@dataclass
+class CacheRule:
+    """
+    Cache GET responses for endpoints matching pattern (fnmatch syntax).
+
+    invalidated_by lists (method, pattern) pairs of writes that clear this rule.
+    """
+    pattern: str
+    ttl: Optional[float] = 60.0
+    maxsize: int = 32
+    invalidated_by: List[Tuple[str, str]] = field(default_factory=list)
+
+
+class ResponseCache:
+    """Per-endpoint read cache driven by a list of CacheRules."""
+
+    def __init__(self, rules: List[CacheRule]):
+        self._rules = [
+            (rule, re.compile(fnmatch.translate(rule.pattern)), TTLCache(rule.maxsize, rule.ttl))
+            for rule in rules
+        ]
+
+    def _match(self, endpoint: str) -> Optional[TTLCache]:
+        for _, regex, cache in self._rules:
+            if regex.match(endpoint):
+                return cache
+        return None
+
+    def get(self, endpoint: str) -> Any:
+        """Get the cached response for endpoint, or None."""
+        cache = self._match(endpoint)
+        return cache.get(endpoint) if cache is not None else None
+
+    def put(self, endpoint: str, response: Any) -> None:
+        """Store a response if some rule covers endpoint."""
+        cache = self._match(endpoint)
+        if cache is not None:
+            cache.set(endpoint, response)
+
+    def on_write(self, method: str, endpoint: str) -> None:
+        """Clear rules invalidated by a write to endpoint."""
+        for rule, _, cache in self._rules:
+            for write_method, pattern in rule.invalidated_by:
+                if write_method == method and fnmatch.fnmatchcase(endpoint, pattern):
+                    cache.invalidate()
+                    break
+
+    def invalidate(self, pattern: Optional[str] = None) -> None:
+        """Clear cached endpoints matching pattern, or everything."""
+        for rule, _, cache in self._rules:
+            if pattern is None or pattern == rule.pattern:
+                cache.invalidate()
+            else:
+                for key in cache.keys():
+                    if fnmatch.fnmatchcase(key, pattern):
+                        cache.invalidate(key)
+
+    def stats(self) -> Dict[str, dict]:
+        """Get hit/miss counters per rule pattern."""
+        return {rule.pattern: cache.stats() for rule, _, cache in self._rules}
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls with the same key: the first caller runs the
+    function, callers arriving while it is in flight wait for and share its
+    result (or exception).
+    """
+
+    def __init__(self):
+        self.calls = 0
+        self.shared = 0
+        self._inflight: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: Hashable, func: Callable[[], Any]) -> Any:
+        with self._lock:
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._inflight[key] = future
+                self.calls += 1
+            else:
+                self.shared += 1
+
+        if not leader:
+            return future.result()
+
+        try:
+            result = func()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._inflight[key]
+
+    def stats(self) -> dict:
+        """Get how many calls ran and how many callers piggybacked on one."""
+        with self._lock:
+            return {"calls": self.calls, "shared": self.shared, "inflight": len(self._inflight)}
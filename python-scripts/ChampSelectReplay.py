@@ -0,0 +1,428 @@
+"""
+Record champion select sessions and replay them against InstalockAutoban.
+
+A recording is gzip-compressed NDJSON, one object per line:
+
+    {"type": "header", "version": 1, "game_version": ..., "locale": ..., "config": {...}}
+    {"type": "roster", "t": 0.0, "data": [grid champions]}
+    {"type": "session", "t": 1.25, "event": "Update", "data": {session} | null}
+    {"type": "request", "t": 1.31, "method": "PATCH", "endpoint": ..., "body": ..., "status": 204}
+
+t is seconds since the recording started. Replaying feeds every session to
+an InstalockAutoban wired to a FakeRengar and measures how long it takes from
+our action turning isInProgress to the PATCH that completes it.
+
+Usage:
+    python ChampSelectReplay.py record out.ndjson.gz [--pick NAME] [--ban NAME]
+    python ChampSelectReplay.py replay in.ndjson.gz [--pick NAME] [--ban NAME] [--mode engine|poll] [--speed X]
+"""
+
+import argparse
+import copy
+import gzip
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+import time
+from collections import Counter
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from InstalockAutoban import SESSION_URI, InstalockAutoban
+from LCUPoller import CHAMP_SELECT, ChampSelectSessionSnapshot
+from LCUResponse import LCUResponse
+
+logger = logging.getLogger(__name__)
+
+FORMAT_VERSION = 1
+ACTION_ENDPOINT = re.compile(r"/lol-champ-select/v1/session/actions/(\d+)$")
+
+
+def write_recording(path: str, records: List[dict]) -> None:
+    with gzip.open(path, "wt", encoding="utf-8") as f:
+        for record in records:
+            f.write(json.dumps(record) + "\n")
+
+
+def read_recording(path: str) -> Iterator[dict]:
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+class ChampSelectRecorder:
+    """
+    Writes champion select session events, and the writes the given Rengar
+    makes to champion select, to a recording.
+
+    The Rengar should be the one whose requests are of interest (e.g. the
+    InstalockAutoban's own), since only its calls are captured.
+    """
+
+    def __init__(self, rengar, path: str, config: Optional[dict] = None):
+        self.rengar = rengar
+        self.path = path
+        self.config = config or {}
+        self._file = None
+        self._start = 0.0
+        self._lock = threading.Lock()
+        self._request = None
+
+    def start(self) -> None:
+        self._file = gzip.open(self.path, "wt", encoding="utf-8")
+        self._start = time.monotonic()
+
+        version = self.rengar.lcu_request("GET", "/lol-patch/v1/game-version", "")
+        region = self.rengar.lcu_request("GET", "/riotclient/region-locale", "")
+        roster = self.rengar.lcu_request("GET", "/lol-champ-select/v1/all-grid-champions", "")
+        self._write({
+            "type": "header",
+            "version": FORMAT_VERSION,
+            "started": time.time(),
+            "game_version": version.json() if version.status_code == 200 else None,
+            "locale": region.json().get("locale") if region.status_code == 200 else None,
+            "config": self.config,
+        })
+        self._write({"type": "roster", "t": 0.0, "data": roster.json() if roster.status_code == 200 else []})
+
+        # Capture our own champ select writes by wrapping this instance's lcu_request
+        self._request = self.rengar.lcu_request
+        self.rengar.lcu_request = self._recording_request
+        self.rengar.subscribe(SESSION_URI, self._on_session_event)
+
+    def stop(self) -> None:
+        if self._file is None:
+            return
+        self.rengar.unsubscribe(SESSION_URI, self._on_session_event)
+        del self.rengar.lcu_request
+        with self._lock:
+            self._file.close()
+            self._file = None
+
+    def _elapsed(self) -> float:
+        return round(time.monotonic() - self._start, 6)
+
+    def _write(self, record: dict) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.write(json.dumps(record) + "\n")
+                self._file.flush()
+
+    def _on_session_event(self, event: dict) -> None:
+        if event.get("uri") != SESSION_URI:
+            return
+        data = None if event.get("eventType") == "Delete" else event.get("data")
+        self._write({"type": "session", "t": self._elapsed(), "event": event.get("eventType"), "data": data})
+
+    def _recording_request(self, method, endpoint, body, timeout=None):
+        response = self._request(method, endpoint, body, timeout)
+        if method.upper() != "GET" and endpoint.startswith("/lol-champ-select/"):
+            self._write({
+                "type": "request",
+                "t": self._elapsed(),
+                "method": method.upper(),
+                "endpoint": endpoint,
+                "body": body or None,
+                "status": response.status_code,
+            })
+        return response
+
+
+def _response(status_code: int, payload: Any = None) -> LCUResponse:
+    return LCUResponse(status_code, b"" if payload is None else json.dumps(payload).encode("utf-8"))
+
+
+class FakeRengar:
+    """
+    In-memory Rengar stand-in serving a recorded champion select.
+
+    The current session is whatever the replayer last set; every call is kept
+    in calls as (perf_counter time, method, endpoint, body).
+    """
+
+    def __init__(self, roster: List[dict], game_version: Optional[str] = None, locale: Optional[str] = None):
+        self.roster = roster
+        self.game_version = game_version or "replay"
+        self.locale = locale or "en_US"
+        self.session: Optional[dict] = None
+        self.calls: List[Tuple[float, str, str, Any]] = []
+        self._handlers: Dict[str, List] = {}
+        self._lock = threading.Lock()
+
+    def lcu_request(self, method, endpoint, body, timeout=None):
+        method = method.upper()
+        with self._lock:
+            self.calls.append((time.perf_counter(), method, endpoint, body or None))
+
+        if method == "GET":
+            if endpoint == SESSION_URI:
+                return _response(200, self.session) if self.session else _response(404, {
+                    "errorCode": "RPC_ERROR", "httpStatus": 404, "message": "No active delegate"})
+            if endpoint in ("/lol-champ-select/v1/all-grid-champions",
+                            "/lol-champions/v1/owned-champions-minimal"):
+                return _response(200, self.roster)
+            if endpoint == "/lol-patch/v1/game-version":
+                return _response(200, self.game_version)
+            if endpoint == "/riotclient/region-locale":
+                return _response(200, {"locale": self.locale})
+        elif method == "PATCH" and ACTION_ENDPOINT.match(endpoint) and self.session:
+            return _response(204)
+        return _response(404)
+
+    def subscribe(self, uri_prefix, handler):
+        self._handlers.setdefault(uri_prefix, []).append(handler)
+
+    def unsubscribe(self, uri_prefix, handler=None):
+        handlers = self._handlers.get(uri_prefix, [])
+        if handler is None:
+            handlers.clear()
+        elif handler in handlers:
+            handlers.remove(handler)
+
+    def push(self, event: dict) -> None:
+        """Deliver a session event to subscribers, as the websocket would."""
+        uri = event.get("uri", "")
+        for prefix, handlers in list(self._handlers.items()):
+            if uri.startswith(prefix):
+                for handler in list(handlers):
+                    handler(event)
+
+
+@dataclass
+class Decision:
+    action_id: int
+    type: str
+    latency_ms: Optional[float]
+    champion_id: Optional[int] = None
+
+
+@dataclass
+class ReplayReport:
+    """Outcome of one replay."""
+    mode: str
+    snapshots: int = 0
+    decisions: List[Decision] = field(default_factory=list)
+    missed: List[Decision] = field(default_factory=list)
+    requests: Dict[str, int] = field(default_factory=dict)
+    recorded_requests: int = 0
+
+    def latency(self, percentile: float) -> Optional[float]:
+        values = sorted(d.latency_ms for d in self.decisions if d.latency_ms is not None)
+        if not values:
+            return None
+        return values[min(len(values) - 1, int(percentile / 100 * len(values)))]
+
+    def to_dict(self) -> dict:
+        result = asdict(self)
+        result["p50_ms"] = self.latency(50)
+        result["max_ms"] = self.latency(100)
+        return result
+
+
+def _own_in_progress(session: Optional[dict]) -> Dict[int, str]:
+    if not session:
+        return {}
+    cell_id = session.get("localPlayerCellId")
+    return {
+        action["id"]: action.get("type")
+        for group in session.get("actions", []) if isinstance(group, list)
+        for action in group
+        if action.get("actorCellId") == cell_id and action.get("isInProgress") and not action.get("completed")
+    }
+
+
+def replay(path: str, pick: Optional[str] = None, ban: Optional[str] = None,
+           mode: str = "engine", speed: float = 0.0) -> ReplayReport:
+    """
+    Replay a recording against a fresh InstalockAutoban.
+
+    Args:
+        path: Recording to replay
+        pick: Instalock champion (defaults to the recorded config)
+        ban: Auto-ban champion (defaults to the recorded config)
+        mode: "engine" pushes sessions as websocket events, "poll" hands them
+            to the polling monitor's handler
+        speed: 0 replays as fast as possible, otherwise the recorded timing is
+            followed at this speed factor
+
+    Returns:
+        ReplayReport with one Decision per action we had to take
+    """
+    records = list(read_recording(path))
+    header = next((r for r in records if r["type"] == "header"), {})
+    roster = next((r["data"] for r in records if r["type"] == "roster"), [])
+    sessions = [r for r in records if r["type"] == "session"]
+    config = header.get("config", {})
+    pick = pick if pick is not None else config.get("pick")
+    ban = ban if ban is not None else config.get("ban")
+
+    fake = FakeRengar(roster, header.get("game_version"), header.get("locale"))
+    with tempfile.TemporaryDirectory() as cache_dir:
+        bot = InstalockAutoban(rengar=fake, roster_cache_path=os.path.join(cache_dir, "roster.json"))
+        if pick:
+            bot.set_instalock_champion(pick)
+        if ban:
+            bot.set_auto_ban_champion(ban)
+        if mode == "engine":
+            bot.start_engine()
+        fake.calls.clear()
+
+        report = ReplayReport(mode=mode, recorded_requests=sum(r["type"] == "request" for r in records))
+        enabled = {"pick": bot.instalock.enabled, "ban": bot.auto_ban.enabled}
+        started: Dict[int, Tuple[float, str]] = {}
+        decided: Dict[int, Decision] = {}
+        replay_start = time.monotonic()
+
+        for record in sessions:
+            if speed > 0:
+                delay = record["t"] / speed - (time.monotonic() - replay_start)
+                if delay > 0:
+                    time.sleep(delay)
+
+            session = record["data"]
+            fake.session = session
+            calls_before = len(fake.calls)
+            fed_at = time.perf_counter()
+            for action_id, action_type in _own_in_progress(session).items():
+                started.setdefault(action_id, (fed_at, action_type))
+
+            if mode == "engine":
+                fake.push({"uri": SESSION_URI, "eventType": record.get("event") or "Update",
+                           "data": copy.deepcopy(session)})
+            else:
+                bot._on_session_poll(ChampSelectSessionSnapshot(
+                    CHAMP_SELECT, copy.deepcopy(session), time.monotonic(), True))
+            report.snapshots += 1
+
+            for at, method, endpoint, body in fake.calls[calls_before:]:
+                match = ACTION_ENDPOINT.match(endpoint)
+                if method != "PATCH" or not match or not (body or {}).get("completed"):
+                    continue
+                action_id = int(match.group(1))
+                if action_id in started and action_id not in decided:
+                    fed, action_type = started[action_id]
+                    decided[action_id] = Decision(action_id, action_type, round((at - fed) * 1000, 3),
+                                                  body.get("championId"))
+
+        bot.stop()
+
+    report.decisions = sorted(decided.values(), key=lambda d: d.action_id)
+    report.missed = [
+        Decision(action_id, action_type, None)
+        for action_id, (_, action_type) in sorted(started.items())
+        if action_id not in decided and enabled.get(action_type)
+    ]
+    report.requests = dict(Counter(method for _, method, _, _ in fake.calls))
+    return report
+
+
+def synthetic_draft(roster: List[dict], local_cell: int = 2, pick: str = "Ahri",
+                    ban: str = "Zed", turn_seconds: float = 1.0) -> List[dict]:
+    """
+    Build a recording of a 10-player draft with simultaneous bans and 1-2-2-2-2-1
+    picks, our cell picking in the third turn. Other players use champions
+    other than pick and ban.
+    """
+    names = {champ["name"].lower(): champ["id"] for champ in roster}
+    pick_id, ban_id = names[pick.lower()], names[ban.lower()]
+    others = iter([champ["id"] for champ in roster if champ["id"] not in (pick_id, ban_id)])
+
+    ban_actions = [{"id": cell + 1, "actorCellId": cell, "type": "ban", "championId": 0,
+                    "isInProgress": False, "completed": False} for cell in range(10)]
+    pick_order = [[0], [5, 6], [1, 2], [7, 8], [3, 4], [9]]
+    pick_groups = []
+    next_id = 11
+    for cells in pick_order:
+        group = []
+        for cell in cells:
+            group.append({"id": next_id, "actorCellId": cell, "type": "pick", "championId": 0,
+                          "isInProgress": False, "completed": False})
+            next_id += 1
+        pick_groups.append(group)
+
+    session = {
+        "gameId": 4242,
+        "localPlayerCellId": local_cell,
+        "actions": [ban_actions] + pick_groups,
+        "bans": {"myTeamBans": [], "theirTeamBans": []},
+        "myTeam": [{"cellId": cell, "summonerId": cell + 1} for cell in range(5)],
+        "theirTeam": [{"cellId": cell, "summonerId": cell + 1} for cell in range(5, 10)],
+    }
+
+    records = [
+        {"type": "header", "version": FORMAT_VERSION, "started": 0, "game_version": "synthetic",
+         "locale": "en_US", "config": {"pick": pick, "ban": ban}},
+        {"type": "roster", "t": 0.0, "data": roster},
+    ]
+    t = 0.0
+
+    def snapshot(event: str = "Update") -> None:
+        records.append({"type": "session", "t": round(t, 3), "event": event, "data": copy.deepcopy(session)})
+
+    snapshot("Create")
+    for group in [ban_actions] + pick_groups:
+        t += turn_seconds
+        for action in group:
+            action["isInProgress"] = True
+        snapshot()
+        t += turn_seconds
+        for action in group:
+            own = action["actorCellId"] == local_cell
+            if action["type"] == "ban":
+                action["championId"] = ban_id if own else next(others)
+            else:
+                action["championId"] = pick_id if own else next(others)
+            action.update(isInProgress=False, completed=True)
+        snapshot()
+
+    t += turn_seconds
+    records.append({"type": "session", "t": round(t, 3), "event": "Delete", "data": None})
+    return records
+
+
+def _record(args) -> None:
+    bot = InstalockAutoban()
+    if args.pick:
+        bot.set_instalock_champion(args.pick)
+    if args.ban:
+        bot.set_auto_ban_champion(args.ban)
+    recorder = ChampSelectRecorder(bot.rengar, args.path, {"pick": args.pick, "ban": args.ban})
+    recorder.start()
+    bot.start_engine()
+    print(f"Recording champion select to {args.path}, Ctrl+C to stop")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        bot.stop()
+        recorder.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Record or replay champion select sessions")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    record_parser = commands.add_parser("record")
+    record_parser.add_argument("path")
+    record_parser.add_argument("--pick")
+    record_parser.add_argument("--ban")
+
+    replay_parser = commands.add_parser("replay")
+    replay_parser.add_argument("path")
+    replay_parser.add_argument("--pick")
+    replay_parser.add_argument("--ban")
+    replay_parser.add_argument("--mode", choices=("engine", "poll"), default="engine")
+    replay_parser.add_argument("--speed", type=float, default=0.0)
+
+    args = parser.parse_args()
+    if args.command == "record":
+        _record(args)
+    else:
+        result = replay(args.path, args.pick, args.ban, args.mode, args.speed)
+        print(json.dumps(result.to_dict(), indent=2))
@@ -0,0 +1,320 @@
+"""
+League/Riot client credential discovery.
+
+Credentials are resolved in a single pass, cheapest source first:
+the on-disk cache shared between processes (trusted only while the client
+PID is alive), the client lockfiles, and finally a scan of running processes.
+A CredentialWatcher can follow client restarts in the background and push
+new credentials to listeners before anyone's request fails.
+"""
+
+import json
+import logging
+import os
+import tempfile
+import threading
+import weakref
+from dataclasses import dataclass, asdict
+from typing import Callable, Optional, List
+
+import psutil
+
+logger = logging.getLogger(__name__)
+
+CACHE_PATH = os.path.join(tempfile.gettempdir(), "ltk-client-credentials.json")
+
+LEAGUE_INSTALL_DIRS = [
+    "C:/Riot Games/League of Legends",
+    "/Applications/League of Legends.app/Contents/LoL",
+]
+RIOT_CLIENT_INSTALLS = "C:/ProgramData/Riot Games/RiotClientInstalls.json"
+RIOT_CLIENT_LOCKFILE = os.path.join(
+    os.environ.get("LOCALAPPDATA", ""), "Riot Games", "Riot Client", "Config", "lockfile"
+)
+
+
+@dataclass(frozen=True)
+class ClientCredentials:
+    """Ports and tokens for the LCU and the Riot client, keyed on the client PID."""
+    pid: int
+    lcu_port: str
+    lcu_token: str
+    riot_port: Optional[str] = None
+    riot_token: Optional[str] = None
+    install_dir: Optional[str] = None
+
+
+_memo: Optional[ClientCredentials] = None
+_memo_lock = threading.Lock()
+
+
+def is_client_alive(pid: int) -> bool:
+    """Check that the PID still belongs to a League client process."""
+    try:
+        return psutil.Process(pid).name().startswith("LeagueClient")
+    except (psutil.Error, ValueError):
+        return False
+
+
+def _read_lockfile(path: str) -> Optional[List[str]]:
+    """Read a `name:pid:port:password:protocol` lockfile."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            parts = f.read().strip().split(":")
+    except OSError:
+        return None
+    return parts if len(parts) == 5 else None
+
+
+def _league_install_dirs(hint: Optional[str]) -> List[str]:
+    dirs = [hint] if hint else []
+    try:
+        with open(RIOT_CLIENT_INSTALLS, encoding="utf-8") as f:
+            dirs.extend(json.load(f).get("associated_client", {}).keys())
+    except (OSError, ValueError, AttributeError):
+        pass
+    dirs.extend(LEAGUE_INSTALL_DIRS)
+    return dirs
+
+
+def _from_lockfile(hint: Optional[str]) -> Optional[ClientCredentials]:
+    """Build credentials from the League and Riot client lockfiles."""
+    for install_dir in _league_install_dirs(hint):
+        league = _read_lockfile(os.path.join(install_dir, "lockfile"))
+        if not league:
+            continue
+
+        pid = int(league[1])
+        if not is_client_alive(pid):
+            continue
+
+        riot = _read_lockfile(RIOT_CLIENT_LOCKFILE)
+        if not riot:
+            # The Riot client credentials are only on the Ux command line
+            return None
+
+        return ClientCredentials(
+            pid=pid,
+            lcu_port=league[2],
+            lcu_token=league[3],
+            riot_port=riot[2],
+            riot_token=riot[3],
+            install_dir=install_dir,
+        )
+    return None
+
+
+def _from_process_scan() -> Optional[ClientCredentials]:
+    """Scan running processes for the LeagueClientUx command line."""
+    for proc in psutil.process_iter(["pid", "name", "cmdline"]):
+        if proc.info["name"] != "LeagueClientUx.exe":
+            continue
+
+        args = {}
+        for arg in proc.info["cmdline"] or []:
+            if arg.startswith("--") and "=" in arg:
+                key, value = arg[2:].split("=", 1)
+                args[key] = value
+
+        if "app-port" not in args or "remoting-auth-token" not in args:
+            continue
+
+        return ClientCredentials(
+            pid=int(args.get("app-pid", proc.info["pid"])),
+            lcu_port=args["app-port"],
+            lcu_token=args["remoting-auth-token"],
+            riot_port=args.get("riotclient-app-port"),
+            riot_token=args.get("riotclient-auth-token"),
+            install_dir=args.get("install-directory"),
+        )
+    return None
+
+
+def _load_cache() -> Optional[ClientCredentials]:
+    try:
+        with open(CACHE_PATH, encoding="utf-8") as f:
+            return ClientCredentials(**json.load(f))
+    except (OSError, ValueError, TypeError):
+        return None
+
+
+def _save_cache(creds: ClientCredentials) -> None:
+    tmp_path = f"{CACHE_PATH}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(asdict(creds), f)
+        os.replace(tmp_path, CACHE_PATH)
+    except OSError:
+        pass
+
+
+def discover_credentials(refresh: bool = False) -> Optional[ClientCredentials]:
+    """
+    Return the current client credentials, or None if no client is running.
+
+    Args:
+        refresh: Skip the cached entries and go straight to the lockfile/scan
+
+    Returns:
+        ClientCredentials for the running client, or None
+    """
+    global _memo
+
+    with _memo_lock:
+        hint = None
+        if not refresh:
+            for cached in (_memo, _load_cache()):
+                if cached is None:
+                    continue
+                if is_client_alive(cached.pid):
+                    _memo = cached
+                    return cached
+                hint = hint or cached.install_dir
+
+        creds = _from_lockfile(hint) or _from_process_scan()
+        _remember(creds)
+        return creds
+
+
+def _remember(creds: Optional[ClientCredentials]) -> None:
+    global _memo
+    _memo = creds
+    if creds is not None:
+        _save_cache(creds)
+
+
+def _lockfile_mtime(creds: Optional[ClientCredentials]) -> Optional[int]:
+    if creds is None or not creds.install_dir:
+        return None
+    try:
+        return os.stat(os.path.join(creds.install_dir, "lockfile")).st_mtime_ns
+    except OSError:
+        return None
+
+
+CredentialListener = Callable[[Optional[ClientCredentials]], None]
+
+
+class CredentialWatcher:
+    """
+    Background thread that notices client starts, restarts and exits.
+
+    While a client is known, each tick only checks that its PID is alive and
+    that its lockfile was not rewritten. Without a client the lockfiles are
+    read every tick and processes are scanned every scan_every ticks. Changes
+    are handed to every listener, then `ready` is set once probe(credentials)
+    passes (immediately when there is no probe) and cleared when the client
+    goes away.
+    """
+
+    def __init__(self, interval: float = 1.0, scan_every: int = 5,
+                 probe: Optional[Callable[[ClientCredentials], bool]] = None):
+        self.interval = interval
+        self.scan_every = scan_every
+        self.probe = probe
+        self.credentials: Optional[ClientCredentials] = None
+        self.ready = threading.Event()
+        self.is_running = False
+
+        self._listeners: List = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._mtime: Optional[int] = None
+        self._ticks = 0
+
+    def add_listener(self, listener: CredentialListener) -> None:
+        """Call listener(credentials or None) on every change; bound methods are held weakly."""
+        ref = weakref.WeakMethod(listener) if hasattr(listener, "__self__") else (lambda: listener)
+        with self._lock:
+            self._listeners.append(ref)
+
+    def remove_listener(self, listener: CredentialListener) -> None:
+        with self._lock:
+            self._listeners = [ref for ref in self._listeners if ref() not in (None, listener)]
+
+    def start(self) -> None:
+        """Start the watcher thread if it is not running yet."""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self.is_running = True
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, daemon=True, name="CredentialWatcher")
+            self._thread.start()
+
+    def stop(self) -> None:
+        self.is_running = False
+        self._stop.set()
+        if self._thread and self._thread.is_alive() and self._thread is not threading.current_thread():
+            self._thread.join(timeout=2)
+
+    def wait_ready(self, timeout: Optional[float] = None) -> bool:
+        """Block until the client is up and ready, or timeout; returns whether it is."""
+        return self.ready.wait(timeout)
+
+    def check(self) -> bool:
+        """Run one watch tick; returns True if the credentials changed."""
+        current = self.credentials
+        self._ticks += 1
+
+        if current is not None and is_client_alive(current.pid) and _lockfile_mtime(current) == self._mtime:
+            if not self.ready.is_set():
+                self._probe(current)
+            return False
+
+        hint = current.install_dir if current is not None else None
+        if current is None and (self._ticks - 1) % self.scan_every != 0:
+            # No client yet: only the cheap lockfile check on most ticks
+            creds = _from_lockfile(hint)
+            if creds is not None:
+                with _memo_lock:
+                    _remember(creds)
+        else:
+            # A known client went away or rewrote its lockfile: skip the memo
+            creds = discover_credentials(refresh=current is not None)
+
+        if creds == current:
+            # Same client, lockfile merely rewritten: remember the new mtime or every tick rescans
+            self._mtime = _lockfile_mtime(creds)
+            return False
+        self._publish(creds)
+        return True
+
+    def _publish(self, creds: Optional[ClientCredentials]) -> None:
+        self.credentials = creds
+        self._mtime = _lockfile_mtime(creds)
+        self.ready.clear()
+        if creds is None:
+            logger.info("League client closed")
+        else:
+            logger.info(f"League client found on port {creds.lcu_port}")
+
+        with self._lock:
+            self._listeners = [ref for ref in self._listeners if ref() is not None]
+            listeners = [ref() for ref in self._listeners]
+        for listener in listeners:
+            if listener is None:
+                continue
+            try:
+                listener(creds)
+            except Exception as e:
+                logger.error(f"Credential listener failed: {e}")
+
+        if creds is not None:
+            self._probe(creds)
+
+    def _probe(self, creds: ClientCredentials) -> None:
+        try:
+            if self.probe is None or self.probe(creds):
+                self.ready.set()
+        except Exception as e:
+            logger.debug(f"Client readiness probe failed: {e}")
+
+    def _run(self) -> None:
+        while self.is_running:
+            try:
+                self.check()
+            except Exception as e:
+                logger.debug(f"Credential watch failed: {e}")
+            self._stop.wait(self.interval)
@@ -2,16 +2,27 @@
 Refactored champion select automation - cleaner separation of concerns.
 """
 
+import json
+import os
+import tempfile
 import threading
 import time
 import random
 from dataclasses import dataclass, field
 from typing import Optional, List, Dict, Set
-from difflib import get_close_matches
+from bisect import bisect_left
 import logging
 
+from Names import normalize_name, trigrams
+
 logger = logging.getLogger(__name__)
 
+SESSION_URI = "/lol-champ-select/v1/session"
+
+ROSTER_CACHE_PATH = os.path.join(tempfile.gettempdir(), "ltk-champion-roster.json")
+AVAILABILITY_TTL = 300.0
+CLIENT_READY_TIMEOUT = 120.0
+
 
 @dataclass
 class ChampionSelection:
@@ -40,103 +51,324 @@ class SelectionOptions:
     avoid_ally_hovers: bool = True
 
 
+def _start_daemon(target, name: str) -> threading.Thread:
+    thread = threading.Thread(target=target, daemon=True, name=name)
+    thread.start()
+    return thread
+
+
+class ChampionAvailability:
+    """Short-lived layer of owned and free-rotation champion IDs."""
+    
+    def __init__(self, rengar, ttl: float = AVAILABILITY_TTL):
+        self.rengar = rengar
+        self.ttl = ttl
+        self._ids: Set[int] = set()
+        self._updated_at = 0.0
+        self._refresh_thread: Optional[threading.Thread] = None
+    
+    def update_from(self, data: List[dict]) -> None:
+        """Read ownership flags from grid or inventory champion entries."""
+        ids = set()
+        for champ in data:
+            ownership = champ.get("ownership") or {}
+            if champ.get("owned") or ownership.get("owned") or champ.get("freeToPlay"):
+                ids.add(champ.get("id"))
+        self._ids = ids
+        self._updated_at = time.monotonic()
+    
+    def refresh(self) -> bool:
+        """Fetch owned and free champions from the client."""
+        try:
+            response = self.rengar.lcu_request("GET", "/lol-champions/v1/owned-champions-minimal", "")
+            if response.status_code == 200:
+                self.update_from(response.json())
+                return True
+        except Exception as e:
+            logger.error(f"❌ Error loading owned champions: {e}")
+        return False
+    
+    def get_ids(self) -> Set[int]:
+        """Get playable champion IDs; refreshes in the background once expired."""
+        expired = time.monotonic() - self._updated_at > self.ttl
+        if expired and (self._refresh_thread is None or not self._refresh_thread.is_alive()):
+            self._refresh_thread = _start_daemon(self.refresh, "ChampionAvailability")
+        return self._ids
+    
+    def is_loaded(self) -> bool:
+        """Check whether any IDs are known, without starting a refresh."""
+        return bool(self._ids)
+
+
 class ChampionRegistry:
     """Manages champion data and name/ID conversion."""
     
-    def __init__(self, rengar):
+    def __init__(self, rengar, cache_path: str = ROSTER_CACHE_PATH):
         self.rengar = rengar
+        self.cache_path = cache_path
+        self.availability = ChampionAvailability(rengar)
         self._champ_dict: Dict[str, int] = {}
+        self._names: Dict[int, str] = {}
+        self._keys: Dict[str, int] = {}
+        self._sorted_keys: List[str] = []
+        self._grams: Dict[str, Set[str]] = {}
+        self._cache_key: Optional[List[str]] = None
+        self._refresh_thread: Optional[threading.Thread] = None
         self._lock = threading.Lock()
     
     def load(self) -> bool:
-        """Load champion list from client."""
+        """Load champion list, from the on-disk cache when there is one."""
+        if self._load_cache():
+            logger.info(f"✅ Loaded {len(self._champ_dict)} champions from cache")
+            self.check_for_patch()
+            return True
+        return self.refresh()
+    
+    def check_for_patch(self) -> None:
+        """Check in the background whether the client moved to a new patch or locale."""
+        with self._lock:
+            if self._refresh_thread is None or not self._refresh_thread.is_alive():
+                self._refresh_thread = _start_daemon(self._refresh_if_patched, "ChampionRegistryRefresh")
+    
+    def refresh(self, cache_key: Optional[List[str]] = None) -> bool:
+        """Download champion list from client and rewrite the cache."""
         try:
+            if cache_key is None:
+                cache_key = self._client_cache_key()
+            
             # Try primary endpoint
             response = self.rengar.lcu_request("GET", "/lol-champ-select/v1/all-grid-champions", "")
+            filter_invalid = False
             
-            if response.status_code == 200:
-                self._parse_data(response.json())
-                logger.info(f"✅ Loaded {len(self._champ_dict)} champions")
-                return True
+            if response.status_code != 200:
+                # Fallback endpoint
+                response = self.rengar.lcu_request("GET", "/lol-champions/v1/inventories/local-player/champions", "")
+                filter_invalid = True
             
-            # Fallback endpoint
-            response = self.rengar.lcu_request("GET", "/lol-champions/v1/inventories/local-player/champions", "")
+            if response.status_code != 200:
+                return False
             
-            if response.status_code == 200:
-                self._parse_data(response.json(), filter_invalid=True)
-                logger.info(f"✅ Loaded {len(self._champ_dict)} champions")
-                return True
+            data = response.json()
+            self._parse_data(data, filter_invalid=filter_invalid)
+            self.availability.update_from(data)
+            logger.info(f"✅ Loaded {len(self._champ_dict)} champions")
             
-            return False
+            if cache_key is not None:
+                self._save_cache(cache_key)
+            return True
             
         except Exception as e:
             logger.error(f"❌ Error loading champions: {e}")
             return False
     
+    def _client_cache_key(self) -> Optional[List[str]]:
+        """Get [game version, locale] of the running client."""
+        version = self.rengar.lcu_request("GET", "/lol-patch/v1/game-version", "")
+        region = self.rengar.lcu_request("GET", "/riotclient/region-locale", "")
+        if version.status_code != 200 or region.status_code != 200:
+            return None
+        return [version.json(), region.json().get("locale", "")]
+    
+    def _refresh_if_patched(self) -> None:
+        """Re-download the roster only when the client patch or locale changed."""
+        try:
+            cache_key = self._client_cache_key()
+        except Exception as e:
+            logger.debug(f"Could not check champion cache version: {e}")
+            return
+        
+        if cache_key is not None and cache_key != self._cache_key:
+            logger.info(f"🔄 Client is on {cache_key[0]}, refreshing champion list")
+            self.refresh(cache_key)
+        elif not self.availability.is_loaded():
+            self.availability.refresh()
+    
+    def _load_cache(self) -> bool:
+        try:
+            with open(self.cache_path, encoding="utf-8") as f:
+                cache = json.load(f)
+            self._parse_data(cache["champions"])
+            self._cache_key = cache["key"]
+        except (OSError, ValueError, KeyError, TypeError):
+            return False
+        return self.is_loaded()
+    
+    def _save_cache(self, cache_key: List[str]) -> None:
+        champions = [{"id": champ_id, "name": name} for champ_id, name in self._names.items()]
+        tmp_path = f"{self.cache_path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"key": cache_key, "champions": champions}, f)
+            os.replace(tmp_path, self.cache_path)
+            self._cache_key = cache_key
+        except OSError as e:
+            logger.debug(f"Could not write champion cache: {e}")
+    
     def _parse_data(self, data: List[dict], filter_invalid: bool = False) -> None:
-        """Parse champion data from API response."""
-        with self._lock:
-            self._champ_dict.clear()
-            for champ in data:
-                champ_id = champ.get("id")
-                champ_name = champ.get("name")
+        """Parse champion data from API response and build the lookup indexes."""
+        champ_dict = {}
+        names = {}
+        keys = {}
+        grams: Dict[str, Set[str]] = {}
+        
+        for champ in data:
+            champ_id = champ.get("id")
+            champ_name = champ.get("name")
+            
+            if champ_id and champ_name:
+                if filter_invalid and champ_id == -1:
+                    continue
+                champ_dict[champ_name.lower()] = champ_id
+                names[champ_id] = champ_name
                 
-                if champ_id and champ_name:
-                    if filter_invalid and champ_id == -1:
-                        continue
-                    self._champ_dict[champ_name.lower()] = champ_id
+                key = normalize_name(champ_name)
+                keys[key] = champ_id
+                for gram in trigrams(key):
+                    grams.setdefault(gram, set()).add(key)
+        
+        # Swap the indexes in one go so readers never see a half-built registry
+        with self._lock:
+            self._champ_dict = champ_dict
+            self._names = names
+            self._keys = keys
+            self._sorted_keys = sorted(keys)
+            self._grams = grams
+    
+    def _prefix_matches(self, key: str) -> List[str]:
+        """Get normalized keys starting with key, in alphabetical order."""
+        sorted_keys = self._sorted_keys
+        matches = []
+        i = bisect_left(sorted_keys, key)
+        while i < len(sorted_keys) and sorted_keys[i].startswith(key):
+            matches.append(sorted_keys[i])
+            i += 1
+        return matches
+    
+    def _gram_candidates(self, key: str) -> Dict[str, int]:
+        """Count shared trigrams between key and every champion key."""
+        counts: Dict[str, int] = {}
+        for gram in trigrams(key):
+            for candidate in self._grams.get(gram, ()):
+                counts[candidate] = counts.get(candidate, 0) + 1
+        return counts
     
     def get_id(self, name: str) -> int:
         """Convert champion name to ID. Returns -1 if not found."""
         if not self._champ_dict:
             self.load()
         
-        name = name.lower().strip()
+        key = normalize_name(name)
+        if not key:
+            return -1
         
         # Exact match
-        if name in self._champ_dict:
-            return self._champ_dict[name]
+        if key in self._keys:
+            return self._keys[key]
+        
+        # Prefix match ("nunu" -> "Nunu & Willump")
+        prefixed = self._prefix_matches(key)
+        if prefixed:
+            return self._keys[prefixed[0]]
         
-        # Partial match
-        for champ_name, champ_id in self._champ_dict.items():
-            if name in champ_name or champ_name in name:
-                return champ_id
+        # Substring match, shortest champion name first
+        inner = [k for k in self._gram_candidates(key) if key in k]
+        if inner:
+            return self._keys[min(inner, key=len)]
+        
+        # Champion name inside the input ("annie bot" -> "Annie"), longest first
+        for length in range(len(key) - 1, 1, -1):
+            for start in range(len(key) - length + 1):
+                champ_id = self._keys.get(key[start:start + length])
+                if champ_id is not None:
+                    return champ_id
         
         return -1
     
     def get_suggestions(self, partial: str, limit: int = 5) -> List[str]:
-        """Get champion name suggestions for partial input."""
+        """Get champion name suggestions for partial input, best match first."""
         if not self._champ_dict:
             return []
         
-        partial = partial.lower().strip()
-        all_names = list(self._champ_dict.keys())
+        key = normalize_name(partial)
+        if not key:
+            return []
         
-        # Fuzzy matching
-        matches = get_close_matches(partial, all_names, n=limit, cutoff=0.6)
+        ranked = self._prefix_matches(key)
+        seen = set(ranked)
         
-        # Partial matches
-        partial_matches = [n for n in all_names if partial in n and n not in matches]
+        # Fuzzy matching on shared trigrams (Dice coefficient)
+        query_size = len(key) + 2
+        scored = []
+        for candidate, shared in self._gram_candidates(key).items():
+            if candidate in seen:
+                continue
+            score = 2 * shared / (query_size + len(candidate) + 2)
+            if key in candidate:
+                score += 1
+            if score >= 0.25:
+                scored.append((-score, candidate))
         
-        suggestions = matches + partial_matches
-        return [name.title() for name in suggestions[:limit]]
+        ranked.extend(candidate for _, candidate in sorted(scored))
+        return [self._names[self._keys[k]] for k in ranked[:limit]]
     
     def get_all_ids(self) -> List[int]:
         """Get all champion IDs."""
-        return list(self._champ_dict.values())
+        return list(self._names)
     
     def get_name(self, champ_id: int) -> str:
         """Get champion name from ID."""
-        for name, cid in self._champ_dict.items():
-            if cid == champ_id:
-                return name.title()
-        return "Unknown"
+        return self._names.get(champ_id, "Unknown")
     
     def is_loaded(self) -> bool:
         """Check if champion data is loaded."""
         return bool(self._champ_dict)
 
 
+class ChampSelectSnapshot:
+    """Parsed, indexed view of one champion select session."""
+    
+    __slots__ = ("cell_id", "game_id", "banned", "ally_hovers", "own_actions", "pending", "raw")
+    
+    def __init__(self, session: dict):
+        self.raw = session
+        self.cell_id: Optional[int] = session.get("localPlayerCellId")
+        self.game_id = session.get("gameId")
+        self.banned: Set[int] = set()
+        self.ally_hovers: Set[int] = set()
+        self.own_actions: List[dict] = []
+        self.pending: Dict[str, List[dict]] = {}
+        
+        for actions in session.get("actions", []):
+            if not isinstance(actions, list):
+                continue
+            
+            for action in actions:
+                action_type = action.get("type")
+                champ_id = action.get("championId", 0)
+                completed = action.get("completed", False)
+                
+                if action.get("actorCellId") == self.cell_id:
+                    self.own_actions.append(action)
+                    if not completed:
+                        self.pending.setdefault(action_type, []).append(action)
+                elif action_type == "pick" and champ_id > 0 and not completed:
+                    self.ally_hovers.add(champ_id)
+                
+                if action_type == "ban" and completed:
+                    self.banned.add(champ_id)
+        
+        bans = session.get("bans", {})
+        if isinstance(bans, dict):
+            for team_bans in bans.values():
+                if isinstance(team_bans, list):
+                    self.banned.update(team_bans)
+    
+    def pending_action(self, action_type: str) -> Optional[dict]:
+        """Get our first uncompleted action of the given type."""
+        actions = self.pending.get(action_type)
+        return actions[0] if actions else None
+
+
 class ChampSelectSession:
     """Handles champion select session queries."""
     
@@ -146,8 +378,8 @@ class ChampSelectSession:
     def get_session(self) -> Optional[dict]:
         """Get current champion select session data."""
         try:
-            response = self.rengar.lcu_request("GET", "/lol-champ-select/v1/session", "")
-            if response.status_code == 200 and "RPC_ERROR" not in response.text:
+            response = self.rengar.lcu_request("GET", SESSION_URI, "")
+            if response.status_code == 200 and not response.is_error:
                 return response.json()
             return None
         except Exception:
@@ -157,47 +389,53 @@ class ChampSelectSession:
         """Get local player's cell ID from session."""
         return session.get("localPlayerCellId")
     
+    def get_snapshot(self) -> Optional[ChampSelectSnapshot]:
+        """Get the current session parsed into a snapshot."""
+        session = self.get_session()
+        return ChampSelectSnapshot(session) if session else None
+    
     def is_champion_banned(self, champion_id: int, session: dict) -> bool:
         """Check if champion is already banned."""
-        # Check completed ban actions
-        for actions in session.get("actions", []):
-            if not isinstance(actions, list):
-                continue
-            
-            for action in actions:
-                if (action.get("type") == "ban" and
-                    action.get("completed") and
-                    action.get("championId") == champion_id):
-                    return True
-        
-        # Check bans object
-        bans = session.get("bans", {})
-        if isinstance(bans, dict):
-            for team_bans in bans.values():
-                if isinstance(team_bans, list) and champion_id in team_bans:
-                    return True
-        
-        return False
+        return champion_id in ChampSelectSnapshot(session).banned
     
     def get_ally_hovers(self, session: dict, cell_id: int) -> List[int]:
         """Get list of champions that allies have hovered."""
-        ally_hovers = []
+        return list(ChampSelectSnapshot(session).ally_hovers)
+
+
+class ActionTracker:
+    """Remembers action state between session updates and reports what changed."""
+    
+    def __init__(self):
+        self._states: Dict[int, tuple] = {}
+    
+    def reset(self) -> None:
+        """Forget all tracked actions."""
+        self._states.clear()
+    
+    def update(self, session: dict) -> List[dict]:
+        """Return the actions that are new or changed since the previous update."""
+        states = {}
+        changed = []
         
         for actions in session.get("actions", []):
             if not isinstance(actions, list):
                 continue
             
             for action in actions:
-                if action.get("actorCellId") == cell_id:
-                    continue
-                
-                if action.get("type") == "pick":
-                    champ_id = action.get("championId", 0)
-                    if champ_id > 0 and not action.get("completed", False):
-                        if champ_id not in ally_hovers:
-                            ally_hovers.append(champ_id)
+                action_id = action.get("id")
+                state = (
+                    action.get("actorCellId"),
+                    action.get("championId"),
+                    action.get("isInProgress", False),
+                    action.get("completed", False)
+                )
+                states[action_id] = state
+                if self._states.get(action_id) != state:
+                    changed.append(action)
         
-        return ally_hovers
+        self._states = states
+        return changed
 
 
 class ChampionSelector:
@@ -207,13 +445,14 @@ class ChampionSelector:
         self.registry = registry
         self.session = session_handler
     
-    def select_pick(self, config: ChampionSelection, session_data: dict) -> int:
+    def select_pick(self, config: ChampionSelection, snapshot: ChampSelectSnapshot) -> int:
         """Select a champion to pick based on configuration."""
         # Random selection
         if config.primary == "Random":
+            candidates = self.registry.availability.get_ids() or self.registry.get_all_ids()
             available = [
-                cid for cid in self.registry.get_all_ids()
-                if not self.session.is_champion_banned(cid, session_data)
+                cid for cid in candidates
+                if cid not in snapshot.banned
             ]
             return random.choice(available) if available else -1
         
@@ -224,7 +463,7 @@ class ChampionSelector:
             if champ_id == -1:
                 continue
             
-            if self.session.is_champion_banned(champ_id, session_data):
+            if champ_id in snapshot.banned:
                 logger.warning(f"⚠️ {i}{'st' if i==1 else 'nd' if i==2 else 'rd'} choice {champ_name.title()} is BANNED")
                 continue
             
@@ -234,13 +473,13 @@ class ChampionSelector:
         logger.error("🚫 All pick options unavailable!")
         return -1
     
-    def select_ban(self, config: ChampionSelection, session_data: dict, 
-                   cell_id: int, avoid_ally_hovers: bool) -> int:
+    def select_ban(self, config: ChampionSelection, snapshot: ChampSelectSnapshot,
+                   avoid_ally_hovers: bool) -> int:
         """Select a champion to ban based on configuration."""
         # Get ally hovers if needed
-        ally_hovers = []
+        ally_hovers: Set[int] = set()
         if avoid_ally_hovers:
-            ally_hovers = self.session.get_ally_hovers(session_data, cell_id)
+            ally_hovers = snapshot.ally_hovers
             if ally_hovers:
                 logger.info(f"🛡️ Protecting {len(ally_hovers)} ally champion(s)")
         
@@ -251,7 +490,7 @@ class ChampionSelector:
             if champ_id == -1:
                 continue
             
-            if self.session.is_champion_banned(champ_id, session_data):
+            if champ_id in snapshot.banned:
                 logger.warning(f"⚠️ {i}{'st' if i==1 else 'nd' if i==2 else 'rd'} ban {champ_name.title()} already BANNED")
                 continue
             
@@ -269,12 +508,14 @@ class ChampionSelector:
 class InstalockAutoban:
     """Main class for champion select automation."""
     
-    def __init__(self):
-        import Rengar
-        self.rengar = Rengar()
+    def __init__(self, rengar=None, roster_cache_path: str = ROSTER_CACHE_PATH):
+        if rengar is None:
+            from Rengar import Rengar
+            rengar = Rengar()
+        self.rengar = rengar
         
         # Components
-        self.registry = ChampionRegistry(self.rengar)
+        self.registry = ChampionRegistry(self.rengar, roster_cache_path)
         self.session_handler = ChampSelectSession(self.rengar)
         self.selector = ChampionSelector(self.registry, self.session_handler)
         
@@ -283,9 +524,10 @@ class InstalockAutoban:
         self.auto_ban = ChampionSelection()
         self.options = SelectionOptions()
         
-        # Thread management
-        self.monitor_thread: Optional[threading.Thread] = None
+        # Polling monitor (driven by the shared LCUPoller)
+        self.poller = None
         self.is_running = False
+        self._consecutive_errors = 0
         self._lock = threading.Lock()
         
         # State tracking
@@ -293,9 +535,19 @@ class InstalockAutoban:
         self._processed_actions: Set[int] = set()
         self._pre_hover_done = False
         
+        # Event-driven engine
+        self.engine_running = False
+        self._tracker = ActionTracker()
+        self._last_game_id = None
+        
         logger.info("📄 Loading champion data...")
         if not self.registry.load():
             logger.warning("⚠️ Champion list will be loaded when client is available")
+        
+        # A client started or restarted later may be on a new patch
+        watcher = getattr(self.rengar, "watcher", None)
+        if watcher is not None:
+            watcher.add_listener(self._on_client_credentials)
     
     # Compatibility properties for main.py
     @property
@@ -443,85 +695,138 @@ class InstalockAutoban:
     
     # Monitoring
     def start_monitor(self) -> None:
-        """Start champion select monitoring."""
-        if self.monitor_thread is None or not self.monitor_thread.is_alive():
-            self.is_running = True
-            self.monitor_thread = threading.Thread(
-                target=self._monitor_loop,
-                daemon=True,
-                name="ChampSelectMonitor"
-            )
-            self.monitor_thread.start()
-            logger.info("▶️ Monitor started")
+        """Start champion select monitoring on the shared poller."""
+        if self.is_running:
+            return
+        from LCUPoller import CHAMP_SELECT, shared_poller
+        self.poller = shared_poller()
+        self.is_running = True
+        self._consecutive_errors = 0
+        logger.info("👀 Champion select monitor active")
+        logger.info(f"📋 Instalock: {'✅ ENABLED' if self.instalock.enabled else '❌ DISABLED'} - {self.get_instalock_status()}")
+        logger.info(f"📋 Auto-ban: {'✅ ENABLED' if self.auto_ban.enabled else '❌ DISABLED'} - {self.get_auto_ban_status()}")
+        self.poller.subscribe(CHAMP_SELECT, self._on_session_poll)
+        logger.info("▶️ Monitor started")
     
     def start_threads(self) -> None:
         """Start all monitoring threads (alias for compatibility)."""
         self.start_monitor()
     
+    def start_engine(self) -> None:
+        """Start event-driven champion select handling (no polling)."""
+        if self.engine_running:
+            return
+        self.engine_running = True
+        self._tracker.reset()
+        self.rengar.subscribe(SESSION_URI, self._on_session_event)
+        logger.info("⚡ Event engine started")
+    
     def stop(self) -> None:
         """Stop monitoring."""
-        self.is_running = False
-        if self.monitor_thread and self.monitor_thread.is_alive():
-            self.monitor_thread.join(timeout=2)
+        self._stop_monitor()
+        if self.engine_running:
+            self.engine_running = False
+            self.rengar.unsubscribe(SESSION_URI, self._on_session_event)
         logger.info("🛑 Monitor stopped")
     
-    def _monitor_loop(self) -> None:
-        """Main monitoring loop."""
-        logger.info("👀 Champion select monitor active")
-        logger.info(f"📋 Instalock: {'✅ ENABLED' if self.instalock.enabled else '❌ DISABLED'} - {self.get_instalock_status()}")
-        logger.info(f"📋 Auto-ban: {'✅ ENABLED' if self.auto_ban.enabled else '❌ DISABLED'} - {self.get_auto_ban_status()}")
-        consecutive_errors = 0
-        max_errors = 10
+    def _on_session_event(self, event: dict) -> None:
+        """Handle a pushed champion select session update."""
+        if event.get("uri") != SESSION_URI:
+            return
         
-        while self.is_running:
-            try:
-                # Load champions if not loaded
-                if not self.registry.is_loaded():
-                    self.registry.load()
-                
-                session_data = self.session_handler.get_session()
-                
-                if not session_data:
-                    self._reset_state()
-                    consecutive_errors = 0
-                    time.sleep(0.5)
-                    continue
-                
-                cell_id = self.session_handler.get_cell_id(session_data)
-                if cell_id is None:
-                    time.sleep(0.3)
-                    continue
-                
-                # Reset on new session
-                current_session_id = id(session_data)
-                if current_session_id != self._last_session_id:
-                    self._reset_state()
-                    self._last_session_id = current_session_id
-                    logger.info("🔄 New champion select session detected")
-                    logger.info(f"📋 Instalock: {'✅ ENABLED' if self.instalock.enabled else '❌ DISABLED'}")
-                    logger.info(f"📋 Auto-ban: {'✅ ENABLED' if self.auto_ban.enabled else '❌ DISABLED'}")
-                
-                # Handle pre-hover
-                self._handle_pre_hover(session_data)
-                
-                # Process actions
-                self._process_actions(session_data, cell_id)
-                
-                consecutive_errors = 0
-                time.sleep(0.2)
-                
-            except Exception as e:
-                consecutive_errors += 1
-                logger.error(f"⚠️ Monitor error: {e}")
-                
-                if consecutive_errors >= max_errors:
-                    logger.error("❌ Too many consecutive errors, stopping monitor")
-                    self.is_running = False
-                    break
-                
-                time.sleep(1)
+        session_data = event.get("data")
+        if event.get("eventType") == "Delete" or not session_data:
+            self._reset_state()
+            self._tracker.reset()
+            self._last_game_id = None
+            return
+        
+        snapshot = ChampSelectSnapshot(session_data)
+        if snapshot.cell_id is None:
+            return
+        
+        game_id = snapshot.game_id
+        if game_id != self._last_game_id:
+            self._reset_state()
+            self._tracker.reset()
+            self._last_game_id = game_id
+            logger.info("🔄 New champion select session detected")
+            self.registry.check_for_patch()
+        
+        if not self.registry.is_loaded():
+            self.registry.load()
+        
+        changed = {a.get("id") for a in self._tracker.update(session_data)}
+        # Our in-progress actions stay eligible on every update until a PATCH
+        # succeeds, so a failed PATCH or a feature enabled mid-turn is retried
+        own_actions = [
+            a for a in snapshot.own_actions
+            if a.get("id") in changed
+            or (a.get("isInProgress") and a.get("id") not in self._processed_actions)
+        ]
         
-        logger.info("🛑 Champion select monitor stopped")
+        self._handle_pre_hover(snapshot)
+        if own_actions:
+            self._process_actions(snapshot, own_actions)
+    
+    def _on_client_credentials(self, creds) -> None:
+        """Called by the credential watcher when the client starts, restarts or closes."""
+        if creds is not None:
+            _start_daemon(self._check_patch_when_ready, "ChampionPatchCheck")
+    
+    def _check_patch_when_ready(self) -> None:
+        if self.rengar.wait_until_ready(timeout=CLIENT_READY_TIMEOUT):
+            self.registry.check_for_patch()
+    
+    def _stop_monitor(self) -> None:
+        if self.is_running:
+            from LCUPoller import CHAMP_SELECT
+            self.is_running = False
+            self.poller.unsubscribe(CHAMP_SELECT, self._on_session_poll)
+            logger.info("🛑 Champion select monitor stopped")
+    
+    def _on_session_poll(self, poll) -> None:
+        """Handle one polled champion select session."""
+        max_errors = 10
+        
+        try:
+            # Load champions if not loaded
+            if not self.registry.is_loaded():
+                self.registry.load()
+            
+            if not poll.data:
+                self._reset_state()
+                self._consecutive_errors = 0
+                return
+            
+            snapshot = ChampSelectSnapshot(poll.data)
+            if snapshot.cell_id is None:
+                return
+            
+            # Reset on new session
+            if snapshot.game_id != self._last_session_id:
+                self._reset_state()
+                self._last_session_id = snapshot.game_id
+                logger.info("🔄 New champion select session detected")
+                self.registry.check_for_patch()
+                logger.info(f"📋 Instalock: {'✅ ENABLED' if self.instalock.enabled else '❌ DISABLED'}")
+                logger.info(f"📋 Auto-ban: {'✅ ENABLED' if self.auto_ban.enabled else '❌ DISABLED'}")
+            
+            # Handle pre-hover
+            self._handle_pre_hover(snapshot)
+            
+            # Process actions
+            self._process_actions(snapshot)
+            
+            self._consecutive_errors = 0
+            
+        except Exception as e:
+            self._consecutive_errors += 1
+            logger.error(f"⚠️ Monitor error: {e}")
+            
+            if self._consecutive_errors >= max_errors:
+                logger.error("❌ Too many consecutive errors, stopping monitor")
+                self._stop_monitor()
     
     def _reset_state(self) -> None:
         """Reset session state."""
@@ -529,7 +834,7 @@ class InstalockAutoban:
         self._processed_actions.clear()
         self._pre_hover_done = False
     
-    def _handle_pre_hover(self, session_data: dict) -> None:
+    def _handle_pre_hover(self, snapshot: ChampSelectSnapshot) -> None:
         """Handle pre-ban hovering if enabled."""
         if not (self.options.pre_hover_enabled and 
                 self.instalock.enabled and 
@@ -537,40 +842,15 @@ class InstalockAutoban:
                 self.instalock.primary != "None"):
             return
         
-        # Get timer and phase info
-        timer = session_data.get("timer", {})
-        phase = timer.get("phase", "")
-        
-        # Check if we should hover based on phase
-        # We want to hover as soon as champion select starts, before bans
-        cell_id = self.session_handler.get_cell_id(session_data)
-        if cell_id is None:
-            return
-        
-        # Check if there's a pick action available for us (even if not in progress yet)
-        has_pick_action = False
-        for actions in session_data.get("actions", []):
-            if not isinstance(actions, list):
-                continue
-            
-            for action in actions:
-                if (action.get("actorCellId") == cell_id and
-                    action.get("type") == "pick" and
-                    not action.get("completed", False)):
-                    has_pick_action = True
-                    break
-            
-            if has_pick_action:
-                break
-        
-        # Only hover if we have a pick action available
-        if not has_pick_action:
+        # We want to hover as soon as champion select starts, before bans,
+        # so only require a pick action for us (even if not in progress yet)
+        if snapshot.pending_action("pick") is None:
             return
         
         # Get champion to hover
-        champ_id = self.selector.select_pick(self.instalock, session_data)
+        champ_id = self.selector.select_pick(self.instalock, snapshot)
         if champ_id != -1:
-            if self._hover_champion(champ_id):
+            if self._hover_champion(champ_id, snapshot):
                 champ_name = self.instalock.primary
                 if champ_name == "Random":
                     champ_name = self.registry.get_name(champ_id)
@@ -579,114 +859,87 @@ class InstalockAutoban:
             else:
                 logger.warning(f"⚠️ Failed to pre-hover champion")
     
-    def _hover_champion(self, champion_id: int) -> bool:
+    def _hover_champion(self, champion_id: int, snapshot: ChampSelectSnapshot) -> bool:
         """
         Hover over a champion (show intent without locking).
         
         Args:
             champion_id: Champion ID to hover
+            snapshot: Current session, used to find our pick action
             
         Returns:
             True if successful, False otherwise
         """
         try:
-            response = self.session_handler.get_session()
-            
-            if not response:
+            action = snapshot.pending_action("pick")
+            if action is None:
                 return False
             
-            cell_id = self.session_handler.get_cell_id(response)
-            
-            if cell_id is None:
-                return False
-            
-            # Find player's pick action
-            for actions in response.get("actions", []):
-                if not isinstance(actions, list):
-                    continue
-                
-                for action in actions:
-                    if (action.get("actorCellId") == cell_id and
-                        action.get("type") == "pick" and
-                        not action.get("completed", False)):
-                        
-                        action_id = action.get("id")
-                        
-                        # Hover (completed=False shows intent without locking)
-                        hover_response = self.rengar.lcu_request(
-                            "PATCH",
-                            f"/lol-champ-select/v1/session/actions/{action_id}",
-                            {"championId": champion_id, "completed": False}
-                        )
-                        
-                        if hover_response.status_code in [204, 200]:
-                            return True
+            # Hover (completed=False shows intent without locking)
+            hover_response = self.rengar.lcu_request(
+                "PATCH",
+                f"/lol-champ-select/v1/session/actions/{action.get('id')}",
+                {"championId": champion_id, "completed": False}
+            )
             
-            return False
+            return hover_response.status_code in [204, 200]
             
         except Exception as e:
             logger.error(f"❌ Error hovering champion: {e}")
             return False
     
-    def _process_actions(self, session_data: dict, cell_id: int) -> None:
-        """Process champion select actions."""
-        for actions in session_data.get("actions", []):
-            if not isinstance(actions, list):
+    def _process_actions(self, snapshot: ChampSelectSnapshot,
+                         changed: Optional[List[dict]] = None) -> None:
+        """Process our champion select actions (only `changed` ones when given)."""
+        actions = changed if changed is not None else snapshot.own_actions
+        for action in actions:
+            action_id = action.get("id")
+            action_type = action.get("type")
+            is_in_progress = action.get("isInProgress", False)
+            is_completed = action.get("completed", False)
+            
+            # Debug logging
+            logger.debug(f"🔍 Action {action_id}: type={action_type}, inProgress={is_in_progress}, completed={is_completed}")
+            
+            # Skip if already processed or completed
+            if action_id in self._processed_actions:
                 continue
             
-            for action in actions:
-                # Only process our own actions
-                if action.get("actorCellId") != cell_id:
-                    continue
-                
-                action_id = action.get("id")
-                action_type = action.get("type")
-                is_in_progress = action.get("isInProgress", False)
-                is_completed = action.get("completed", False)
-                
-                # Debug logging
-                logger.debug(f"🔍 Action {action_id}: type={action_type}, inProgress={is_in_progress}, completed={is_completed}")
-                
-                # Skip if already processed or completed
-                if action_id in self._processed_actions:
-                    continue
-                
-                if is_completed:
-                    self._processed_actions.add(action_id)
-                    continue
-                
-                # Check if action is available (isInProgress=True means it's our turn)
-                if not is_in_progress:
-                    continue
-                
-                # Process based on action type and enabled features
-                if action_type == "pick":
-                    if self.instalock.enabled:
-                        logger.info("🎯 Processing PICK action")
-                        self._execute_pick(action_id, session_data)
-                    else:
-                        logger.debug("⏭️ Skipping pick - instalock disabled")
-                        
-                elif action_type == "ban":
-                    if self.auto_ban.enabled:
-                        logger.info("🎯 Processing BAN action")
-                        self._execute_ban(action_id, session_data, cell_id)
-                    else:
-                        logger.debug("⏭️ Skipping ban - auto-ban disabled")
-    
-    def _execute_pick(self, action_id: int, session_data: dict) -> None:
+            if is_completed:
+                self._processed_actions.add(action_id)
+                continue
+            
+            # Check if action is available (isInProgress=True means it's our turn)
+            if not is_in_progress:
+                continue
+            
+            # Process based on action type and enabled features
+            if action_type == "pick":
+                if self.instalock.enabled:
+                    logger.info("🎯 Processing PICK action")
+                    self._execute_pick(action_id, snapshot)
+                else:
+                    logger.debug("⏭️ Skipping pick - instalock disabled")
+                    
+            elif action_type == "ban":
+                if self.auto_ban.enabled:
+                    logger.info("🎯 Processing BAN action")
+                    self._execute_ban(action_id, snapshot)
+                else:
+                    logger.debug("⏭️ Skipping ban - auto-ban disabled")
+    
+    def _execute_pick(self, action_id: int, snapshot: ChampSelectSnapshot) -> None:
         """Execute pick action."""
-        champ_id = self.selector.select_pick(self.instalock, session_data)
+        champ_id = self.selector.select_pick(self.instalock, snapshot)
         if champ_id != -1:
             self._complete_action(action_id, champ_id, "pick")
     
-    def _execute_ban(self, action_id: int, session_data: dict, cell_id: int) -> None:
+    def _execute_ban(self, action_id: int, snapshot: ChampSelectSnapshot) -> None:
         """Execute ban action."""
         logger.info(f"🎯 Attempting to ban champion (action_id: {action_id})")
         champ_id = self.selector.select_ban(
             self.auto_ban, 
-            session_data, 
-            cell_id, 
+            snapshot, 
             self.options.avoid_ally_hovers
         )
         if champ_id != -1:
@@ -771,7 +1024,7 @@ class InstalockAutoban:
             },
             "monitor": {
                 "running": self.is_running,
-                "thread_alive": self.monitor_thread.is_alive() if self.monitor_thread else False
+                "thread_alive": self.poller.is_alive() if self.poller else False
             },
             "champions_loaded": len(self.registry._champ_dict)
         }
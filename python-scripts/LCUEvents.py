@@ -0,0 +1,173 @@
+"""
+Push-based LCU events over the client's WAMP websocket.
+"""
+
+import json
+import logging
+import ssl
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+import websocket
+
+logger = logging.getLogger(__name__)
+
+# WAMP 1.0 message types used by the LCU
+WAMP_SUBSCRIBE = 5
+WAMP_EVENT = 8
+
+JSON_API_EVENT = "OnJsonApiEvent"
+
+EventHandler = Callable[[dict], None]
+
+
+class LCUEventClient:
+    """
+    Subscribes to OnJsonApiEvent and dispatches events by URI prefix.
+
+    Each event handed to a handler is the decoded payload of the LCU event:
+    a dict with "uri", "eventType" ("Create", "Update" or "Delete") and "data".
+    When the socket drops (e.g. the client restarted) the listener waits until
+    the owning Rengar's credential watcher reports the client ready again and
+    then restores the subscription.
+    Events sent while disconnected are lost; connection_id changes on every
+    reconnect so state built from earlier events can be recognised as stale.
+    """
+
+    def __init__(self, rengar, reconnect_delay: float = 1.0):
+        self.rengar = rengar
+        self.reconnect_delay = reconnect_delay
+        self.connected = threading.Event()
+        self.connection_id = 0
+        self.is_running = False
+
+        self._handlers: Dict[str, List[EventHandler]] = {}
+        self._lock = threading.Lock()
+        self._ws: Optional[websocket.WebSocket] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def subscribe(self, uri_prefix: str, handler: EventHandler) -> None:
+        """Register a handler for every event whose URI starts with uri_prefix."""
+        with self._lock:
+            self._handlers.setdefault(uri_prefix, []).append(handler)
+        self.start()
+
+    def unsubscribe(self, uri_prefix: str, handler: Optional[EventHandler] = None) -> None:
+        """Remove one handler, or all handlers for the prefix when handler is None."""
+        with self._lock:
+            handlers = self._handlers.get(uri_prefix, [])
+            if handler is None:
+                handlers.clear()
+            elif handler in handlers:
+                handlers.remove(handler)
+            if not handlers:
+                self._handlers.pop(uri_prefix, None)
+
+    def start(self) -> None:
+        """Start the listener thread if it is not running yet."""
+        if self._thread is None or not self._thread.is_alive():
+            self.is_running = True
+            self._thread = threading.Thread(
+                target=self._run,
+                daemon=True,
+                name="LCUEventClient"
+            )
+            self._thread.start()
+
+    def stop(self) -> None:
+        """Close the socket and stop the listener thread."""
+        self.is_running = False
+        ws = self._ws
+        if ws is not None:
+            ws.close()
+        if self._thread and self._thread.is_alive() and self._thread is not threading.current_thread():
+            self._thread.join(timeout=2)
+
+    def reconnect(self) -> None:
+        """Drop the current socket; the listener reconnects with the current credentials."""
+        ws = self._ws
+        if ws is not None:
+            ws.close()
+
+    def _run(self) -> None:
+        while self.is_running:
+            try:
+                self._connect()
+                self._listen()
+            except (websocket.WebSocketException, OSError) as e:
+                logger.debug(f"LCU websocket disconnected: {e}")
+            finally:
+                self.connected.clear()
+                if self._ws is not None:
+                    self._ws.close()
+                    self._ws = None
+
+            if not self.is_running:
+                break
+
+            time.sleep(self.reconnect_delay)
+            self._wait_for_client()
+
+    def _wait_for_client(self) -> None:
+        """Block until the client is ready again; its new port/token arrive through the watcher."""
+        if getattr(self.rengar, "watcher", None) is None:
+            # Fixed credentials or watch=False: nothing else re-reads them
+            self.rengar.update_league_credentials()
+            return
+        while self.is_running and not self.rengar.wait_until_ready(timeout=self.reconnect_delay):
+            pass
+
+    def _connect(self) -> None:
+        connection = self.rengar.leagueConnection
+        port = connection.port
+        if port is None:
+            raise OSError("League client not running")
+
+        ws = websocket.create_connection(
+            f"wss://127.0.0.1:{port}/",
+            header=[f"Authorization: {connection.headers['Authorization']}"],
+            subprotocols=["wamp"],
+            sslopt={"cert_reqs": ssl.CERT_NONE, "check_hostname": False},
+            timeout=5,
+        )
+        ws.settimeout(None)
+        ws.send(json.dumps([WAMP_SUBSCRIBE, JSON_API_EVENT]))
+        self._ws = ws
+        self.connection_id += 1
+        self.connected.set()
+        logger.debug(f"Subscribed to {JSON_API_EVENT} on port {port}")
+
+    def _listen(self) -> None:
+        while self.is_running:
+            message = self._ws.recv()
+            if message:
+                self._dispatch(message)
+
+    def _dispatch(self, message: str) -> None:
+        try:
+            payload = json.loads(message)
+        except ValueError:
+            return
+
+        if not (isinstance(payload, list) and len(payload) == 3 and payload[0] == WAMP_EVENT):
+            return
+
+        event = payload[2]
+        if not isinstance(event, dict):
+            return
+
+        uri = event.get("uri", "")
+        with self._lock:
+            handlers = [
+                handler
+                for prefix, prefix_handlers in self._handlers.items()
+                if uri.startswith(prefix)
+                for handler in prefix_handlers
+            ]
+
+        for handler in handlers:
+            try:
+                handler(event)
+            except Exception as e:
+                logger.error(f"❌ Error in event handler for {uri}: {e}")
@@ -0,0 +1,296 @@
+"""
+One shared poller for LCU state that several monitors watch.
+
+Each resource (gameflow phase, matchmaking search state, champ select session)
+is fetched at most once per tick no matter how many handlers subscribed to it,
+and only while at least one handler is subscribed. The shared poller adapts
+the intervals to the gameflow phase: near-idle in game or in the lobby,
+tens of milliseconds during ready check and champ select.
+"""
+
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+GAMEFLOW = "gameflow"
+MATCHMAKING = "matchmaking"
+CHAMP_SELECT = "champ_select"
+
+
+@dataclass(frozen=True)
+class Snapshot:
+    """State of one resource as of one poll; data is None when unavailable."""
+    resource: str
+    data: Any
+    fetched_at: float
+    changed: bool
+
+
+@dataclass(frozen=True)
+class GameflowSnapshot(Snapshot):
+    @property
+    def phase(self) -> str:
+        return self.data if isinstance(self.data, str) else "None"
+
+
+@dataclass(frozen=True)
+class MatchmakingSnapshot(Snapshot):
+    @property
+    def search_state(self) -> Optional[str]:
+        return self.data.get("searchState") if isinstance(self.data, dict) else None
+
+
+@dataclass(frozen=True)
+class ChampSelectSessionSnapshot(Snapshot):
+    @property
+    def in_progress(self) -> bool:
+        return isinstance(self.data, dict) and self.data.get("localPlayerCellId") is not None
+
+
+@dataclass
+class Resource:
+    """A polled endpoint and how often to fetch it."""
+    name: str
+    endpoint: str
+    interval: float
+    snapshot_type: type = Snapshot
+
+
+DEFAULT_RESOURCES = [
+    Resource(GAMEFLOW, "/lol-gameflow/v1/gameflow-phase", 1.0, GameflowSnapshot),
+    Resource(MATCHMAKING, "/lol-lobby/v2/lobby/matchmaking/search-state", 0.5, MatchmakingSnapshot),
+    Resource(CHAMP_SELECT, "/lol-champ-select/v1/session", 0.2, ChampSelectSessionSnapshot),
+]
+
+# Poll intervals in seconds per gameflow phase; missing entries keep the
+# resource's default interval
+PHASE_INTERVALS: Dict[str, Dict[str, float]] = {
+    "None": {GAMEFLOW: 5.0, MATCHMAKING: 10.0, CHAMP_SELECT: 10.0},
+    "Lobby": {GAMEFLOW: 2.0, MATCHMAKING: 2.0, CHAMP_SELECT: 10.0},
+    "Matchmaking": {GAMEFLOW: 1.0, MATCHMAKING: 0.25, CHAMP_SELECT: 5.0},
+    "ReadyCheck": {GAMEFLOW: 0.25, MATCHMAKING: 0.05, CHAMP_SELECT: 1.0},
+    "ChampSelect": {GAMEFLOW: 0.5, MATCHMAKING: 5.0, CHAMP_SELECT: 0.05},
+    "GameStart": {GAMEFLOW: 2.0, MATCHMAKING: 30.0, CHAMP_SELECT: 10.0},
+    "InProgress": {GAMEFLOW: 15.0, MATCHMAKING: 60.0, CHAMP_SELECT: 60.0},
+    "Reconnect": {GAMEFLOW: 5.0, MATCHMAKING: 60.0, CHAMP_SELECT: 60.0},
+    "WaitingForStats": {GAMEFLOW: 3.0, MATCHMAKING: 30.0, CHAMP_SELECT: 30.0},
+    "PreEndOfGame": {GAMEFLOW: 3.0, MATCHMAKING: 30.0, CHAMP_SELECT: 30.0},
+    "EndOfGame": {GAMEFLOW: 2.0, MATCHMAKING: 5.0, CHAMP_SELECT: 30.0},
+}
+
+
+@dataclass
+class Backoff:
+    """Interval growth for a resource whose polls keep failing."""
+    factor: float = 2.0
+    max_interval: float = 30.0
+
+    def interval(self, base: float, failures: int) -> float:
+        if failures <= 0:
+            return base
+        return max(base, min(base * self.factor ** failures, self.max_interval))
+
+
+SnapshotHandler = Callable[[Snapshot], None]
+
+
+class LCUPoller:
+    """
+    Polls registered resources on their own intervals from a single thread and
+    hands every snapshot to the resource's subscribers.
+
+    Handlers run on the poller thread; exceptions are logged and do not stop
+    other handlers or resources. A resource whose fetch fails (request error,
+    5xx or a body that is not JSON) is polled less often according to backoff until it succeeds again.
+    """
+
+    def __init__(self, rengar, resources: Optional[List[Resource]] = None,
+                 backoff: Optional[Backoff] = None):
+        self.rengar = rengar
+        # Copies, so set_interval never changes the module defaults
+        self.resources: Dict[str, Resource] = {
+            r.name: Resource(r.name, r.endpoint, r.interval, r.snapshot_type)
+            for r in (resources or DEFAULT_RESOURCES)
+        }
+        self.backoff = backoff or Backoff()
+        self.is_running = False
+        self.polls = 0
+
+        self._handlers: Dict[str, List[SnapshotHandler]] = {}
+        self._last: Dict[str, Snapshot] = {}
+        self._next_due: Dict[str, float] = {}
+        self._failures: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def subscribe(self, resource: str, handler: SnapshotHandler) -> None:
+        """Call handler(snapshot) after every poll of resource."""
+        if resource not in self.resources:
+            raise ValueError(f"Unknown resource: {resource}")
+        with self._lock:
+            handlers = self._handlers.setdefault(resource, [])
+            if handler not in handlers:
+                handlers.append(handler)
+            self._next_due.setdefault(resource, 0.0)
+        self.start()
+        self._wake.set()
+
+    def unsubscribe(self, resource: str, handler: Optional[SnapshotHandler] = None) -> None:
+        """Remove one handler, or all handlers of resource when handler is None."""
+        with self._lock:
+            handlers = self._handlers.get(resource, [])
+            if handler is None:
+                handlers.clear()
+            elif handler in handlers:
+                handlers.remove(handler)
+            if not handlers:
+                self._handlers.pop(resource, None)
+                self._next_due.pop(resource, None)
+                self._last.pop(resource, None)
+
+    def set_interval(self, resource: str, interval: float) -> None:
+        """Change how often resource is polled, effective immediately."""
+        with self._lock:
+            self.resources[resource].interval = interval
+            if resource in self._next_due:
+                self._next_due[resource] = min(self._next_due[resource], time.monotonic() + interval)
+        self._wake.set()
+
+    def latest(self, resource: str) -> Optional[Snapshot]:
+        """Get the most recent snapshot of a subscribed resource."""
+        return self._last.get(resource)
+
+    def start(self) -> None:
+        """Start the poller thread if it is not running yet."""
+        if self._thread is None or not self._thread.is_alive():
+            self.is_running = True
+            self._thread = threading.Thread(target=self._run, daemon=True, name="LCUPoller")
+            self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the poller thread (subscriptions are kept)."""
+        self.is_running = False
+        self._wake.set()
+        if self._thread and self._thread.is_alive() and self._thread is not threading.current_thread():
+            self._thread.join(timeout=2)
+
+    def is_alive(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def _run(self) -> None:
+        while self.is_running:
+            now = time.monotonic()
+            with self._lock:
+                due = [name for name, at in self._next_due.items() if at <= now]
+
+            for name in due:
+                try:
+                    self._poll(self.resources[name])
+                except Exception as e:
+                    # One bad poll must not end the thread every subscriber relies on
+                    logger.error(f"⚠️ Error polling {name}: {e}")
+
+            with self._lock:
+                now = time.monotonic()
+                for name in due:
+                    if name in self._next_due:
+                        interval = self.backoff.interval(self.resources[name].interval,
+                                                         self._failures.get(name, 0))
+                        self._next_due[name] = now + interval
+                wait = min(self._next_due.values()) - now if self._next_due else None
+
+            if wait is None or wait > 0:
+                self._wake.wait(wait)
+                self._wake.clear()
+
+    def _fetch(self, resource: Resource) -> Any:
+        """GET the resource; request errors, 5xx and undecodable bodies count as failures."""
+        try:
+            response = self.rengar.lcu_request("GET", resource.endpoint, "")
+            data = response.json() if response.status_code == 200 else None
+        except Exception as e:
+            logger.debug(f"Polling {resource.endpoint} failed: {e}")
+            self._failures[resource.name] = self._failures.get(resource.name, 0) + 1
+            return None
+
+        if response.status_code >= 500:
+            self._failures[resource.name] = self._failures.get(resource.name, 0) + 1
+        else:
+            self._failures.pop(resource.name, None)
+        return data
+
+    def _poll(self, resource: Resource) -> None:
+        data = self._fetch(resource)
+        self.polls += 1
+
+        previous = self._last.get(resource.name)
+        snapshot = resource.snapshot_type(
+            resource=resource.name,
+            data=data,
+            fetched_at=time.monotonic(),
+            changed=previous is None or previous.data != data,
+        )
+
+        with self._lock:
+            if resource.name not in self._handlers:
+                return
+            self._last[resource.name] = snapshot
+            handlers = list(self._handlers[resource.name])
+
+        for handler in handlers:
+            try:
+                handler(snapshot)
+            except Exception as e:
+                logger.error(f"⚠️ Error in {resource.name} poll handler: {e}")
+
+
+class PhaseScheduler:
+    """Retunes a poller's intervals whenever the gameflow phase changes."""
+
+    def __init__(self, poller: LCUPoller,
+                 phase_intervals: Optional[Dict[str, Dict[str, float]]] = None):
+        self.poller = poller
+        self.phase_intervals = phase_intervals if phase_intervals is not None else PHASE_INTERVALS
+        self.phase: Optional[str] = None
+        self._defaults = {name: r.interval for name, r in poller.resources.items()}
+
+    def start(self) -> None:
+        """Follow the gameflow phase (keeps gameflow polled while running)."""
+        self.poller.subscribe(GAMEFLOW, self._on_gameflow)
+
+    def stop(self) -> None:
+        """Stop following the phase and restore the default intervals."""
+        self.poller.unsubscribe(GAMEFLOW, self._on_gameflow)
+        self.phase = None
+        for name, interval in self._defaults.items():
+            self.poller.set_interval(name, interval)
+
+    def _on_gameflow(self, snapshot: GameflowSnapshot) -> None:
+        phase = snapshot.phase
+        if phase == self.phase:
+            return
+        self.phase = phase
+        intervals = self.phase_intervals.get(phase, {})
+        for name, default in self._defaults.items():
+            self.poller.set_interval(name, intervals.get(name, default))
+        logger.debug(f"Gameflow phase {phase}: polling {intervals or 'at defaults'}")
+
+
+_shared: Optional[LCUPoller] = None
+_shared_lock = threading.Lock()
+
+
+def shared_poller() -> LCUPoller:
+    """Get the process-wide poller, creating it (and its Rengar) on first use."""
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            from Rengar import Rengar
+            _shared = LCUPoller(Rengar())
+            PhaseScheduler(_shared).start()
+        return _shared
@@ -0,0 +1,71 @@
+"""
+Lightweight response object returned by Rengar.
+
+The body is kept as bytes and decoded at most once: json() parses on first
+use (with orjson when it is installed) and returns the same object on every
+later call, including to other threads sharing a cached or coalesced
+response, so callers must treat the result as read-only. Error detection
+looks at the parsed payload instead of scanning the text.
+"""
+
+from typing import Any, Optional
+
+try:
+    from orjson import loads
+except ImportError:
+    from json import loads
+
+_UNPARSED = object()
+
+
+class LCUResponse:
+    """Status, headers and body of one LCU or Riot Client response."""
+
+    __slots__ = ("status_code", "content", "headers", "url", "_payload", "_text")
+
+    def __init__(self, status_code: int, content: bytes, headers=None, url: str = ""):
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers if headers is not None else {}
+        self.url = url
+        self._payload = _UNPARSED
+        self._text: Optional[str] = None
+
+    @classmethod
+    def from_requests(cls, response) -> "LCUResponse":
+        return cls(response.status_code, response.content, response.headers, response.url)
+
+    @property
+    def text(self) -> str:
+        if self._text is None:
+            self._text = self.content.decode("utf-8", errors="replace")
+        return self._text
+
+    @property
+    def ok(self) -> bool:
+        return self.status_code < 400
+
+    def json(self) -> Any:
+        """Get the parsed body; raises ValueError if it is empty or not JSON."""
+        if self._payload is _UNPARSED:
+            self._payload = loads(self.content)
+        return self._payload
+
+    @property
+    def error_code(self) -> Optional[str]:
+        """The LCU errorCode (e.g. "RPC_ERROR") when the body is an error payload."""
+        if not self.content or self.content[:1] != b"{":
+            return None
+        try:
+            payload = self.json()
+        except ValueError:
+            return None
+        return payload.get("errorCode") if isinstance(payload, dict) else None
+
+    @property
+    def is_error(self) -> bool:
+        """True for a 4xx/5xx status or an LCU error payload."""
+        return self.status_code >= 400 or self.error_code is not None
+
+    def __repr__(self) -> str:
+        return f"<LCUResponse [{self.status_code}]>"
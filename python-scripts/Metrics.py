@@ -0,0 +1,141 @@
+"""
+Request counters and latency histograms per method and endpoint template.
+
+Endpoints are grouped by template, so /lol-champ-select/v1/session/actions/3
+and /actions/4 are both counted as /lol-champ-select/v1/session/actions/{id}.
+Latencies go into fixed logarithmic buckets (about 12% wide), so recording is
+a bisect plus a few additions and percentiles are estimated from the
+buckets.
+"""
+
+import re
+import threading
+import time
+from bisect import bisect_left
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+# Bucket upper bounds in milliseconds: 0.1 ms .. ~120 s
+BUCKET_BOUNDS: List[float] = [0.1 * 1.12 ** i for i in range(124)]
+
+_ID_SEGMENT = re.compile(r"^(\d+|[0-9a-fA-F-]{16,}|[^/]*@[^/]*)$")
+
+
+@lru_cache(maxsize=2048)
+def endpoint_template(endpoint: str) -> str:
+    """Strip the query string and replace ID-like path segments with {id}."""
+    path = endpoint.split("?", 1)[0]
+    return "/".join("{id}" if _ID_SEGMENT.match(segment) else segment for segment in path.split("/"))
+
+
+class LatencyHistogram:
+    """Counts of latencies per logarithmic bucket."""
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKET_BOUNDS) + 1)
+        self.total = 0
+        self.sum_ms = 0.0
+        self.max_ms = 0.0
+
+    def record(self, ms: float) -> None:
+        self.counts[bisect_left(BUCKET_BOUNDS, ms)] += 1
+        self.total += 1
+        self.sum_ms += ms
+        if ms > self.max_ms:
+            self.max_ms = ms
+
+    def percentile(self, p: float) -> float:
+        """Estimate the p-th percentile (0-100), interpolating inside its bucket."""
+        if not self.total:
+            return 0.0
+        rank = p / 100 * self.total
+        seen = 0
+        for index, count in enumerate(self.counts):
+            if count and seen + count >= rank:
+                if index == len(BUCKET_BOUNDS):
+                    return self.max_ms
+                lower = BUCKET_BOUNDS[index - 1] if index else 0.0
+                upper = BUCKET_BOUNDS[index]
+                return min(lower + (upper - lower) * (rank - seen) / count, self.max_ms)
+            seen += count
+        return self.max_ms
+
+
+class EndpointStats:
+    """Counters for one (method, endpoint template)."""
+
+    __slots__ = ("count", "errors", "bytes", "statuses", "latency")
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.bytes = 0
+        self.statuses: Dict[int, int] = {}
+        self.latency = LatencyHistogram()
+
+    def to_dict(self) -> dict:
+        latency = self.latency
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "bytes": self.bytes,
+            "statuses": dict(self.statuses),
+            "mean_ms": round(latency.sum_ms / latency.total, 3) if latency.total else 0.0,
+            "p50_ms": round(latency.percentile(50), 3),
+            "p95_ms": round(latency.percentile(95), 3),
+            "p99_ms": round(latency.percentile(99), 3),
+            "max_ms": round(latency.max_ms, 3),
+        }
+
+
+class RequestMetrics:
+    """
+    Thread-safe registry of EndpointStats.
+
+    A request counts as an error when it raised (status None) or the client
+    answered with a 5xx.
+    """
+
+    def __init__(self):
+        self.enabled = True
+        self.started = time.time()
+        self._stats: Dict[Tuple[str, str], EndpointStats] = {}
+        self._lock = threading.Lock()
+
+    def record(self, method: str, endpoint: str, seconds: float,
+               status: Optional[int], size: int = 0) -> None:
+        if not self.enabled:
+            return
+        key = (method, endpoint_template(endpoint))
+        with self._lock:
+            stats = self._stats.get(key)
+            if stats is None:
+                stats = self._stats[key] = EndpointStats()
+            stats.count += 1
+            stats.bytes += size
+            if status is None or status >= 500:
+                stats.errors += 1
+            if status is not None:
+                stats.statuses[status] = stats.statuses.get(status, 0) + 1
+            stats.latency.record(seconds * 1000)
+
+    def snapshot(self) -> dict:
+        """Get {"METHOD /template": stats} plus totals, as plain JSON types."""
+        with self._lock:
+            endpoints = {f"{method} {template}": stats.to_dict()
+                         for (method, template), stats in sorted(self._stats.items())}
+        return {
+            "since": self.started,
+            "requests": sum(e["count"] for e in endpoints.values()),
+            "errors": sum(e["errors"] for e in endpoints.values()),
+            "endpoints": endpoints,
+        }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+            self.started = time.time()
+
+
+# Shared by every Rengar in the process unless one is given its own
+registry = RequestMetrics()
@@ -0,0 +1,517 @@
+"""
+Local stand-in for the League client API, for benchmarks and offline runs.
+
+Serves HTTPS on 127.0.0.1 with a self-signed certificate, checks the same
+Basic auth as the real client and answers the endpoints the scripts use from
+in-memory state. Like the client it also accepts the WAMP websocket on "/";
+publish() pushes an OnJsonApiEvent to every subscribed socket. Every response can be delayed by a configurable latency with
+uniform jitter. Point a Rengar at it with Rengar(credentials=mock.credentials()).
+
+Usage: python MockLCU.py [--port N] [--latency-ms N] [--jitter-ms N]
+"""
+
+import argparse
+import base64
+import hashlib
+import json
+import os
+import random
+import re
+import secrets
+import shutil
+import socket
+import ssl
+import struct
+import subprocess
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from Credentials import ClientCredentials
+
+CERT_DIR = os.path.join(tempfile.gettempdir(), "ltk-mock-lcu")
+
+WEBSOCKET_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+OP_TEXT, OP_CLOSE, OP_PING, OP_PONG = 0x1, 0x8, 0x9, 0xA
+
+Route = Callable[["MockLCU", re.Match, Any, Dict[str, List[str]]], Tuple[int, Any]]
+
+
+def ensure_certificate(directory: str = CERT_DIR) -> Tuple[str, str]:
+    """Create (once) a self-signed localhost certificate; returns (certfile, keyfile)."""
+    certfile = os.path.join(directory, "cert.pem")
+    keyfile = os.path.join(directory, "key.pem")
+    if os.path.exists(certfile) and os.path.exists(keyfile):
+        return certfile, keyfile
+
+    openssl = shutil.which("openssl")
+    if openssl is None:
+        raise RuntimeError("openssl not found; pass certfile/keyfile to MockLCU")
+
+    os.makedirs(directory, exist_ok=True)
+    subprocess.run(
+        [openssl, "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "3650",
+         "-subj", "/CN=127.0.0.1", "-keyout", keyfile, "-out", certfile],
+        check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    return certfile, keyfile
+
+
+def _rpc_error(status: int, message: str) -> Tuple[int, dict]:
+    return status, {"errorCode": "RPC_ERROR", "httpStatus": status, "message": message}
+
+
+def default_state() -> dict:
+    """Client state the mock starts with: idle in the lobby."""
+    summoners = {
+        summoner_id: {
+            "summonerId": summoner_id,
+            "puuid": f"puuid-{summoner_id}",
+            "gameName": f"Player{summoner_id}",
+            "tagLine": "MOCK",
+            "summonerLevel": 30 + summoner_id,
+        }
+        for summoner_id in range(1, 11)
+    }
+    return {
+        "current_summoner": dict(summoners[1], profileIconId=29),
+        "summoners": summoners,
+        "region": {"locale": "en_US", "region": "NA", "webRegion": "na"},
+        "game_version": "14.20.626.8123",
+        "phase": "Lobby",
+        "search_state": {"searchState": "Invalid"},
+        "champ_select": None,
+        "champions": [{"id": champ_id, "name": f"Champion{champ_id}", "freeToPlay": False,
+                       "ownership": {"owned": True}} for champ_id in range(1, 171)],
+        "ranked": {"queues": [{"queueType": "RANKED_SOLO_5x5", "tier": "GOLD",
+                               "division": "II", "leaguePoints": 42}]},
+        "friends": [{"pid": f"friend-{n}@pvp.net", "name": f"Friend{n}"} for n in range(1, 51)],
+        "chat_me": {"availability": "chat", "statusMessage": ""},
+        "chat_session": {"state": "connected"},
+        "challenges": {"title": {"itemId": -1}, "bannerId": "", "topChallenges": []},
+        "ux_restarts": 0,
+    }
+
+
+def _get(key: str) -> Route:
+    return lambda mock, match, body, query: (200, mock.state[key])
+
+
+def _champ_select(mock, match, body, query):
+    session = mock.state["champ_select"]
+    return (200, session) if session else _rpc_error(404, "No active delegate")
+
+
+def _patch_action(mock, match, body, query):
+    session = mock.state["champ_select"]
+    if not session:
+        return _rpc_error(404, "No active delegate")
+    action_id = int(match.group(1))
+    for group in session.get("actions", []):
+        for action in group:
+            if action.get("id") == action_id:
+                action.update(body or {})
+                return 204, None
+    return _rpc_error(404, f"Unknown action {action_id}")
+
+
+def _summoner(mock, match, body, query):
+    summoner = mock.state["summoners"].get(int(match.group(1)))
+    return (200, summoner) if summoner else _rpc_error(404, "Summoner not found")
+
+
+def _summoners_bulk(mock, match, body, query):
+    ids = json.loads(query.get("ids", ["[]"])[0])
+    return 200, [mock.state["summoners"][i] for i in ids if i in mock.state["summoners"]]
+
+
+def _summoner_by_puuid(mock, match, body, query):
+    for summoner in mock.state["summoners"].values():
+        if summoner["puuid"] == match.group(1):
+            return 200, summoner
+    return _rpc_error(404, "Summoner not found")
+
+
+def _delete_friend(mock, match, body, query):
+    friends = mock.state["friends"]
+    mock.state["friends"] = [f for f in friends if f["pid"] != match.group(1)]
+    return (204, None) if len(mock.state["friends"]) < len(friends) else _rpc_error(404, "Not a friend")
+
+
+def _accept(mock, match, body, query):
+    mock.state["search_state"] = {"searchState": "Invalid"}
+    return 204, None
+
+
+def _set_icon(mock, match, body, query):
+    mock.state["current_summoner"]["profileIconId"] = (body or {}).get("profileIconId")
+    return 201, mock.state["current_summoner"]
+
+
+def _save_alias(mock, match, body, query):
+    mock.state["current_summoner"].update(body or {})
+    return 200, mock.state["current_summoner"]
+
+
+def _put_me(mock, match, body, query):
+    mock.state["chat_me"].update(body or {})
+    return 201, mock.state["chat_me"]
+
+
+def _set_profile(mock, match, body, query):
+    body = body or {}
+    mock.state["current_summoner"][body.get("key")] = body.get("value")
+    return 200, mock.state["current_summoner"]
+
+
+def _set_challenge_preferences(mock, match, body, query):
+    body = body or {}
+    player = mock.state["challenges"]
+    player["topChallenges"] = [{"id": i} for i in body.get("challengeIds", [])]
+    if "title" in body:
+        player["title"] = {"itemId": int(body["title"])}
+    if "bannerAccent" in body:
+        player["bannerId"] = body["bannerAccent"]
+    return 204, None
+
+
+def _set_chat_state(state: str) -> Route:
+    def handler(mock, match, body, query):
+        mock.state["chat_session"]["state"] = state
+        return 204, None
+    return handler
+
+
+def _participants(mock, match, body, query):
+    """Champ select chat members; the client lists them even with hidden names."""
+    session = mock.state["champ_select"]
+    if not session:
+        return 200, {"participants": []}
+    participants = []
+    for member in session.get("myTeam", []):
+        summoner = mock.state["summoners"].get(member.get("summonerId"))
+        if summoner:
+            participants.append({"cid": "mock-champ-select@champ-select.pvp.net",
+                                 "game_name": summoner["gameName"],
+                                 "game_tag": summoner["tagLine"]})
+    return 200, {"participants": participants}
+
+
+def _restart_ux(mock, match, body, query):
+    mock.state["ux_restarts"] += 1
+    return 204, None
+
+
+def _invoke(mock, match, body, query):
+    """lcdsServiceProxy calls; only the champ select dodge (quitV2) is modelled."""
+    args = query.get("args", [""])[0]
+    if query.get("destination") != ["lcdsServiceProxy"] or "quitV2" not in args:
+        return _rpc_error(400, "Unsupported invoke")
+    if not mock.state["champ_select"]:
+        return _rpc_error(404, "No active delegate")
+    mock.state["champ_select"] = None
+    mock.state["phase"] = "Lobby"
+    return 200, None
+
+
+ROUTES: List[Tuple[str, str, Route]] = [
+    ("GET", r"/lol-summoner/v1/current-summoner", _get("current_summoner")),
+    ("GET", r"/lol-summoner/v1/summoners/(\d+)", _summoner),
+    ("GET", r"/lol-summoner/v2/summoners", _summoners_bulk),
+    ("GET", r"/lol-summoner/v2/summoners/puuid/([^/]+)", _summoner_by_puuid),
+    ("GET", r"/riotclient/region-locale", _get("region")),
+    ("GET", r"/lol-patch/v1/game-version", _get("game_version")),
+    ("GET", r"/lol-gameflow/v1/gameflow-phase", _get("phase")),
+    ("GET", r"/lol-lobby/v2/lobby/matchmaking/search-state", _get("search_state")),
+    ("POST", r"/lol-matchmaking/v1/ready-check/accept", _accept),
+    ("GET", r"/lol-champ-select/v1/session", _champ_select),
+    ("PATCH", r"/lol-champ-select/v1/session/actions/(\d+)", _patch_action),
+    ("GET", r"/lol-champ-select/v1/all-grid-champions", _get("champions")),
+    ("GET", r"/lol-champions/v1/owned-champions-minimal", _get("champions")),
+    ("GET", r"/lol-ranked/v1/current-ranked-stats", _get("ranked")),
+    ("GET", r"/lol-chat/v1/friends", _get("friends")),
+    ("DELETE", r"/lol-chat/v1/friends/([^/]+)", _delete_friend),
+    ("PUT", r"/lol-summoner/v1/current-summoner/icon", _set_icon),
+    ("POST", r"/lol-summoner/v1/save-alias", _save_alias),
+    ("PUT", r"/lol-chat/v1/me", _put_me),
+    ("POST", r"/lol-summoner/v1/current-summoner/summoner-profile", _set_profile),
+    ("GET", r"/lol-challenges/v1/summary-player-data/local-player", _get("challenges")),
+    ("POST", r"/lol-challenges/v1/update-player-preferences/?", _set_challenge_preferences),
+    ("GET", r"/chat/v1/session", _get("chat_session")),
+    ("POST", r"/chat/v1/suspend", _set_chat_state("disconnected")),
+    ("POST", r"/chat/v1/resume", _set_chat_state("connected")),
+    ("GET", r"/chat/v5/participants", _participants),
+    ("POST", r"/riotclient/kill-and-restart-ux", _restart_ux),
+    ("GET", r"/lol-champions/v1/inventories/local-player/champions", _get("champions")),
+    ("POST", r"/lol-login/v1/session/invoke", _invoke),
+]
+
+
+def _read_frame(rfile) -> Optional[Tuple[int, bytes]]:
+    """Read one client frame; None once the socket is closed."""
+    header = rfile.read(2)
+    if len(header) < 2:
+        return None
+    opcode, length = header[0] & 0x0F, header[1] & 0x7F
+    if length == 126:
+        length = struct.unpack("!H", rfile.read(2))[0]
+    elif length == 127:
+        length = struct.unpack("!Q", rfile.read(8))[0]
+    mask = rfile.read(4) if header[1] & 0x80 else b"\0\0\0\0"
+    data = rfile.read(length)
+    return opcode, bytes(b ^ mask[i % 4] for i, b in enumerate(data))
+
+
+def _frame(opcode: int, data: bytes) -> bytes:
+    """Encode one unmasked server frame."""
+    length = len(data)
+    if length < 126:
+        header = struct.pack("!BB", 0x80 | opcode, length)
+    elif length < 1 << 16:
+        header = struct.pack("!BBH", 0x80 | opcode, 126, length)
+    else:
+        header = struct.pack("!BBQ", 0x80 | opcode, 127, length)
+    return header + data
+
+
+class _WebSocket:
+    """One accepted websocket: a locked writer plus its WAMP subscriptions."""
+
+    def __init__(self, connection, wfile):
+        self.connection = connection
+        self.wfile = wfile
+        self.topics = set()
+        self._lock = threading.Lock()
+
+    def send(self, opcode: int, data: bytes) -> None:
+        with self._lock:
+            self.wfile.write(_frame(opcode, data))
+            self.wfile.flush()
+
+    def close(self) -> None:
+        try:
+            self.connection.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    # Bursts of new connections (e.g. a pool rebuilt after a credential swap)
+    # must not overflow the default backlog of 5
+    request_queue_size = 128
+
+
+class MockLCU:
+    """
+    In-process mock of the LCU HTTPS API.
+
+    state holds the client state served by the routes and may be changed
+    while the server runs (e.g. state["phase"] = "ChampSelect"). Every handled
+    request is appended to requests as (monotonic time, method, path, body).
+    """
+
+    def __init__(self, port: int = 0, latency: float = 0.0, jitter: float = 0.0,
+                 token: Optional[str] = None, certfile: Optional[str] = None,
+                 keyfile: Optional[str] = None):
+        self.latency = latency
+        self.jitter = jitter
+        self.token = token or secrets.token_urlsafe(16)
+        self.state = default_state()
+        self.requests: List[Tuple[float, str, str, Any]] = []
+        self.routes = [(method, re.compile(pattern + "$"), handler) for method, pattern, handler in ROUTES]
+        self.sockets: List[_WebSocket] = []
+
+        if certfile is None:
+            certfile, keyfile = ensure_certificate()
+        context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        context.load_cert_chain(certfile, keyfile)
+
+        self._auth = "Basic " + base64.b64encode(f"riot:{self.token}".encode("utf-8")).decode("utf-8")
+        self._lock = threading.Lock()
+        self._server = _Server(("127.0.0.1", port), self._handler_class())
+        # The TLS handshake runs on the first read in the handler thread, not in accept()
+        self._server.socket = context.wrap_socket(self._server.socket, server_side=True,
+                                                  do_handshake_on_connect=False)
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def port(self) -> int:
+        return self._server.server_address[1]
+
+    def credentials(self) -> ClientCredentials:
+        """Credentials a Rengar can be constructed with to talk to this mock."""
+        return ClientCredentials(
+            pid=os.getpid(),
+            lcu_port=str(self.port),
+            lcu_token=self.token,
+            riot_port=str(self.port),
+            riot_token=self.token,
+        )
+
+    def start(self) -> "MockLCU":
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._server.serve_forever, daemon=True, name="MockLCU")
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        # Open websockets outlive shutdown(); drop them like a closing client would
+        with self._lock:
+            sockets, self.sockets = self.sockets, []
+        for ws in sockets:
+            ws.close()
+        self._thread = None
+
+    def publish(self, uri: str, data: Any, event_type: str = "Update") -> int:
+        """Push an OnJsonApiEvent to every subscribed websocket; returns how many got it."""
+        message = json.dumps([8, "OnJsonApiEvent", {"data": data, "eventType": event_type, "uri": uri}])
+        with self._lock:
+            sockets = [ws for ws in self.sockets if "OnJsonApiEvent" in ws.topics]
+        sent = 0
+        for ws in sockets:
+            try:
+                ws.send(OP_TEXT, message.encode("utf-8"))
+                sent += 1
+            except OSError:
+                pass
+        return sent
+
+    def subscribers(self) -> int:
+        with self._lock:
+            return sum(1 for ws in self.sockets if ws.topics)
+
+    def _serve_websocket(self, handler) -> None:
+        if handler.headers.get("Authorization") != self._auth:
+            handler.send_error(401)
+            return
+
+        key = handler.headers.get("Sec-WebSocket-Key", "")
+        accept = base64.b64encode(hashlib.sha1((key + WEBSOCKET_GUID).encode("ascii")).digest()).decode("ascii")
+        handler.send_response(101, "Switching Protocols")
+        handler.send_header("Upgrade", "websocket")
+        handler.send_header("Connection", "Upgrade")
+        handler.send_header("Sec-WebSocket-Accept", accept)
+        if "wamp" in handler.headers.get("Sec-WebSocket-Protocol", ""):
+            handler.send_header("Sec-WebSocket-Protocol", "wamp")
+        handler.end_headers()
+        handler.wfile.flush()
+        handler.close_connection = True
+
+        ws = _WebSocket(handler.connection, handler.wfile)
+        with self._lock:
+            self.sockets.append(ws)
+        try:
+            while True:
+                frame = _read_frame(handler.rfile)
+                if frame is None:
+                    break
+                opcode, data = frame
+                if opcode == OP_CLOSE:
+                    ws.send(OP_CLOSE, data[:2])
+                    break
+                if opcode == OP_PING:
+                    ws.send(OP_PONG, data)
+                elif opcode == OP_TEXT:
+                    self._on_wamp_message(ws, data)
+        except OSError:
+            pass
+        finally:
+            with self._lock:
+                if ws in self.sockets:
+                    self.sockets.remove(ws)
+
+    def _on_wamp_message(self, ws: _WebSocket, data: bytes) -> None:
+        try:
+            message = json.loads(data)
+        except ValueError:
+            return
+        # [5, topic] subscribes, [6, topic] unsubscribes
+        if isinstance(message, list) and len(message) == 2 and message[0] in (5, 6):
+            with self._lock:
+                (ws.topics.add if message[0] == 5 else ws.topics.discard)(message[1])
+
+    def __enter__(self) -> "MockLCU":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def _delay(self) -> None:
+        delay = self.latency + random.uniform(-self.jitter, self.jitter)
+        if delay > 0:
+            time.sleep(delay)
+
+    def handle(self, method: str, target: str, headers, body: Any) -> Tuple[int, Any]:
+        """Route one request; returns (status, JSON payload or None)."""
+        if headers.get("Authorization") != self._auth:
+            return 401, {"errorCode": "UNAUTHORIZED", "httpStatus": 401, "message": "Unauthorized"}
+
+        url = urlsplit(target)
+        with self._lock:
+            self.requests.append((time.monotonic(), method, url.path, body))
+            for route_method, pattern, handler in self.routes:
+                match = pattern.match(url.path)
+                if match and route_method == method:
+                    return handler(self, match, body, parse_qs(url.query))
+        return _rpc_error(404, f"Resource not found: {url.path}")
+
+    def _handler_class(self):
+        mock = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Headers and body go out in separate writes; without this the
+            # client's delayed ACK adds ~40 ms to every keep-alive response
+            disable_nagle_algorithm = True
+
+            def _serve(self):
+                if self.headers.get("Upgrade", "").lower() == "websocket":
+                    mock._serve_websocket(self)
+                    return
+
+                length = int(self.headers.get("Content-Length") or 0)
+                raw = self.rfile.read(length) if length else b""
+                try:
+                    body = json.loads(raw) if raw else None
+                except ValueError:
+                    body = None
+
+                mock._delay()
+                status, payload = mock.handle(self.command, self.path, self.headers, body)
+
+                data = b"" if payload is None else json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = _serve
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run a mock League client API on localhost")
+    parser.add_argument("--port", type=int, default=0)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    args = parser.parse_args()
+
+    with MockLCU(args.port, args.latency_ms / 1000, args.jitter_ms / 1000) as server:
+        creds = server.credentials()
+        print(json.dumps({"port": creds.lcu_port, "token": creds.lcu_token}), flush=True)
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            pass
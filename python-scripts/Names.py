@@ -0,0 +1,40 @@
+"""
+Name normalization shared by champion lookup and skin search.
+
+Both fold case and accents the same way and split names on anything that is
+not a letter or digit: "Kai'Sa" -> ["kai", "sa"], "Héartbreaker" ->
+["heartbreaker"]. Non-Latin letters are kept.
+"""
+
+import re
+import unicodedata
+from typing import List, Set
+
+_WORD = re.compile(r"[^\W_]+")
+
+
+def fold(text: str) -> str:
+    """Lowercase and strip accents: "Héartbreaker" -> "heartbreaker"."""
+    decomposed = unicodedata.normalize("NFKD", text)
+    return "".join(c for c in decomposed if not unicodedata.combining(c)).lower()
+
+
+def name_tokens(text: str) -> List[str]:
+    """Split a folded name into words: "Nunu & Willump" -> ["nunu", "willump"]."""
+    return _WORD.findall(fold(text))
+
+
+def normalize_name(name: str) -> str:
+    """Fold case, accents and punctuation: "Kai'Sa" -> "kaisa", "Nunu & Willump" -> "nunuwillump"."""
+    return "".join(name_tokens(name))
+
+
+def trigrams(key: str, padded: bool = True) -> Set[str]:
+    """
+    Character trigrams of a normalized key. Padding with ^ and $ weights the
+    start and end of the name; substring filters need it off, so that every
+    trigram of the query also occurs inside the longer name.
+    """
+    if padded:
+        key = f"^{key}$"
+    return {key[i:i + 3] for i in range(len(key) - 2)}
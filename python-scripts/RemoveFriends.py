@@ -2,10 +2,48 @@ from time import sleep
 
 from termcolor import colored
 
+from Bulk import TransientError, run_bulk
 from Rengar import Rengar
 
 rengar = Rengar()
 
+DELETE_TIMEOUT = 5
+TRANSIENT_STATUS = (429, 500, 502, 503, 504)
+
+
+def delete_friend(friend, retried=False):
+    """Delete one friend; raises TransientError for responses worth retrying"""
+    friend_id = friend.get("pid")
+    delete_response = rengar.lcu_request(
+        "DELETE", f"/lol-chat/v1/friends/{friend_id}", "", timeout=DELETE_TIMEOUT
+    )
+
+    if delete_response.status_code in TRANSIENT_STATUS:
+        raise TransientError(f"HTTP {delete_response.status_code}")
+    # A failed earlier attempt may still have removed the friend
+    if retried and delete_response.status_code == 404:
+        return True
+    return delete_response.status_code in [200, 204]
+
+
+def remove_friends(friends, on_progress=None, concurrency=8, rate=20.0):
+    """Delete the given friends in parallel; returns a Bulk.BulkReport"""
+    rengar.ensure_pool_size(concurrency)
+    attempted = set()
+
+    def delete(friend):
+        retried = friend.get("pid") in attempted
+        attempted.add(friend.get("pid"))
+        return delete_friend(friend, retried)
+
+    return run_bulk(
+        friends,
+        delete,
+        concurrency=concurrency,
+        rate=rate,
+        on_progress=on_progress,
+    )
+
 
 def remove_all_friends():
     try:
@@ -19,28 +57,14 @@ def remove_all_friends():
                 input("\nPress Enter.")
                 return
 
-            removed_count = 0
-            failed_count = 0
-
-            for friend in friends:
-                friend_id = friend.get("pid")
-
-                try:
-                    delete_response = rengar.lcu_request(
-                        "DELETE", f"/lol-chat/v1/friends/{friend_id}", ""
-                    )
-
-                    if delete_response.status_code in [200, 204]:
-                        removed_count += 1
-                    else:
-                        failed_count += 1
+            def show_progress(done, total, outcome):
+                print(f"\rRemoving friends... {done}/{total}", end="", flush=True)
 
-                except Exception as e:
-                    failed_count += 1
+            report = remove_friends(friends, on_progress=show_progress)
 
-            print(colored(f"\nRemoved {removed_count} friend(s)", "green"))
-            if failed_count > 0:
-                print(colored(f"Failed to remove {failed_count} friend(s)", "red"))
+            print(colored(f"\nRemoved {report.succeeded} friend(s)", "green"))
+            if report.failed > 0:
+                print(colored(f"Failed to remove {report.failed} friend(s)", "red"))
 
             sleep(1)
 
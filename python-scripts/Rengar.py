@@ -1,52 +1,79 @@
 #importando as bibliotecas necessárias do programa
 
-import psutil
 import requests
 import base64
 import json
+import ssl
+import threading
 import urllib3
-from time import sleep
+from dataclasses import dataclass
+from typing import Optional
+from requests.adapters import HTTPAdapter
+from time import monotonic, perf_counter, sleep
+
+from Cache import CacheRule, ResponseCache, SingleFlight
+from Credentials import CredentialWatcher, discover_credentials
+from LCUEvents import LCUEventClient
+from LCUResponse import LCUResponse
+from Resilience import (CircuitBreaker, ClientUnavailable, DeadlineExceeded, RetryPolicy,
+                        attempt_timeout, remaining)
+import Metrics
 
 urllib3.disable_warnings()
 
+# Conexões keep-alive mantidas por cliente (LCU e Riot Client)
+DEFAULT_POOL_SIZE = 10
+
+REQUEST_METHODS = ("GET", "POST", "PUT", "DELETE", "PATCH")
+
+# Endpoints que quase não mudam durante uma sessão do cliente (cache opt-in)
+SUMMONER_WRITES = [
+    ("POST", "/lol-summoner/v1/save-alias"),
+    ("PUT", "/lol-summoner/v1/current-summoner/icon"),
+    ("POST", "/lol-summoner/v1/current-summoner/summoner-profile"),
+]
+DEFAULT_CACHE_RULES = [
+    CacheRule("/riotclient/region-locale", ttl=None, maxsize=1),
+    # O nível muda ao fim de cada partida: o api_bridge invalida no EndOfGame e o TTL cobre eventos perdidos
+    CacheRule("/lol-summoner/v1/current-summoner", ttl=300, maxsize=1, invalidated_by=SUMMONER_WRITES),
+    CacheRule("/lol-champ-select/v1/all-grid-champions", ttl=600, maxsize=1),
+    CacheRule("/lol-challenges/v1/summary-player-data/local-player", ttl=60, maxsize=1,
+              invalidated_by=[("POST", "/lol-challenges/v1/update-player-preferences/")]),
+]
+
 
-def find_league_client_credentials():
-    for proc in psutil.process_iter(['pid', 'name', 'cmdline']):
-        if proc.info['name'] == 'LeagueClientUx.exe':
-            cmdline = proc.info['cmdline']
-            port = None
-            token = None
-            for arg in cmdline:
-                if arg.startswith('--app-port='):
-                    port = arg.split('=')[1]
-                elif arg.startswith('--remoting-auth-token='):
-                    token = arg.split('=')[1]
-            if port and token:
-                return port, token
-    return None, None
-
-def check_league_client():
+def _never_sent(error):
+    """Whether the request surely did not reach the client, so even a write may be repeated."""
+    if isinstance(error, (ClientUnavailable, requests.exceptions.ConnectTimeout)):
+        return True
+    # ConnectionError envolve o MaxRetryError do urllib3; só NewConnectionError garante que nada saiu
+    reason = getattr(error.args[0], "reason", None) if error.args else None
+    return isinstance(reason, urllib3.exceptions.NewConnectionError)
+
+
+def find_league_client_credentials(refresh=False):
+    creds = discover_credentials(refresh)
+    if creds is None:
+        return None, None
+    return creds.lcu_port, creds.lcu_token
+
+def check_league_client(timeout=None):
+    """Wait for the League client; (None, None) if it is not up within timeout seconds."""
+    deadline = None if timeout is None else monotonic() + timeout
     while True:
         port_check, token_check = find_league_client_credentials()
-        if port_check == None and token_check == None:
-            sleep(0.5)
-        else:
+        if port_check is not None or token_check is not None:
             return port_check, token_check
+        if deadline is not None and monotonic() >= deadline:
+            return None, None
+        sleep(0.5)
 
 
-def find_riot_client_credentials():
-    port = None
-    token = None
-    for process in psutil.process_iter(attrs=['pid', 'name', 'cmdline']):
-        if 'LeagueClientUx' in process.info['name']:
-            for arg in process.info['cmdline']:
-                if '--riotclient-auth-token=' in arg:
-                    token = arg.split('=')[1]
-                if '--riotclient-app-port=' in arg:
-                    port = arg.split('=')[1]
-            if token and port:
-                break
-    return port, token
+def find_riot_client_credentials(refresh=False):
+    creds = discover_credentials(refresh)
+    if creds is None:
+        return None, None
+    return creds.riot_port, creds.riot_token
 
 
 def return_lcu_url(leaguePort):
@@ -77,83 +104,365 @@ def return_lcu_headers(leagueToken):
     return headers
 
 
+def lcu_ready(creds, timeout=1.0):
+    """True once the LCU on these credentials answers requests (the backend starts before the API is up)."""
+    session = create_session(return_lcu_headers(creds.lcu_token), pool_size=1)
+    try:
+        response = session.get(f"{return_lcu_url(creds.lcu_port)}/lol-gameflow/v1/gameflow-phase", timeout=timeout)
+        return response.status_code == 200
+    except requests.RequestException:
+        return False
+    finally:
+        session.close()
+
+
+_watcher = None
+_watcher_lock = threading.Lock()
+
+
+def credential_watcher():
+    """The watcher shared by every Rengar that discovers its own credentials, started on first use."""
+    global _watcher
+    with _watcher_lock:
+        if _watcher is None:
+            _watcher = CredentialWatcher(probe=lcu_ready)
+            _watcher.start()
+        return _watcher
+
+
+def _client_ssl_context():
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
+    context.check_hostname = False
+    context.verify_mode = ssl.CERT_NONE
+    return context
+
+
+# O certificado do cliente é autoassinado e não é verificado; sem um contexto próprio
+# o urllib3 recarrega os CAs do sistema a cada nova conexão (dezenas de ms com o GIL)
+CLIENT_SSL_CONTEXT = _client_ssl_context()
+
+
+class ClientAdapter(HTTPAdapter):
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs["ssl_context"] = CLIENT_SSL_CONTEXT
+        super().init_poolmanager(*args, **kwargs)
+
+
+def create_session(headers, pool_size=DEFAULT_POOL_SIZE):
+    """Create a keep-alive session with the client headers baked in."""
+    session = requests.Session()
+    session.headers.update(headers)
+    session.verify = False
+    # O cliente é local: ignora proxies e REQUESTS_CA_BUNDLE do ambiente, que
+    # sobrescreveriam verify=False e custam uma consulta ao ambiente por requisição
+    session.trust_env = False
+    adapter = ClientAdapter(pool_connections=1, pool_maxsize=pool_size)
+    session.mount('https://', adapter)
+    return session
+
+
+@dataclass(frozen=True)
+class Connection:
+    """Porta, token, URL, headers e pool de um cliente, trocados sempre juntos."""
+    port: Optional[str]
+    token: Optional[str]
+    url: str
+    headers: dict
+    session: requests.Session
+
+
+def open_connection(port, token, pool_size=DEFAULT_POOL_SIZE, riot=False):
+    url = return_riot_url(port) if riot else return_lcu_url(port)
+    headers = return_riot_headers(token) if riot else return_lcu_headers(token)
+    return Connection(port, token, url, headers, create_session(headers, pool_size))
+
+
 class Rengar:
-    def __init__(self):
+    # Leitura do snapshot atual; nunca misturam credenciais de clientes diferentes
+    leaguePort = property(lambda self: self.leagueConnection.port)
+    leagueToken = property(lambda self: self.leagueConnection.token)
+    leagueUrl = property(lambda self: self.leagueConnection.url)
+    leagueHeaders = property(lambda self: self.leagueConnection.headers)
+    leagueSession = property(lambda self: self.leagueConnection.session)
+    riotPort = property(lambda self: self.riotConnection.port)
+    riotToken = property(lambda self: self.riotConnection.token)
+    riotUrl = property(lambda self: self.riotConnection.url)
+    riotHeaders = property(lambda self: self.riotConnection.headers)
+    riotSession = property(lambda self: self.riotConnection.session)
+
+    def __init__(self, pool_size=DEFAULT_POOL_SIZE, cache_rules=None, coalesce=True, metrics=None,
+                 credentials=None, retry_policy=None, watch=True):
+        self.pool_size = pool_size
+        # Prazo por requisição, tentativas limitadas com backoff e um circuit breaker por cliente
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.leagueBreaker = CircuitBreaker("League")
+        self.riotBreaker = CircuitBreaker("Riot")
+        # Credenciais fixas (Credentials.ClientCredentials), p.ex. de um MockLCU; sem descoberta
+        self.credentials = credentials
+        # Por padrão todas as instâncias registram no mesmo Metrics.registry
+        self.metrics = metrics if metrics is not None else Metrics.registry
+        # GETs idênticos em andamento ao mesmo tempo compartilham uma única requisição
+        self.inflight = SingleFlight() if coalesce else None
+        # Cada cliente é um Connection imutável, publicado com uma única atribuição
+        self.leagueConnection = None
+        self.riotConnection = None
+        self._swap_lock = threading.RLock()
+        # Threads que falham juntas fazem uma só releitura das credenciais
+        self._refresh = SingleFlight()
+        self.events = None
+        self.cache = None
+        self.configure_cache(cache_rules)
         self.update_league_credentials()
         self.update_riot_credentials()
+        # Reinícios do cliente chegam pelo watcher compartilhado antes da próxima requisição falhar
+        self.watcher = None
+        if credentials is None and watch:
+            self.watcher = credential_watcher()
+            self.watcher.add_listener(self.apply_credentials)
+
+    def update_league_credentials(self, refresh=False):
+        if self.credentials is not None:
+            port, token = self.credentials.lcu_port, self.credentials.lcu_token
+        else:
+            port, token = find_league_client_credentials(refresh)
+        self._swap_connection(True, port, token)
 
-    def update_league_credentials(self):
-        self.leaguePort, self.leagueToken = find_league_client_credentials()
-        self.leagueUrl = return_lcu_url(self.leaguePort)
-        self.leagueHeaders = return_lcu_headers(self.leagueToken)
+    def update_riot_credentials(self, refresh=False):
+        if self.credentials is not None:
+            port, token = self.credentials.riot_port, self.credentials.riot_token
+        else:
+            port, token = find_riot_client_credentials(refresh)
+        self._swap_connection(False, port, token)
+
+    def _connection(self, league):
+        return self.leagueConnection if league else self.riotConnection
+
+    def _swap_connection(self, league, port, token, force=False):
+        with self._swap_lock:
+            old = self._connection(league)
+            changed = old is None or (port, token) != (old.port, old.token)
+            # Mesmas credenciais: mantém o pool de conexões e o cache
+            if not changed and not force:
+                return
+            connection = open_connection(port, token, self.pool_size, riot=not league)
+            if league:
+                self.leagueConnection = connection
+                if changed:
+                    self.invalidate_cache()
+            else:
+                self.riotConnection = connection
+        # Requisições em andamento terminam; o pool antigo descarta as conexões ao devolvê-las
+        if old is not None:
+            old.session.close()
 
+    def ensure_pool_size(self, workers):
+        """Grow both connection pools to keep at least `workers` keep-alive connections."""
+        with self._swap_lock:
+            if workers <= self.pool_size:
+                return
+            self.pool_size = workers
+            for league in (True, False):
+                connection = self._connection(league)
+                self._swap_connection(league, connection.port, connection.token, force=True)
 
+    def apply_credentials(self, creds):
+        """
+        Switch both clients to creds (Credentials.ClientCredentials), or mark
+        them closed with None. Called by the CredentialWatcher on client
+        restarts; replaces fixed credentials given to the constructor.
+        """
+        if self.credentials is not None and creds is not None:
+            self.credentials = creds
+        if creds is None:
+            self._swap_connection(True, None, None)
+            self._swap_connection(False, None, None)
+            return
+        with self._swap_lock:
+            league, riot = self._connection(True), self._connection(False)
+            # A primeira publicação do watcher costuma repetir as credenciais já em uso
+            if (league is not None and riot is not None
+                    and (league.port, league.token) == (creds.lcu_port, creds.lcu_token)
+                    and (riot.port, riot.token) == (creds.riot_port, creds.riot_token)):
+                return
+            self._swap_connection(True, creds.lcu_port, creds.lcu_token)
+            self._swap_connection(False, creds.riot_port, creds.riot_token)
+        # Falhas contra o cliente antigo não dizem nada sobre o novo
+        self.leagueBreaker.reset()
+        self.riotBreaker.reset()
+        if self.events is not None:
+            self.events.reconnect()
 
-    def update_riot_credentials(self):
-        self.riotPort, self.riotToken = find_riot_client_credentials()
-        self.riotUrl = return_riot_url(self.riotPort)
-        self.riotHeaders = return_riot_headers(self.riotToken)
+    def wait_until_ready(self, timeout=None):
+        """Block until the client is running and answering requests; False on timeout."""
+        if self.watcher is None:
+            return self.leaguePort is not None
+        return self.watcher.wait_ready(timeout)
+
+    def subscribe(self, uri_prefix, handler):
+        """Push LCU events whose URI starts with uri_prefix to handler(event)."""
+        if self.events is None:
+            self.events = LCUEventClient(self)
+        self.events.subscribe(uri_prefix, handler)
+
+    def unsubscribe(self, uri_prefix, handler=None):
+        if self.events is not None:
+            self.events.unsubscribe(uri_prefix, handler)
+
+    def close(self):
+        """Close both connection pools and the event socket."""
+        if self.watcher is not None:
+            self.watcher.remove_listener(self.apply_credentials)
+        if self.events is not None:
+            self.events.stop()
+        for connection in (self.leagueConnection, self.riotConnection):
+            if connection is not None:
+                connection.session.close()
 
     def return_lcu_creds(self):
-        return self.leaguePort, self.leagueToken, self.leagueUrl
+        connection = self.leagueConnection
+        return connection.port, connection.token, connection.url
 
     def return_riot_creds(self):
-        return self.riotPort, self.riotToken, self.riotUrl
+        connection = self.riotConnection
+        return connection.port, connection.token, connection.url
+
+    def configure_cache(self, rules):
+        """Cache GET responses per endpoint according to a list of Cache.CacheRule."""
+        self.cache = ResponseCache(rules) if rules else None
 
-    def lcu_request(self, method, endpoint, body: dict):
+    def invalidate_cache(self, pattern=None):
+        """Drop cached responses for endpoints matching pattern, or all of them."""
+        if self.cache is not None:
+            self.cache.invalidate(pattern)
+
+    def cache_stats(self):
+        return self.cache.stats() if self.cache is not None else {}
+
+    def breaker_stats(self):
+        return {"league": self.leagueBreaker.stats(), "riot": self.riotBreaker.stats()}
+
+    def coalesce_stats(self):
+        return self.inflight.stats() if self.inflight is not None else {}
+
+    def lcu_request(self, method, endpoint, body: dict, timeout=None):
         method = method.upper()
-        url = f'{self.leagueUrl}{endpoint}'
         if body == "":
             body = None
         elif body is not None:
             body = json.dumps(body)
 
-        try:
-            if method == "GET":
-                req = requests.get(url, headers=self.leagueHeaders, data=body, verify=False)
-            elif method == "POST":
-                req = requests.post(url, headers=self.leagueHeaders, data=body, verify=False)
-            elif method == "PUT":
-                req = requests.put(url, headers=self.leagueHeaders, data=body, verify=False)
-            elif method == "DELETE":
-                req = requests.delete(url, headers=self.leagueHeaders, data=body, verify=False)
-            elif method == "PATCH":
-                req = requests.patch(url, headers=self.leagueHeaders, data=body, verify=False)
+        if method not in REQUEST_METHODS:
+            raise ValueError('Invalid method')
+
+        cache = self.cache
+        if method == "GET" and body is None:
+            if cache is not None:
+                cached = cache.get(endpoint)
+                if cached is not None:
+                    return cached
+            if self.inflight is not None:
+                return self.inflight.do(endpoint, lambda: self._get_lcu(endpoint, timeout))
+            return self._get_lcu(endpoint, timeout)
+
+        req = self._send_lcu(method, endpoint, body, timeout)
+
+        if cache is not None and method != "GET" and req.status_code < 400:
+            cache.on_write(method, endpoint)
+        return req
+
+    def _get_lcu(self, endpoint, timeout):
+        connection = self.leagueConnection
+        req = self._send_lcu("GET", endpoint, None, timeout)
+        if self.cache is not None and req.status_code == 200:
+            # Resposta do cliente anterior não entra no cache já invalidado pela troca
+            with self._swap_lock:
+                if self.leagueConnection is connection:
+                    self.cache.put(endpoint, req)
+        return req
+
+    def _send_lcu(self, method, endpoint, body, timeout):
+        return self._send(True, method, endpoint, body, timeout)
+
+    def _send(self, league, method, endpoint, body, timeout):
+        """
+        Send with a deadline (timeout, or the policy default) covering every attempt.
+
+        GETs are retried with jittered backoff after re-reading the credentials
+        (or, with a watcher, after waiting for it to report the client ready;
+        a client the watcher saw close fails at once);
+        writes only when the connection was never opened, since a dropped or
+        timed-out write may already have been applied. Raises Resilience.ClientUnavailable,
+        CircuitOpenError or DeadlineExceeded instead of waiting for the client.
+        """
+        policy = self.retry_policy
+        breaker = self.leagueBreaker if league else self.riotBreaker
+        deadline = monotonic() + (timeout if timeout is not None else policy.deadline)
+        error = None
+        attempt = 1
+
+        while True:
+            per_attempt = attempt_timeout(policy, deadline)
+            if per_attempt is None:
+                raise DeadlineExceeded(f"{method} {endpoint} did not complete in time") from error
+            breaker.before_request()
+
+            connection = self._connection(league)
+            try:
+                if connection.port is None:
+                    raise ClientUnavailable(f"{breaker.name} client is not running")
+                response = self._timed(connection.session, connection.url, method, endpoint, body, per_attempt)
+            except (requests.exceptions.RequestException, ClientUnavailable) as e:
+                breaker.record_failure()
+                error = e
             else:
-                raise ValueError('Invalid method')
+                breaker.record_success()
+                return response
 
-            return req
-        except requests.exceptions.RequestException as e:
-            check_league_client()
-            self.update_league_credentials()
-            req = self.lcu_request(method, endpoint, body)
-            return req
+            timed_out = isinstance(error, requests.exceptions.Timeout)
+            # Não repete escritas que podem ter chegado ao cliente (timeout de leitura, conexão abortada)
+            gave_up = attempt >= policy.attempts or (method != "GET" and not _never_sent(error))
+            # Com watcher, cliente fechado não se resolve esperando o prazo: ele avisa quando voltar
+            if gave_up or (self.watcher is not None and connection.port is None):
+                if timed_out:
+                    raise DeadlineExceeded(f"{method} {endpoint} timed out") from error
+                raise ClientUnavailable(f"{method} {endpoint} failed: {error}") from error
 
-    def riot_request(self, method, endpoint, body: dict):
+            # O cliente pode ter reiniciado em outra porta/token: o watcher publica as novas;
+            # sem watcher, relê por conta própria se ninguém trocou ainda
+            if self.watcher is not None:
+                self.wait_until_ready(remaining(deadline))
+            elif self._connection(league) is connection:
+                update = self.update_league_credentials if league else self.update_riot_credentials
+                self._refresh.do(league, lambda: update(refresh=True))
+
+            delay = policy.delay(attempt)
+            if delay >= remaining(deadline):
+                raise DeadlineExceeded(f"{method} {endpoint} did not complete in time") from error
+            sleep(delay)
+            attempt += 1
+
+    def _timed(self, session, base_url, method, endpoint, body, timeout):
+        start = perf_counter()
+        try:
+            req = session.request(method, f'{base_url}{endpoint}', data=body, timeout=timeout)
+        except requests.exceptions.RequestException:
+            self.metrics.record(method, endpoint, perf_counter() - start, None)
+            raise
+        self.metrics.record(method, endpoint, perf_counter() - start, req.status_code, len(req.content))
+        return LCUResponse.from_requests(req)
+
+    def riot_request(self, method, endpoint, body: dict, timeout=None):
         method = method.upper()
-        url = f'{self.riotUrl}{endpoint}'
         if body == "":
             body = None
         
         if body is not None:
             body = json.dumps(body)
 
-        try:
-            if method == "GET":
-                req = requests.get(url, headers=self.riotHeaders, data=body, verify=False)
-            elif method == "POST":
-                req = requests.post(url, headers=self.riotHeaders, data=body, verify=False)
-            elif method == "PUT":
-                req = requests.put(url, headers=self.riotHeaders, data=body, verify=False)
-            elif method == "DELETE":
-                req = requests.delete(url, headers=self.riotHeaders, data=body, verify=False)
-            elif method == "PATCH":
-                req = requests.patch(url, headers=self.riotHeaders, data=body, verify=False)
-            else:
-                raise ValueError('Invalid method')
+        if method not in REQUEST_METHODS:
+            raise ValueError('Invalid method')
+
+        return self._send_riot(method, endpoint, body, timeout)
 
-            return req
-        except requests.exceptions.RequestException as e:
-            check_league_client()
-            self.update_riot_credentials()
-            return self.riot_request(method, endpoint, body)
\ No newline at end of file
+    def _send_riot(self, method, endpoint, body, timeout):
+        return self._send(False, method, endpoint, body, timeout)
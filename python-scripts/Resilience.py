@@ -0,0 +1,120 @@
+"""
+Failure handling for client requests: typed errors, bounded retries with
+jittered exponential backoff, and a circuit breaker per client.
+
+The error types derive from the builtin ConnectionError/TimeoutError, so code
+that already treats OSError as transient (e.g. Bulk.run_bulk) keeps retrying
+them.
+"""
+
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+
+class LCUError(Exception):
+    """Base class for request failures raised by Rengar."""
+
+
+class ClientUnavailable(LCUError, ConnectionError):
+    """The client is not running or did not answer after the allowed retries."""
+
+
+class CircuitOpenError(ClientUnavailable):
+    """Failing fast: the client failed repeatedly and is cooling down."""
+
+
+class DeadlineExceeded(LCUError, TimeoutError):
+    """The request did not complete before its deadline."""
+
+
+@dataclass
+class RetryPolicy:
+    """
+    How long a request may take overall and how failed attempts are retried.
+
+    deadline applies to the whole call, retries included, unless the caller
+    gives its own timeout. Delays use "full jitter": a random wait between 0
+    and base_delay * 2**(attempt - 1), capped at max_delay.
+    """
+    attempts: int = 3
+    deadline: float = 10.0
+    connect_timeout: float = 2.0
+    base_delay: float = 0.1
+    max_delay: float = 1.0
+
+    def delay(self, attempt: int) -> float:
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+
+
+class CircuitBreaker:
+    """
+    Opens after failure_threshold consecutive failures and rejects requests
+    for reset_timeout seconds. After that a single trial request is let
+    through (half-open); its success closes the breaker, its failure opens it
+    again.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name: str, failure_threshold: int = 3, reset_timeout: float = 2.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.rejected = 0
+        self._opened_at = 0.0
+        self._trial_running = False
+        self._lock = threading.Lock()
+
+    def before_request(self) -> None:
+        """Raise CircuitOpenError unless a request may go out now."""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return
+            if self.state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+                self.state = self.HALF_OPEN
+                self._trial_running = False
+            if self.state == self.HALF_OPEN and not self._trial_running:
+                self._trial_running = True
+                return
+            self.rejected += 1
+        raise CircuitOpenError(f"{self.name} client unavailable, retrying in at most {self.reset_timeout:.0f}s")
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+            self._trial_running = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self._opened_at = time.monotonic()
+                self._trial_running = False
+
+    def reset(self) -> None:
+        self.record_success()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"state": self.state, "failures": self.failures, "rejected": self.rejected}
+
+
+def remaining(deadline: float) -> float:
+    return deadline - time.monotonic()
+
+
+def attempt_timeout(policy: RetryPolicy, deadline: float) -> Optional[tuple]:
+    """(connect, read) timeout for one attempt within the overall deadline."""
+    left = remaining(deadline)
+    if left <= 0:
+        return None
+    return (min(policy.connect_timeout, left), left)
@@ -1,88 +1,222 @@
+import threading
 import webbrowser
+from concurrent.futures import ThreadPoolExecutor
+
 from Rengar import Rengar
+from Summoners import SummonerResolver
 from termcolor import colored
 
+rengar = Rengar()
+resolver = SummonerResolver(rengar)
+
+SESSION_URI = "/lol-champ-select/v1/session"
+
 
 class ChampionSelectNotFoundError(Exception):
     pass
 
 
+def _player_key(player):
+    return player.get("summonerId"), player.get("puuid")
+
+
+def _team_names(team, known=None):
+    """
+    Get Porofessor-formatted names for the team (empty when hidden).
+
+    known maps player keys to names already resolved for this lobby; only the
+    other players are looked up and their names are added to it.
+    """
+    known = {} if known is None else known
+    missing = [player for player in team if _player_key(player) not in known]
+    if missing:
+        summoners = resolver.get_many(player.get("summonerId") for player in missing)
+        for player in missing:
+            summoner_data = summoners.get(player.get("summonerId"))
+            if not summoner_data:
+                continue
+            game_name = summoner_data.get('gameName', '')
+            tag_line = summoner_data.get('tagLine', '')
+            if game_name and tag_line:
+                known[_player_key(player)] = f"{game_name}%23{tag_line}"
+    return [known[_player_key(player)] for player in team if _player_key(player) in known]
+
+
+def _participant_names():
+    """Get names from the champ select chat room, used when names are hidden."""
+    summ_names = []
+    try:
+        # For ranked games, try alternative method
+        participants = rengar.lcu_request("GET", "/chat/v5/participants", "")
+        if participants.status_code == 200:
+            participants_data = participants.json()
+
+            if "participants" in participants_data:
+                for participant in participants_data["participants"]:
+                    cid = participant.get("cid", "")
+                    if "champ-select" not in cid:
+                        continue
+                        
+                    game_name = participant.get('game_name', '')
+                    game_tag = participant.get('game_tag', '')
+                    if game_name and game_tag:
+                        summ_name = f"{game_name}%23{game_tag}"
+                        summ_names.append(summ_name)
+    except Exception as e:
+        print(colored(f"Could not fetch ranked participants: {e}", "yellow"))
+    return summ_names
+
+
+def build_lobby_url(champ_select_data, known=None):
+    """
+    Build the Porofessor URL for a champ select session.
+
+    known is passed on to _team_names so repeated builds for one lobby only
+    resolve players whose identity changed.
+
+    Returns:
+        (url, complete) where url is None if names or region are missing and
+        complete tells whether every teammate was resolved
+    """
+    if "myTeam" not in champ_select_data:
+        return None, False
+
+    # Region is fetched alongside the summoners (or comes from cache)
+    region_future = resolver.get_region_async()
+    team = champ_select_data["myTeam"]
+
+    # Check if ranked (hidden names); the chat room is only listed as a whole
+    if any(player.get("nameVisibilityType") == "HIDDEN" for player in team):
+        summ_names = _participant_names()
+    else:
+        summ_names = _team_names(team, known)
+
+    region = region_future.result()
+    if not (region and summ_names):
+        return None, False
+
+    summ_names_str = ",".join(summ_names)
+    url = f"https://porofessor.gg/pregame/{region}/{summ_names_str}/soloqueue/season"
+    return url, len(summ_names) >= len(team)
+
+
+class LobbyPrefetcher:
+    """
+    Keeps the Porofessor URL of the current champ select ready in memory.
+
+    The URL is only trusted while the event socket it was built from is still
+    connected: a Delete sent during a reconnect would otherwise never clear it.
+    """
+
+    def __init__(self):
+        self.url = None
+        self.is_running = False
+        self._team_key = None
+        self._complete = False
+        self._connection_id = None
+        # Names resolved for the current lobby, by player key
+        self._names = {}
+        # (team_key, connection_id) of prefetches queued or running
+        self._pending = set()
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="LobbyPrefetcher")
+
+    def start(self):
+        """Start following champ select session updates."""
+        if not self.is_running:
+            self.is_running = True
+            rengar.subscribe(SESSION_URI, self._on_session_event)
+
+    def stop(self):
+        """Stop following session updates and forget the lobby."""
+        if self.is_running:
+            self.is_running = False
+            rengar.unsubscribe(SESSION_URI, self._on_session_event)
+        self._clear()
+
+    def _clear(self):
+        self.url = None
+        self._team_key = None
+        self._complete = False
+        self._names = {}
+
+    def current_url(self):
+        """The prefetched URL, or None if it may belong to a lobby that has ended."""
+        events = rengar.events
+        if not self.is_running or events is None or not events.connected.is_set():
+            return None
+        if self._connection_id != events.connection_id:
+            return None
+        return self.url
+
+    def _on_session_event(self, event):
+        if event.get("uri") != SESSION_URI:
+            return
+
+        # First event after a reconnect: updates in between were missed
+        connection_id = rengar.events.connection_id
+        if connection_id != self._connection_id:
+            self._clear()
+            self._connection_id = connection_id
+
+        session = event.get("data")
+        if event.get("eventType") == "Delete" or not session:
+            self._clear()
+            return
+
+        team_key = tuple(
+            (player.get("summonerId"), player.get("puuid"), player.get("nameVisibilityType"))
+            for player in session.get("myTeam", [])
+        )
+        # Only re-resolve when players joined/swapped or some are still missing
+        if team_key == self._team_key and self._complete:
+            return
+        self._team_key = team_key
+        # Timer updates arrive many times per phase: one prefetch per lobby at a time
+        with self._lock:
+            if (team_key, connection_id) in self._pending:
+                return
+            self._pending.add((team_key, connection_id))
+        self._executor.submit(self._prefetch, session, team_key, connection_id)
+
+    def _prefetch(self, session, team_key, connection_id):
+        try:
+            url, complete = build_lobby_url(session, self._names)
+            # Drop results for a lobby that changed while we were resolving it
+            if team_key == self._team_key and connection_id == self._connection_id and url:
+                self.url = url
+                self._complete = complete
+        except Exception as e:
+            print(colored(f"Error prefetching lobby: {e}", "yellow"))
+        finally:
+            with self._lock:
+                self._pending.discard((team_key, connection_id))
+
+
+prefetcher = LobbyPrefetcher()
+
+
 def reveal():
     """Open Porofessor.gg for current lobby"""
-    rengar = Rengar()
-    
     try:
-        champ_select = rengar.lcu_request("GET", "/lol-champ-select/v1/session", "")
+        url = prefetcher.current_url()
 
-        if champ_select.status_code != 200 or "RPC_ERROR" in champ_select.text:
-            print(colored("\nNot in champion select.\n", "red"))
-            return None
+        if url is None:
+            champ_select = rengar.lcu_request("GET", SESSION_URI, "")
 
-        champ_select_data = champ_select.json()
-        summ_names = []
-        is_ranked = False
-
-        # Check players in team
-        if "myTeam" in champ_select_data:
-            for player in champ_select_data["myTeam"]:
-                # Check if ranked (hidden names)
-                if player.get("nameVisibilityType") == "HIDDEN":
-                    is_ranked = True
-                    break
-
-                summoner_id = player.get("summonerId")
-                if summoner_id and summoner_id != "0":
-                    summoner = rengar.lcu_request(
-                        "GET", f"/lol-summoner/v1/summoners/{summoner_id}", ""
-                    )
-                    if summoner.status_code == 200:
-                        summoner_data = summoner.json()
-                        game_name = summoner_data.get('gameName', '')
-                        tag_line = summoner_data.get('tagLine', '')
-                        if game_name and tag_line:
-                            summ_name = f"{game_name}%23{tag_line}"
-                            summ_names.append(summ_name)
-
-            # If ranked, get from chat participants
-            if is_ranked:
-                summ_names = []
-                try:
-                    # For ranked games, try alternative method
-                    participants = rengar.lcu_request("GET", "/chat/v5/participants", "")
-                    if participants.status_code == 200:
-                        participants_data = participants.json()
-
-                        if "participants" in participants_data:
-                            for participant in participants_data["participants"]:
-                                cid = participant.get("cid", "")
-                                if "champ-select" not in cid:
-                                    continue
-                                    
-                                game_name = participant.get('game_name', '')
-                                game_tag = participant.get('game_tag', '')
-                                if game_name and game_tag:
-                                    summ_name = f"{game_name}%23{game_tag}"
-                                    summ_names.append(summ_name)
-                except Exception as e:
-                    print(colored(f"Could not fetch ranked participants: {e}", "yellow"))
-
-            # Get region
-            region = ""
-            get_region = rengar.lcu_request("GET", "/riotclient/region-locale", "")
-            if get_region.status_code == 200:
-                region_data = get_region.json()
-                region = region_data.get("webRegion", "")
-
-            if region and summ_names:
-                summ_names_str = ",".join(summ_names)
-                url = f"https://porofessor.gg/pregame/{region}/{summ_names_str}/soloqueue/season"
-                
-                # Open in browser
-                webbrowser.open(url)
-                return url
-            else:
-                print(colored("Failed to get region or summoner names", "red"))
+            if champ_select.status_code != 200 or champ_select.is_error:
+                print(colored("\nNot in champion select.\n", "red"))
                 return None
+
+            url, _ = build_lobby_url(champ_select.json())
+
+        if url:
+            # Open in browser
+            webbrowser.open(url)
+            return url
+        else:
+            print(colored("Failed to get region or summoner names", "red"))
+            return None
                 
     except Exception as e:
         print(colored(f"Error in reveal: {e}", "red"))
@@ -0,0 +1,260 @@
+"""
+Compact on-disk catalog of champion skins.
+
+The CommunityDragon skins.json is several megabytes; the catalog keeps only
+what the toolkit needs in a flat binary file:
+
+    MAGIC | header (one JSON line) | champion table | skin table | string pool
+
+Both tables are int32 arrays. A champion row is (key, name offset, name length,
+first skin, skin count) and a skin row is (id, name offset, name length), with
+offsets pointing into the UTF-8 string pool. Quest skins are stored as one row
+per tier. The file is rebuilt only when the source reports a new version.
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+from array import array
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import requests
+
+CATALOG_PATH = os.path.join(tempfile.gettempdir(), "ltk-skin-catalog.bin")
+CDRAGON_URL = "https://raw.communitydragon.org/latest"
+SKINS_PATH = "plugins/rcp-be-lol-game-data/global/default/v1/skins.json"
+METADATA_PATH = "content-metadata.json"
+MAX_AGE = 24 * 60 * 60
+# After a failed version check, the next one is attempted this much later
+RETRY_AGE = 60 * 60
+
+MAGIC = b"LTKSKIN1"
+CHAMP_FIELDS = 5
+SKIN_FIELDS = 3
+
+
+class CommunityDragonSource:
+    """Skin data straight from CommunityDragon."""
+
+    def __init__(self, base_url: str = CDRAGON_URL, timeout: float = 10):
+        self.base_url = base_url
+        self.timeout = timeout
+
+    def _get(self, path: str):
+        response = requests.get(f"{self.base_url}/{path}", timeout=self.timeout)
+        response.raise_for_status()
+        return response.json()
+
+    def version(self) -> str:
+        return str(self._get(METADATA_PATH).get("version", ""))
+
+    def fetch_skins(self) -> dict:
+        return self._get(SKINS_PATH)
+
+
+class MirrorSource:
+    """Skin data from a local directory laid out like CommunityDragon."""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+
+    def _read(self, path: str):
+        with open(os.path.join(self.directory, path), encoding="utf-8") as f:
+            return json.load(f)
+
+    def version(self) -> str:
+        try:
+            return str(self._read(METADATA_PATH).get("version", ""))
+        except FileNotFoundError:
+            return str(os.path.getmtime(os.path.join(self.directory, SKINS_PATH)))
+
+    def fetch_skins(self) -> dict:
+        return self._read(SKINS_PATH)
+
+
+def _champion_name(load_screen_path: str) -> Optional[str]:
+    marker = "ASSETS/Characters/"
+    start = load_screen_path.find(marker)
+    if start == -1:
+        return None
+    start += len(marker)
+    return load_screen_path[start:load_screen_path.find("/", start)]
+
+
+def group_skins(skins_data: dict) -> Dict[str, Tuple[int, List[Tuple[int, str]]]]:
+    """Group raw skins.json entries into {champion: (key, [(skin id, name), ...])}."""
+    champs: Dict[str, Tuple[int, List[Tuple[int, str]]]] = {}
+
+    for skin_id, current_skin in skins_data.items():
+        champ_name = _champion_name(current_skin.get("loadScreenPath", ""))
+        if champ_name is None:
+            continue
+
+        key, skins = champs.setdefault(champ_name, (0, []))
+
+        if current_skin.get("isBase", False):
+            champ_key = skin_id[:-3] if skin_id.endswith("000") else skin_id
+            champs[champ_name] = (int(champ_key), skins)
+            skins.insert(0, (int(skin_id), "default"))
+        elif current_skin.get("questSkinInfo"):
+            for skin_tier in current_skin["questSkinInfo"].get("tiers", []):
+                skins.append((int(skin_tier.get("id", 0)), skin_tier.get("name", "")))
+        else:
+            skins.append((int(skin_id), current_skin.get("name", "")))
+
+    return champs
+
+
+class SkinCatalog:
+    """Loads, queries and refreshes the compact skin catalog."""
+
+    def __init__(self, source=None, path: str = CATALOG_PATH):
+        self.source = source or CommunityDragonSource()
+        self.path = path
+        self.version: Optional[str] = None
+        self._champions = array("i")
+        self._skins = array("i")
+        self._strings = b""
+
+    def __len__(self) -> int:
+        return len(self._champions) // CHAMP_FIELDS
+
+    def load(self) -> bool:
+        """Load the catalog file. Returns False if it is missing or invalid."""
+        try:
+            with open(self.path, "rb") as f:
+                if f.read(len(MAGIC)) != MAGIC:
+                    return False
+                header = json.loads(f.readline())
+                champions = array("i")
+                champions.frombytes(f.read(header["champions"] * CHAMP_FIELDS * champions.itemsize))
+                skins = array("i")
+                skins.frombytes(f.read(header["skins"] * SKIN_FIELDS * skins.itemsize))
+                strings = f.read(header["strings"])
+        except (OSError, ValueError, KeyError):
+            return False
+
+        if (len(champions) != header["champions"] * CHAMP_FIELDS or
+                len(skins) != header["skins"] * SKIN_FIELDS or
+                len(strings) != header["strings"]):
+            return False
+
+        if header.get("byteorder") != sys.byteorder:
+            champions.byteswap()
+            skins.byteswap()
+
+        self._champions, self._skins, self._strings = champions, skins, strings
+        self.version = header.get("version")
+        return True
+
+    def refresh(self) -> bool:
+        """
+        Rebuild the catalog if the source has a newer version.
+
+        Returns:
+            True if the catalog was rebuilt, False if it was already current
+        """
+        version = self.source.version()
+        if self.version is None:
+            self.load()
+        if version and version == self.version:
+            return False
+
+        self._build(group_skins(self.source.fetch_skins()), version)
+        self._save()
+        return True
+
+    def ensure_loaded(self, max_age: float = MAX_AGE) -> None:
+        """
+        Load the catalog from disk, checking the source version once the file
+        is older than max_age seconds (or building it if there is no file).
+
+        If the source cannot be reached, a catalog already on disk keeps being
+        served and the check is retried RETRY_AGE seconds later; the error is
+        raised only when there is no catalog at all.
+        """
+        loaded = self.load()
+        if loaded:
+            try:
+                if time.time() - os.path.getmtime(self.path) < max_age:
+                    return
+            except OSError:
+                pass
+
+        try:
+            rebuilt = self.refresh()
+        except (requests.RequestException, OSError, ValueError):
+            if not loaded:
+                raise
+            retry_at = time.time() - max_age + min(RETRY_AGE, max_age)
+            self._touch((retry_at, retry_at))
+            return
+
+        if not rebuilt:
+            # Still current: restart the max_age window
+            self._touch()
+
+    def _touch(self, times=None) -> None:
+        try:
+            os.utime(self.path, times)
+        except OSError:
+            pass
+
+    def _build(self, champs: Dict[str, Tuple[int, List[Tuple[int, str]]]], version: str) -> None:
+        champions = array("i")
+        skins = array("i")
+        strings = bytearray()
+        offsets: Dict[str, Tuple[int, int]] = {}
+
+        def intern(text: str) -> Tuple[int, int]:
+            if text not in offsets:
+                encoded = text.encode("utf-8")
+                offsets[text] = (len(strings), len(encoded))
+                strings.extend(encoded)
+            return offsets[text]
+
+        for champ_name, (key, champ_skins) in champs.items():
+            champions.extend((key, *intern(champ_name), len(skins) // SKIN_FIELDS, len(champ_skins)))
+            for skin_id, skin_name in champ_skins:
+                skins.extend((skin_id, *intern(skin_name)))
+
+        self._champions, self._skins, self._strings = champions, skins, bytes(strings)
+        self.version = version
+
+    def _save(self) -> None:
+        header = {
+            "version": self.version,
+            "byteorder": sys.byteorder,
+            "champions": len(self),
+            "skins": len(self._skins) // SKIN_FIELDS,
+            "strings": len(self._strings),
+        }
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(MAGIC)
+            f.write(json.dumps(header).encode("utf-8") + b"\n")
+            f.write(self._champions.tobytes())
+            f.write(self._skins.tobytes())
+            f.write(self._strings)
+        os.replace(tmp_path, self.path)
+
+    def _string(self, offset: int, length: int) -> str:
+        return self._strings[offset:offset + length].decode("utf-8")
+
+    def skins(self, first: int, count: int) -> List[Tuple[int, str]]:
+        """Get (skin id, name) rows for a champion's skin range."""
+        rows = []
+        table = self._skins
+        for row in range(first, first + count):
+            base = row * SKIN_FIELDS
+            rows.append((table[base], self._string(table[base + 1], table[base + 2])))
+        return rows
+
+    def champions(self) -> Iterator[Tuple[str, int, int, int]]:
+        """Yield (name, key, first skin row, skin count) for every champion."""
+        table = self._champions
+        for base in range(0, len(table), CHAMP_FIELDS):
+            key, offset, length, first, count = table[base:base + CHAMP_FIELDS]
+            yield self._string(offset, length), key, first, count
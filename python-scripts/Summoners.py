@@ -0,0 +1,123 @@
+"""
+Batched, cached summoner lookups.
+"""
+
+import logging
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional
+
+from Cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+
+class SummonerResolver:
+    """
+    Resolves summoners by summonerId or puuid.
+
+    Uncached IDs are fetched with the bulk summoners endpoint when the client
+    supports it, otherwise with concurrent single lookups. Results are kept in
+    LRU caches with a TTL, keyed both by summonerId and by puuid. The region is
+    cached for as long as the client credentials stay the same.
+    """
+
+    def __init__(self, rengar, max_workers: int = 5, ttl: float = 600.0, maxsize: int = 512):
+        self.rengar = rengar
+        self._by_id = TTLCache(maxsize, ttl)
+        self._by_puuid = TTLCache(maxsize, ttl)
+        self._bulk_supported = True
+        self._region: Optional[str] = None
+        self._region_key = None
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="SummonerResolver")
+
+    def _remember(self, summoner: dict) -> None:
+        if summoner.get("summonerId"):
+            self._by_id.set(summoner["summonerId"], summoner)
+        if summoner.get("puuid"):
+            self._by_puuid.set(summoner["puuid"], summoner)
+
+    def _fetch_bulk(self, summoner_ids: List[int]) -> Optional[List[dict]]:
+        ids = ",".join(str(summoner_id) for summoner_id in summoner_ids)
+        response = self.rengar.lcu_request("GET", f"/lol-summoner/v2/summoners?ids=[{ids}]", "")
+        if response.status_code == 200:
+            return response.json()
+        if response.status_code == 404:
+            logger.debug("Bulk summoner endpoint not available, using single lookups")
+            self._bulk_supported = False
+        return None
+
+    def _fetch_one(self, summoner_id: int) -> Optional[dict]:
+        try:
+            response = self.rengar.lcu_request("GET", f"/lol-summoner/v1/summoners/{summoner_id}", "")
+            if response.status_code == 200:
+                return response.json()
+        except Exception as e:
+            logger.error(f"❌ Error fetching summoner {summoner_id}: {e}")
+        return None
+
+    def get_many(self, summoner_ids: Iterable[int]) -> Dict[int, dict]:
+        """Resolve several summonerIds at once; unknown IDs are left out."""
+        found: Dict[int, dict] = {}
+        missing: List[int] = []
+
+        for summoner_id in dict.fromkeys(summoner_ids):
+            if not summoner_id or str(summoner_id) == "0":
+                continue
+            cached = self._by_id.get(summoner_id)
+            if cached is not None:
+                found[summoner_id] = cached
+            else:
+                missing.append(summoner_id)
+
+        if missing:
+            fetched = self._fetch_bulk(missing) if self._bulk_supported else None
+            if fetched is None:
+                fetched = [s for s in self._pool.map(self._fetch_one, missing) if s]
+
+            for summoner in fetched:
+                self._remember(summoner)
+                if summoner.get("summonerId") in missing:
+                    found[summoner["summonerId"]] = summoner
+
+        return found
+
+    def get(self, summoner_id: int) -> Optional[dict]:
+        """Resolve a single summonerId."""
+        return self.get_many([summoner_id]).get(summoner_id)
+
+    def get_by_puuid(self, puuid: str) -> Optional[dict]:
+        """Resolve a summoner by puuid."""
+        cached = self._by_puuid.get(puuid)
+        if cached is not None:
+            return cached
+
+        response = self.rengar.lcu_request("GET", f"/lol-summoner/v2/summoners/puuid/{puuid}", "")
+        if response.status_code != 200:
+            return None
+        summoner = response.json()
+        self._remember(summoner)
+        return summoner
+
+    def get_region(self) -> str:
+        """Get the client's web region, fetched once per client session."""
+        session_key = self.rengar.return_lcu_creds()[:2]
+        if self._region is not None and self._region_key == session_key:
+            return self._region
+
+        response = self.rengar.lcu_request("GET", "/riotclient/region-locale", "")
+        if response.status_code != 200:
+            return ""
+
+        self._region = response.json().get("webRegion", "")
+        self._region_key = session_key
+        return self._region
+
+    def get_region_async(self) -> Future:
+        """Start get_region in the background."""
+        return self._pool.submit(self.get_region)
+
+    def invalidate(self) -> None:
+        """Forget every cached summoner and the region."""
+        self._by_id.invalidate()
+        self._by_puuid.invalidate()
+        self._region = None
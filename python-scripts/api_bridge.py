@@ -1,56 +1,102 @@
 import sys
 import json
-from Rengar import Rengar, check_league_client
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from Rengar import Rengar, check_league_client, credential_watcher, DEFAULT_CACHE_RULES
+from Cache import CacheRule
+import Metrics
 from AutoAccept import autoaccept
 from InstalockAutoban import InstalockAutoban
 from disconnect_reconnect_chat import Chat
-from RemoveFriends import remove_all_friends
+from RemoveFriends import remove_friends
 from Badges import change_profile_badges
 from Icons import change_profile_icon
 from Backgrounds import change_profile_background
 from Riotidchanger import change_riotid
 from StatusChanger import change_status
-from Reveal import reveal
+from Reveal import reveal, prefetcher as lobby_prefetcher
 from Dodge import dodge
 from RestartUX import restart
 
+# get_summoner_info: requests run in parallel; identity and region are cached for
+# the client session, ranked stats briefly and until a game ends
+CURRENT_SUMMONER = "/lol-summoner/v1/current-summoner"
+REGION_LOCALE = "/riotclient/region-locale"
+RANKED_STATS = "/lol-ranked/v1/current-ranked-stats"
+SUMMONER_INFO_ENDPOINTS = (CURRENT_SUMMONER, REGION_LOCALE, RANKED_STATS)
+
 # Initialize components
-rengar = Rengar()
+rengar = Rengar(cache_rules=DEFAULT_CACHE_RULES + [CacheRule(RANKED_STATS, ttl=30.0, maxsize=1)])
 auto_accept = autoaccept()
 instalock_autoban = InstalockAutoban()
 chat = Chat()
 
+fanout = ThreadPoolExecutor(max_workers=len(SUMMONER_INFO_ENDPOINTS), thread_name_prefix="BridgeFanout")
+
+# Set by serve() to push JSON-RPC notifications (e.g. progress) to the caller
+_notifier = None
+
+
+def notify(method, params):
+    """Send a notification in --serve mode; no-op for one-shot calls."""
+    if _notifier is not None:
+        _notifier(method, params)
+
 
 def check_client():
     """Check if League client is running"""
     try:
-        port, token = check_league_client()
-        return {"success": True, "connected": True, "port": port}
+        port, token = check_league_client(timeout=0)
+        if port is None:
+            return {"success": True, "connected": False, "ready": False}
+        ready = rengar.wait_until_ready(timeout=0)
+        return {"success": True, "connected": True, "ready": ready, "port": port}
     except:
         return {"success": True, "connected": False}
 
 
+def _get_json(endpoint):
+    """GET endpoint (through the Rengar cache); None if the request failed."""
+    response = rengar.lcu_request("GET", endpoint, "")
+    return response.json() if response.status_code == 200 else None
+
+
+def invalidate_post_game():
+    """Drop what a finished game changes (ranked stats, summoner level) so the next refresh refetches it."""
+    rengar.invalidate_cache(RANKED_STATS)
+    rengar.invalidate_cache(CURRENT_SUMMONER)
+
+
+def _on_client_credentials(creds):
+    notify("client.changed", {"connected": creds is not None,
+                              "port": creds.lcu_port if creds is not None else None})
+
+
+def _on_gameflow_phase(event):
+    if event.get("data") in ("PreEndOfGame", "EndOfGame"):
+        invalidate_post_game()
+
+
 def get_summoner_info():
     """Get current summoner information"""
     try:
-        summoner_resp = rengar.lcu_request("GET", "/lol-summoner/v1/current-summoner", "")
-        if summoner_resp.status_code == 200:
-            summoner = summoner_resp.json()
+        futures = {endpoint: fanout.submit(_get_json, endpoint) for endpoint in SUMMONER_INFO_ENDPOINTS}
+
+        summoner = futures[CURRENT_SUMMONER].result()
+        if summoner is not None:
             ign = f"{summoner.get('gameName', 'Unknown')}#{summoner.get('tagLine', 'Unknown')}"
             level = summoner.get("summonerLevel", "Unknown")
         else:
             return {"success": False, "error": "Failed to get summoner data"}
 
-        region_resp = rengar.lcu_request("GET", "/riotclient/region-locale", "")
-        if region_resp.status_code == 200:
-            region_data = region_resp.json()
+        region_data = futures[REGION_LOCALE].result()
+        if region_data is not None:
             region = region_data.get("webRegion", "Unknown")
         else:
             region = "Unknown"
 
-        ranked_resp = rengar.lcu_request("GET", "/lol-ranked/v1/current-ranked-stats", "")
-        if ranked_resp.status_code == 200:
-            ranked_data = ranked_resp.json()
+        ranked_data = futures[RANKED_STATS].result()
+        if ranked_data is not None:
             solo_queue = next(
                 (q for q in ranked_data.get("queues", []) if q.get("queueType") == "RANKED_SOLO_5x5"),
                 None
@@ -137,6 +183,8 @@ def change_icon_func(icon_id):
     """Change profile icon"""
     try:
         success = change_profile_icon(icon_id)
+        if success:
+            rengar.invalidate_cache(CURRENT_SUMMONER)
         return {"success": success}
     except Exception as e:
         return {"success": False, "error": str(e)}
@@ -215,6 +263,8 @@ def change_riot_id_func(name, tag):
             return {"success": False, "error": "Tag too long (max 5)"}
         
         success = change_riotid(name, tag)
+        if success:
+            rengar.invalidate_cache(CURRENT_SUMMONER)
         return {"success": success}
     except Exception as e:
         return {"success": False, "error": str(e)}
@@ -257,18 +307,23 @@ def remove_friends_func():
         
         if response.status_code == 200:
             friends = response.json()
-            removed_count = 0
-            
-            for friend in friends:
-                friend_id = friend.get("pid")
-                try:
-                    delete_response = rengar.lcu_request("DELETE", f"/lol-chat/v1/friends/{friend_id}", "")
-                    if delete_response.status_code in [200, 204]:
-                        removed_count += 1
-                except:
-                    pass
+
+            def report_progress(done, total, outcome):
+                notify("remove_friends.progress", {
+                    "done": done,
+                    "total": total,
+                    "pid": outcome.item.get("pid"),
+                    "success": outcome.success,
+                    "error": outcome.error
+                })
+
+            report = remove_friends(friends, on_progress=report_progress)
+            failures = [
+                {"pid": outcome.item.get("pid"), "error": outcome.error}
+                for outcome in report.outcomes if not outcome.success
+            ]
             
-            return {"success": True, "removed": removed_count}
+            return {"success": True, "removed": report.succeeded, "failed": failures}
         
         return {"success": False, "error": "Failed to get friends list"}
     except Exception as e:
@@ -288,11 +343,134 @@ def change_badges_func():
     """Change profile badges"""
     try:
         change_profile_badges()
+        rengar.invalidate_cache("/lol-challenges/*")
         return {"success": True}
     except Exception as e:
         return {"success": False, "error": str(e)}
 
 
+def metrics_func(reset=False):
+    """Get LCU request metrics for every Rengar in this process"""
+    try:
+        snapshot = Metrics.registry.snapshot()
+        snapshot["cache"] = rengar.cache_stats()
+        snapshot["coalesced"] = rengar.coalesce_stats()
+        snapshot["breakers"] = rengar.breaker_stats()
+        if reset:
+            Metrics.registry.reset()
+        return {"success": True, "metrics": snapshot}
+    except Exception as e:
+        return {"success": False, "error": str(e)}
+
+
+def _arg(args, index, default=""):
+    return args[index] if len(args) > index else default
+
+
+def _flag(args, index, default=False):
+    """Read a boolean argument given either as JSON bool or as "true"/"false"."""
+    if len(args) <= index:
+        return default
+    value = args[index]
+    if isinstance(value, bool):
+        return value
+    return str(value).lower() == "true"
+
+
+METHODS = {
+    "check_client": lambda args: check_client(),
+    "get_summoner_info": lambda args: get_summoner_info(),
+    "toggle_auto_accept": lambda args: toggle_auto_accept_func(_flag(args, 0)),
+    "set_instalock": lambda args: set_instalock_func(_arg(args, 0), _flag(args, 1)),
+    "set_autoban": lambda args: set_autoban_func(_arg(args, 0), _flag(args, 1), _flag(args, 2, True)),
+    "toggle_chat": lambda args: toggle_chat_func(_flag(args, 0)),
+    "change_icon": lambda args: change_icon_func(_arg(args, 0, None)),
+    "change_background": lambda args: change_background_func(_arg(args, 0, None)),
+    "change_riot_id": lambda args: change_riot_id_func(_arg(args, 0), _arg(args, 1)),
+    "change_status": lambda args: change_status_func(_arg(args, 0)),
+    "reveal_lobby": lambda args: reveal_lobby_func(),
+    "dodge": lambda args: dodge_func(),
+    "change_badges": lambda args: change_badges_func(),
+    "remove_friends": lambda args: remove_friends_func(),
+    "restart_client": lambda args: restart_client_func(),
+    "metrics": lambda args: metrics_func(_flag(args, 0)),
+}
+
+
+def serve(max_workers=8):
+    """
+    Stay resident and answer newline-delimited JSON-RPC 2.0 requests.
+
+    Requests are read from stdin and handled concurrently; each response is
+    written to stdout as one line carrying the id of its request. The feature
+    monitors keep running in this process between calls.
+    """
+    global _notifier
+    protocol_out = sys.stdout
+    # Feature modules print progress messages; keep them off the protocol stream
+    sys.stdout = sys.stderr
+    write_lock = threading.Lock()
+
+    def respond(message):
+        with write_lock:
+            protocol_out.write(json.dumps(message) + "\n")
+            protocol_out.flush()
+
+    _notifier = lambda method, params: respond({"jsonrpc": "2.0", "method": method, "params": params})
+
+    def error(req_id, code, message):
+        respond({"jsonrpc": "2.0", "id": req_id, "error": {"code": code, "message": message}})
+
+    def handle(request):
+        req_id = request.get("id")
+        params = request.get("params") or []
+        try:
+            result = METHODS[request["method"]](params)
+        except Exception as e:
+            if "id" in request:
+                error(req_id, -32603, str(e))
+            return
+        if "id" in request:
+            respond({"jsonrpc": "2.0", "id": req_id, "result": result})
+
+    # One keep-alive connection per thread that can be mid-request at once:
+    # the request workers plus the summoner info fan-out
+    rengar.ensure_pool_size(max_workers + len(SUMMONER_INFO_ENDPOINTS))
+    rengar.subscribe("/lol-gameflow/v1/gameflow-phase", _on_gameflow_phase)
+    credential_watcher().add_listener(_on_client_credentials)
+    instalock_autoban.start_engine()
+    lobby_prefetcher.start()
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        for line in sys.stdin:
+            line = line.strip()
+            if not line:
+                continue
+
+            try:
+                request = json.loads(line)
+            except ValueError:
+                error(None, -32700, "Parse error")
+                continue
+
+            if not isinstance(request, dict) or not isinstance(request.get("method"), str):
+                error(None, -32600, "Invalid request")
+                continue
+
+            if request["method"] not in METHODS:
+                error(request.get("id"), -32601, f"Unknown method: {request['method']}")
+                continue
+
+            if not isinstance(request.get("params", []), list):
+                error(request.get("id"), -32602, "Params must be a list")
+                continue
+
+            pool.submit(handle, request)
+
+    instalock_autoban.stop()
+    lobby_prefetcher.stop()
+
+
 # Main execution
 if __name__ == "__main__":
     if len(sys.argv) < 2:
@@ -301,67 +479,16 @@ if __name__ == "__main__":
     
     method = sys.argv[1]
     args = sys.argv[2:] if len(sys.argv) > 2 else []
+
+    if method == "--serve":
+        serve()
+        sys.exit(0)
     
     result = None
     
     try:
-        if method == "check_client":
-            result = check_client()
-            
-        elif method == "get_summoner_info":
-            result = get_summoner_info()
-            
-        elif method == "toggle_auto_accept":
-            enabled = args[0].lower() == "true" if args else False
-            result = toggle_auto_accept_func(enabled)
-            
-        elif method == "set_instalock":
-            champion = args[0] if args else ""
-            enabled = args[1].lower() == "true" if len(args) > 1 else False
-            result = set_instalock_func(champion, enabled)
-            
-        elif method == "set_autoban":
-            champion = args[0] if args else ""
-            enabled = args[1].lower() == "true" if len(args) > 1 else False
-            protect = args[2].lower() == "true" if len(args) > 2 else True
-            result = set_autoban_func(champion, enabled, protect)
-            
-        elif method == "toggle_chat":
-            disconnect = args[0].lower() == "true" if args else False
-            result = toggle_chat_func(disconnect)
-            
-        elif method == "change_icon":
-            icon_id = args[0] if args else None
-            result = change_icon_func(icon_id)
-            
-        elif method == "change_background":
-            skin_id = args[0] if args else None
-            result = change_background_func(skin_id)
-            
-        elif method == "change_riot_id":
-            name = args[0] if args else ""
-            tag = args[1] if len(args) > 1 else ""
-            result = change_riot_id_func(name, tag)
-            
-        elif method == "change_status":
-            status = args[0] if args else ""
-            result = change_status_func(status)
-            
-        elif method == "reveal_lobby":
-            result = reveal_lobby_func()
-            
-        elif method == "dodge":
-            result = dodge_func()
-            
-        elif method == "change_badges":
-            result = change_badges_func()
-            
-        elif method == "remove_friends":
-            result = remove_friends_func()
-            
-        elif method == "restart_client":
-            result = restart_client_func()
-            
+        if method in METHODS:
+            result = METHODS[method](args)
         else:
             result = {"success": False, "error": f"Unknown method: {method}"}
         
@@ -369,4 +496,4 @@ if __name__ == "__main__":
         
     except Exception as e:
         print(json.dumps({"success": False, "error": str(e)}))
-        sys.exit(1)
\ No newline at end of file
+        sys.exit(1)
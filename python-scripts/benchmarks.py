@@ -0,0 +1,414 @@
+"""
+Offline benchmarks for the Python scripts.
+
+Usage: python benchmarks.py [name ...] [--out results.json] [--baseline baseline.json]
+
+Transport benchmarks run Rengar against a MockLCU on localhost. With
+--baseline, every timing or throughput figure is compared to the stored
+results and the run exits with status 2 if one regressed beyond --tolerance.
+With or without a baseline it also exits with status 2 when a benchmark
+reports errors, wrong responses or missed decisions, or leaves a timing
+unmeasured.
+"""
+
+import argparse
+import json
+import logging
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional
+
+import requests
+
+import LCUResponse
+from Credentials import ClientCredentials
+from ChampSelectReplay import replay, synthetic_draft, write_recording
+from InstalockAutoban import ChampionRegistry
+from Metrics import RequestMetrics
+from MockLCU import MockLCU
+from Rengar import DEFAULT_POOL_SIZE, Rengar
+
+ROSTER = [
+    "Aatrox", "Ahri", "Akali", "Akshan", "Alistar", "Ambessa", "Amumu", "Anivia",
+    "Annie", "Aphelios", "Ashe", "Aurelion Sol", "Aurora", "Azir", "Bard", "Bel'Veth",
+    "Blitzcrank", "Brand", "Braum", "Briar", "Caitlyn", "Camille", "Cassiopeia",
+    "Cho'Gath", "Corki", "Darius", "Diana", "Dr. Mundo", "Draven", "Ekko", "Elise",
+    "Evelynn", "Ezreal", "Fiddlesticks", "Fiora", "Fizz", "Galio", "Gangplank",
+    "Garen", "Gnar", "Gragas", "Graves", "Gwen", "Hecarim", "Heimerdinger", "Hwei",
+    "Illaoi", "Irelia", "Ivern", "Janna", "Jarvan IV", "Jax", "Jayce", "Jhin", "Jinx",
+    "K'Sante", "Kai'Sa", "Kalista", "Karma", "Karthus", "Kassadin", "Katarina",
+    "Kayle", "Kayn", "Kennen", "Kha'Zix", "Kindred", "Kled", "Kog'Maw", "LeBlanc",
+    "Lee Sin", "Leona", "Lillia", "Lissandra", "Lucian", "Lulu", "Lux", "Malphite",
+    "Malzahar", "Maokai", "Master Yi", "Mel", "Milio", "Miss Fortune", "Mordekaiser",
+    "Morgana", "Naafiri", "Nami", "Nasus", "Nautilus", "Neeko", "Nidalee", "Nilah",
+    "Nocturne", "Nunu & Willump", "Olaf", "Orianna", "Ornn", "Pantheon", "Poppy",
+    "Pyke", "Qiyana", "Quinn", "Rakan", "Rammus", "Rek'Sai", "Rell", "Renata Glasc",
+    "Renekton", "Rengar", "Riven", "Rumble", "Ryze", "Samira", "Sejuani", "Senna",
+    "Seraphine", "Sett", "Shaco", "Shen", "Shyvana", "Singed", "Sion", "Sivir",
+    "Skarner", "Smolder", "Sona", "Soraka", "Swain", "Sylas", "Syndra", "Tahm Kench",
+    "Taliyah", "Talon", "Taric", "Teemo", "Thresh", "Tristana", "Trundle",
+    "Tryndamere", "Twisted Fate", "Twitch", "Udyr", "Urgot", "Varus", "Vayne",
+    "Veigar", "Vel'Koz", "Vex", "Vi", "Viego", "Viktor", "Vladimir", "Volibear",
+    "Warwick", "Wukong", "Xayah", "Xerath", "Xin Zhao", "Yasuo", "Yone", "Yorick",
+    "Yunara", "Yuumi", "Zac", "Zed", "Zeri", "Ziggs", "Zilean", "Zoe", "Zyra",
+]
+
+
+def roster_payload() -> List[dict]:
+    """Grid-champions style payload for the roster (IDs are placeholders)."""
+    return [{"id": champ_id, "name": name} for champ_id, name in enumerate(ROSTER, 1)]
+
+
+def time_per_call(func: Callable, inputs: list, rounds: int = 200) -> float:
+    """Average microseconds per call of func over inputs."""
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for value in inputs:
+            func(value)
+    elapsed = time.perf_counter() - start
+    return elapsed / (rounds * len(inputs)) * 1e6
+
+
+def bench_registry() -> Dict[str, float]:
+    """ChampionRegistry lookups over the full roster."""
+    registry = ChampionRegistry(rengar=None)
+
+    start = time.perf_counter()
+    registry._parse_data(roster_payload())
+    build_us = (time.perf_counter() - start) * 1e6
+
+    exact = [name.lower() for name in ROSTER]
+    loose = ["kaisa", "Kai'Sa", "nunu", "drmundo", "jarvan", "mf", "tf", "chogath"]
+    fuzzy = ["yasou", "kasadin", "heimer", "blitz", "mordekaser", "zzz"]
+    ids = [champ_id for champ_id in range(1, len(ROSTER) + 1)]
+
+    return {
+        "roster_size": len(ROSTER),
+        "build_us": round(build_us, 2),
+        "get_id_exact_us": round(time_per_call(registry.get_id, exact), 3),
+        "get_id_loose_us": round(time_per_call(registry.get_id, loose), 3),
+        "get_name_us": round(time_per_call(registry.get_name, ids), 3),
+        "get_suggestions_us": round(time_per_call(registry.get_suggestions, fuzzy), 3),
+    }
+
+
+# MockLCU settings for the transport benchmarks (set from the command line)
+MOCK_OPTIONS = {"latency": 0.0, "jitter": 0.0}
+TRANSPORT_ENDPOINT = "/lol-summoner/v1/current-summoner"
+
+
+def _latency_summary(metrics: RequestMetrics, elapsed: float) -> Dict[str, float]:
+    stats = metrics.snapshot()
+    endpoint = stats["endpoints"][f"GET {TRANSPORT_ENDPOINT}"]
+    return {
+        "requests": endpoint["count"],
+        "errors": endpoint["errors"],
+        "throughput_rps": round(endpoint["count"] / elapsed, 1),
+        "p50_ms": endpoint["p50_ms"],
+        "p95_ms": endpoint["p95_ms"],
+        "p99_ms": endpoint["p99_ms"],
+    }
+
+
+def bench_transport(requests_per_run: int = 500, threads: int = 8, cold_runs: int = 50) -> Dict[str, dict]:
+    """lcu_request throughput and latency against a local MockLCU."""
+    results = {}
+    with MockLCU(latency=MOCK_OPTIONS["latency"], jitter=MOCK_OPTIONS["jitter"]) as mock:
+        credentials = mock.credentials()
+
+        # Cold: a fresh Rengar (new TLS connection) for every request
+        metrics = RequestMetrics()
+        start = time.perf_counter()
+        for _ in range(cold_runs):
+            rengar = Rengar(credentials=credentials, coalesce=False, metrics=metrics)
+            rengar.lcu_request("GET", TRANSPORT_ENDPOINT, "")
+            rengar.close()
+        results["cold"] = _latency_summary(metrics, time.perf_counter() - start)
+
+        # Warm, single thread: one keep-alive connection reused
+        metrics = RequestMetrics()
+        rengar = Rengar(credentials=credentials, coalesce=False, metrics=metrics)
+        rengar.lcu_request("GET", TRANSPORT_ENDPOINT, "")
+        metrics.reset()
+        start = time.perf_counter()
+        for _ in range(requests_per_run):
+            rengar.lcu_request("GET", TRANSPORT_ENDPOINT, "")
+        results["warm_single"] = _latency_summary(metrics, time.perf_counter() - start)
+
+        # Warm, several threads sharing one Rengar and its connection pool
+        metrics.reset()
+        per_thread = max(1, requests_per_run // threads)
+
+        def worker():
+            for _ in range(per_thread):
+                rengar.lcu_request("GET", TRANSPORT_ENDPOINT, "")
+
+        workers = [threading.Thread(target=worker) for _ in range(threads)]
+        start = time.perf_counter()
+        for thread in workers:
+            thread.start()
+        for thread in workers:
+            thread.join()
+        results[f"warm_{threads}_threads"] = _latency_summary(metrics, time.perf_counter() - start)
+        rengar.close()
+
+    return results
+
+
+@contextmanager
+def _mock_process() -> Iterator[ClientCredentials]:
+    """A MockLCU in its own process, so the server does not compete for this one's GIL."""
+    process = subprocess.Popen(
+        [sys.executable, MockLCU.__module__ + ".py",
+         "--latency-ms", str(MOCK_OPTIONS["latency"] * 1000), "--jitter-ms", str(MOCK_OPTIONS["jitter"] * 1000)],
+        cwd=os.path.dirname(os.path.abspath(__file__)), stdout=subprocess.PIPE, text=True,
+    )
+    try:
+        server = json.loads(process.stdout.readline())
+        yield ClientCredentials(pid=process.pid, lcu_port=server["port"], lcu_token=server["token"],
+                                riot_port=server["port"], riot_token=server["token"])
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def bench_rotation(threads: int = 32, duration: float = 2.0, rotate_every: float = 0.05) -> Dict[str, dict]:
+    """
+    Many threads sharing one Rengar while its credentials flip between two
+    MockLCUs. Any request sent with one client's port and the other's token
+    gets a 401, so errors and wrong_responses must stay at 0 (the run fails
+    otherwise). Runs with the default pool and with one connection per thread.
+    """
+    results = {}
+    with _mock_process() as first, _mock_process() as second:
+        credentials = [first, second]
+
+        for pool_size in sorted({DEFAULT_POOL_SIZE, threads}):
+            metrics = RequestMetrics()
+            rengar = Rengar(pool_size=pool_size, credentials=credentials[0], coalesce=False, metrics=metrics)
+            stop = threading.Event()
+            failures = []
+            swaps = 0
+
+            def worker():
+                while not stop.is_set():
+                    try:
+                        response = rengar.lcu_request("GET", TRANSPORT_ENDPOINT, "")
+                        if response.status_code != 200:
+                            failures.append(response.status_code)
+                    except Exception as e:
+                        failures.append(type(e).__name__)
+
+            workers = [threading.Thread(target=worker) for _ in range(threads)]
+            start = time.perf_counter()
+            for thread in workers:
+                thread.start()
+            while time.perf_counter() - start < duration:
+                time.sleep(rotate_every)
+                swaps += 1
+                rengar.apply_credentials(credentials[swaps % 2])
+            stop.set()
+            for thread in workers:
+                thread.join()
+            elapsed = time.perf_counter() - start
+            rengar.close()
+
+            summary = _latency_summary(metrics, elapsed)
+            summary.update(swaps=swaps, wrong_responses=len(failures))
+            results[f"pool_{pool_size}"] = summary
+
+    return results
+
+
+def bench_champ_select(rounds: int = 20) -> Dict[str, dict]:
+    """InstalockAutoban decision latency replaying a synthetic draft."""
+    results = {}
+    logging.disable(logging.INFO)
+    try:
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "draft.ndjson.gz")
+            write_recording(path, synthetic_draft(roster_payload()))
+
+            for mode in ("engine", "poll"):
+                latencies = []
+                report = None
+                for _ in range(rounds):
+                    report = replay(path, mode=mode)
+                    latencies.extend(d.latency_ms for d in report.decisions)
+                results[mode] = {
+                    "decisions": len(report.decisions),
+                    "missed": len(report.missed),
+                    "requests_per_session": sum(report.requests.values()),
+                    "decision_p50_ms": round(statistics.median(latencies), 3) if latencies else None,
+                    "decision_max_ms": round(max(latencies), 3) if latencies else None,
+                }
+    finally:
+        logging.disable(logging.NOTSET)
+    return results
+
+
+def session_payload() -> bytes:
+    """A mid-draft champ select session about the size the client sends."""
+    records = synthetic_draft(roster_payload())
+    session = next(r["data"] for r in records if r["type"] == "session" and r["data"]
+                   and any(a.get("completed") for group in r["data"]["actions"] for a in group))
+
+    def member(cell: int) -> dict:
+        return {
+            "assignedPosition": "middle", "cellId": cell, "championId": 0, "championPickIntent": 0,
+            "entitledFeatureType": "NONE", "gameName": f"Player{cell}", "internalName": "",
+            "isHumanoid": False, "nameVisibilityType": "VISIBLE", "obfuscatedPuuid": "",
+            "obfuscatedSummonerId": 0, "pickMode": 0, "pickTurn": 0, "playerAlias": "",
+            "playerType": "PLAYER", "puuid": f"{cell:08d}-0000-4000-8000-000000000000",
+            "selectedSkinId": 0, "spell1Id": 4, "spell2Id": 14, "summonerId": 1000 + cell,
+            "tagLine": "EUW", "team": 1 if cell < 5 else 2, "wardSkinId": -1,
+        }
+
+    session.update({
+        "myTeam": [member(cell) for cell in range(5)],
+        "theirTeam": [member(cell) for cell in range(5, 10)],
+        "benchChampions": [], "benchEnabled": False, "boostableSkinCount": 1,
+        "chatDetails": {"mucJwtDto": {"channelClaim": "", "domain": "champ-select", "jwt": "x" * 700,
+                                      "targetRegion": "euw1"},
+                        "multiUserChatId": "c1~" + "f" * 40, "multiUserChatPassword": "p" * 40},
+        "counter": 42, "hasSimultaneousBans": True, "hasSimultaneousPicks": False,
+        "isCustomGame": False, "isSpectating": False, "allowRerolling": False,
+        "pickOrderSwaps": [{"cellId": cell, "id": cell, "state": "AVAILABLE"} for cell in range(10)],
+        "trades": [{"cellId": cell, "id": cell, "state": "INVALID"} for cell in range(10)],
+        "timer": {"adjustedTimeLeftInPhase": 27000, "internalNowInEpochMs": 1700000000000,
+                  "isInfinite": False, "phase": "BAN_PICK", "totalTimeInPhase": 30000},
+    })
+    return json.dumps(session).encode("utf-8")
+
+
+def bench_decode(rounds: int = 2000) -> Dict[str, float]:
+    """Decoding a champ select session: requests.Response vs LCUResponse."""
+    body = session_payload()
+    headers = {"Content-Type": "application/json"}
+
+    def via_requests(_):
+        # What ChampSelectSession did: decode to text, scan it, then parse
+        response = requests.Response()
+        response._content = body
+        response.status_code = 200
+        response.encoding = requests.utils.get_encoding_from_headers(headers)
+        if "RPC_ERROR" not in response.text:
+            response.json()
+
+    def via_lcu_response(_):
+        response = LCUResponse.LCUResponse(200, body, headers)
+        if not response.is_error:
+            response.json()
+
+    results = {
+        "payload_bytes": len(body),
+        "requests_text_scan_json_us": round(time_per_call(via_requests, [None], rounds), 2),
+        "lcu_response_us": round(time_per_call(via_lcu_response, [None], rounds), 2),
+    }
+
+    fast_loads = LCUResponse.loads
+    LCUResponse.loads = json.loads
+    try:
+        results["lcu_response_stdlib_json_us"] = round(time_per_call(via_lcu_response, [None], rounds), 2)
+    finally:
+        LCUResponse.loads = fast_loads
+    results["parser"] = fast_loads.__module__
+    return results
+
+
+BENCHMARKS = {
+    "registry": bench_registry,
+    "transport": bench_transport,
+    "rotation": bench_rotation,
+    "champ_select": bench_champ_select,
+    "decode": bench_decode,
+}
+
+
+# Counts that fail a run whenever they are above zero, baseline or not
+FAILURE_COUNTS = ("missed", "errors", "wrong_responses")
+
+
+def _flatten(results: dict, prefix: str = "") -> Dict[str, Optional[float]]:
+    flat = {}
+    for key, value in results.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(_flatten(value, f"{name}."))
+        elif value is None or (isinstance(value, (int, float)) and not isinstance(value, bool)):
+            flat[name] = value
+    return flat
+
+
+def failures(results: dict) -> List[str]:
+    """List figures that fail a run on their own: failure counts above zero and unmeasured timings."""
+    problems = []
+    for name, value in sorted(_flatten(results).items()):
+        figure = name.rsplit(".", 1)[-1]
+        if value is None and figure.endswith(("_us", "_ms")):
+            problems.append(f"{name}: not measured")
+        elif figure in FAILURE_COUNTS and value:
+            problems.append(f"{name}: {value}")
+    return problems
+
+
+def compare(results: dict, baseline: dict, tolerance: float = 0.10) -> List[str]:
+    """
+    List failures of results plus regressions against baseline.
+
+    Figures ending in _us/_ms are better when lower, _rps when higher; other
+    numbers (counts, sizes) are not compared.
+    """
+    current, previous = _flatten(results), _flatten(baseline)
+    regressions = failures(results)
+    for name, before in sorted(previous.items()):
+        after = current.get(name)
+        if after is None or not before:
+            continue
+        change = (after - before) / before
+        if name.endswith(("_us", "_ms")) and change > tolerance:
+            regressions.append(f"{name}: {before} -> {after} (+{change:.0%})")
+        elif name.endswith("_rps") and -change > tolerance:
+            regressions.append(f"{name}: {before} -> {after} ({change:.0%})")
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run offline benchmarks")
+    parser.add_argument("names", nargs="*", help=f"benchmarks to run (default: all of {', '.join(BENCHMARKS)})")
+    parser.add_argument("--out", help="also write the results to this JSON file")
+    parser.add_argument("--baseline", help="compare against results stored in this JSON file")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="allowed relative regression")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="MockLCU response latency")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="MockLCU latency jitter")
+    args = parser.parse_args()
+
+    selected = args.names or list(BENCHMARKS)
+    unknown = [name for name in selected if name not in BENCHMARKS]
+    if unknown:
+        print(f"Unknown benchmark(s): {', '.join(unknown)}. Available: {', '.join(BENCHMARKS)}")
+        sys.exit(1)
+
+    MOCK_OPTIONS.update(latency=args.latency_ms / 1000, jitter=args.jitter_ms / 1000)
+    results = {name: BENCHMARKS[name]() for name in selected}
+    print(json.dumps(results, indent=2))
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+    else:
+        regressions = failures(results)
+    for regression in regressions:
+        print(f"REGRESSION {regression}", file=sys.stderr)
+    if regressions:
+        sys.exit(2)
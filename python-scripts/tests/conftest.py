@@ -0,0 +1,33 @@
+import os
+import sys
+import time
+
+import pytest
+
+# The scripts import each other as top-level modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from MockLCU import MockLCU  # noqa: E402
+from Rengar import Rengar  # noqa: E402
+
+
+def wait_for(predicate, timeout=5.0):
+    """Poll predicate until it holds; fail the test after timeout seconds."""
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            raise AssertionError("condition not met in time")
+        time.sleep(0.01)
+
+
+@pytest.fixture
+def mock():
+    with MockLCU() as server:
+        yield server
+
+
+@pytest.fixture
+def rengar(mock):
+    client = Rengar(credentials=mock.credentials())
+    yield client
+    client.close()
@@ -0,0 +1,67 @@
+"""ChampionRegistry's patch-keyed roster cache."""
+
+import json
+import time
+
+from ChampSelectReplay import SESSION_URI, FakeRengar
+from InstalockAutoban import InstalockAutoban
+from conftest import wait_for
+
+OLD_ROSTER = [{"id": 103, "name": "Ahri"}, {"id": 238, "name": "Zed"}]
+NEW_ROSTER = OLD_ROSTER + [{"id": 904, "name": "Yunara"}]
+
+
+class RestartingRengar(FakeRengar):
+    """FakeRengar whose client can be down."""
+
+    down = False
+
+    def lcu_request(self, method, endpoint, body, timeout=None):
+        if self.down:
+            raise ConnectionError("League client not running")
+        return super().lcu_request(method, endpoint, body, timeout)
+
+
+class SlowRengar(FakeRengar):
+    """FakeRengar that takes a while to answer."""
+
+    def lcu_request(self, method, endpoint, body, timeout=None):
+        time.sleep(0.02)
+        return super().lcu_request(method, endpoint, body, timeout)
+
+
+def test_new_session_picks_up_a_client_patch(tmp_path):
+    cache_path = tmp_path / "roster.json"
+    cache_path.write_text(json.dumps({"key": ["14.20.1", "en_US"], "champions": OLD_ROSTER}))
+
+    # The client is not reachable when the bot starts, so the startup check fails
+    rengar = RestartingRengar(NEW_ROSTER, "14.21.1", "en_US")
+    rengar.down = True
+    bot = InstalockAutoban(rengar=rengar, roster_cache_path=str(cache_path))
+    wait_for(lambda: not bot.registry._refresh_thread.is_alive())
+    assert bot.registry.get_id("Yunara") == -1
+
+    # Once a session starts on the patched client the roster is refreshed
+    rengar.down = False
+    bot.start_engine()
+    rengar.push({"uri": SESSION_URI, "eventType": "Create",
+                 "data": {"gameId": 9, "localPlayerCellId": 0, "actions": []}})
+
+    wait_for(lambda: bot.registry.get_id("Yunara") == 904)
+    assert json.loads(cache_path.read_text())["key"] == ["14.21.1", "en_US"]
+    bot.stop()
+
+
+def test_unchanged_patch_loads_availability_once(tmp_path):
+    cache_path = tmp_path / "roster.json"
+    cache_path.write_text(json.dumps({"key": ["14.20.1", "en_US"], "champions": OLD_ROSTER}))
+    owned = [dict(champ, ownership={"owned": True}) for champ in OLD_ROSTER]
+
+    rengar = SlowRengar(owned, "14.20.1", "en_US")
+    bot = InstalockAutoban(rengar=rengar, roster_cache_path=str(cache_path))
+    wait_for(lambda: not bot.registry._refresh_thread.is_alive())
+    time.sleep(0.1)
+
+    fetches = [call for call in rengar.calls if call[2] == "/lol-champions/v1/owned-champions-minimal"]
+    assert len(fetches) == 1
+    assert bot.registry.availability.get_ids() == {103, 238}
@@ -0,0 +1,61 @@
+"""CredentialWatcher ticks and how Rengar applies what it publishes."""
+
+import pytest
+
+import Credentials
+from Credentials import ClientCredentials, CredentialWatcher
+from Rengar import Rengar
+
+CLIENT = ClientCredentials(pid=1, lcu_port="1", lcu_token="token", riot_port="2", riot_token="riot")
+
+
+@pytest.fixture
+def scans(monkeypatch):
+    calls = []
+
+    def discover(refresh=False):
+        calls.append(refresh)
+        return CLIENT
+
+    monkeypatch.setattr(Credentials, "discover_credentials", discover)
+    monkeypatch.setattr(Credentials, "_from_lockfile", lambda hint: None)
+    monkeypatch.setattr(Credentials, "is_client_alive", lambda pid: True)
+    return calls
+
+
+def test_rewritten_lockfile_with_same_credentials_is_not_rescanned(scans, monkeypatch):
+    mtime = [1]
+    monkeypatch.setattr(Credentials, "_lockfile_mtime", lambda creds: mtime[0] if creds else None)
+    watcher = CredentialWatcher(scan_every=1)
+    assert watcher.check()
+
+    mtime[0] = 2
+    assert not watcher.check()
+    assert not watcher.check()
+    assert scans == [False, True]
+
+
+@pytest.mark.parametrize("scan_every, expected", [(1, 3), (2, 2), (5, 1)])
+def test_process_scan_runs_every_scan_every_ticks(monkeypatch, scan_every, expected):
+    scans = []
+    monkeypatch.setattr(Credentials, "discover_credentials", lambda refresh=False: scans.append(refresh))
+    monkeypatch.setattr(Credentials, "_from_lockfile", lambda hint: None)
+    watcher = CredentialWatcher(scan_every=scan_every)
+    for _ in range(3):
+        watcher.check()
+    assert len(scans) == expected
+
+
+def test_unchanged_credentials_keep_the_event_socket(monkeypatch):
+    rengar = Rengar(credentials=CLIENT)
+    reconnects = []
+    rengar.events = type("Events", (), {"reconnect": lambda self: reconnects.append(1)})()
+    league = rengar.leagueConnection
+
+    rengar.apply_credentials(CLIENT)
+    assert reconnects == [] and rengar.leagueConnection is league
+
+    rengar.apply_credentials(ClientCredentials(pid=2, lcu_port="3", lcu_token="new"))
+    assert reconnects == [1] and rengar.leagueConnection.port == "3"
+    rengar.events = None
+    rengar.close()
@@ -0,0 +1,82 @@
+"""InstalockAutoban's event engine, driven through ChampSelectReplay.FakeRengar."""
+
+import pytest
+
+from ChampSelectReplay import SESSION_URI, FakeRengar, _response
+from InstalockAutoban import InstalockAutoban
+
+ROSTER = [{"id": 103, "name": "Ahri"}, {"id": 238, "name": "Zed"}, {"id": 1, "name": "Annie"}]
+
+
+class FlakyRengar(FakeRengar):
+    """Fails the first `failures` completing action PATCHes with a 500."""
+
+    def __init__(self, failures=0):
+        super().__init__(ROSTER, "14.20.1", "en_US")
+        self.failures = failures
+
+    def lcu_request(self, method, endpoint, body, timeout=None):
+        if method.upper() == "PATCH" and (body or {}).get("completed") and self.failures > 0:
+            self.failures -= 1
+            self.calls.append((0.0, "PATCH", endpoint, body))
+            return _response(500, {"errorCode": "RPC_ERROR", "httpStatus": 500})
+        return super().lcu_request(method, endpoint, body, timeout)
+
+    def completed_patches(self):
+        return [body for _, method, _, body in self.calls if method == "PATCH" and body.get("completed")]
+
+
+def pick_turn(timer=30000):
+    return {
+        "gameId": 1,
+        "localPlayerCellId": 0,
+        "actions": [[{"id": 5, "actorCellId": 0, "type": "pick", "championId": 0,
+                      "isInProgress": True, "completed": False}]],
+        "bans": {"myTeamBans": [], "theirTeamBans": []},
+        "timer": {"adjustedTimeLeftInPhase": timer},
+    }
+
+
+@pytest.fixture
+def make_bot(tmp_path):
+    bots = []
+
+    def make(rengar):
+        bot = InstalockAutoban(rengar=rengar, roster_cache_path=str(tmp_path / "roster.json"))
+        bot.set_instalock_champion("Ahri")
+        bot.start_engine()
+        bots.append(bot)
+        return bot
+
+    yield make
+    for bot in bots:
+        bot.stop()
+
+
+def push(rengar, session):
+    rengar.session = session
+    rengar.push({"uri": SESSION_URI, "eventType": "Update", "data": session})
+
+
+def test_failed_pick_is_retried_on_unchanged_updates(make_bot):
+    rengar = FlakyRengar(failures=1)
+    bot = make_bot(rengar)
+
+    for timer in (30000, 29000, 28000):
+        push(rengar, pick_turn(timer))
+
+    assert [body["championId"] for body in rengar.completed_patches()] == [103, 103]
+    assert 5 in bot._processed_actions
+
+
+def test_enabling_instalock_mid_turn_picks(make_bot):
+    rengar = FlakyRengar()
+    bot = make_bot(rengar)
+    bot.instalock_enabled = False
+
+    push(rengar, pick_turn(30000))
+    assert rengar.completed_patches() == []
+
+    bot.instalock_enabled = True
+    push(rengar, pick_turn(29000))
+    assert [body["championId"] for body in rengar.completed_patches()] == [103]
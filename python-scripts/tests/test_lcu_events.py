@@ -0,0 +1,85 @@
+"""LCUEventClient against the MockLCU WAMP websocket."""
+
+import time
+
+from Credentials import CredentialWatcher
+from MockLCU import MockLCU
+from conftest import wait_for
+
+PHASE_URI = "/lol-gameflow/v1/gameflow-phase"
+SESSION_URI = "/lol-champ-select/v1/session"
+
+
+def test_subscribe_dispatches_by_prefix(mock, rengar):
+    phases, champ_select = [], []
+    rengar.subscribe(PHASE_URI, phases.append)
+    rengar.subscribe("/lol-champ-select/", champ_select.append)
+    wait_for(lambda: mock.subscribers() == 1)
+
+    mock.publish("/lol-lobby/v2/lobby", {"gameConfig": {}})
+    mock.publish(PHASE_URI, "ChampSelect")
+    mock.publish(SESSION_URI, {"gameId": 7}, event_type="Create")
+    wait_for(lambda: phases and champ_select)
+
+    assert phases == [{"uri": PHASE_URI, "eventType": "Update", "data": "ChampSelect"}]
+    assert champ_select == [{"uri": SESSION_URI, "eventType": "Create", "data": {"gameId": 7}}]
+
+
+def test_unsubscribe_stops_delivery(mock, rengar):
+    phases, sessions = [], []
+    rengar.subscribe(PHASE_URI, phases.append)
+    rengar.subscribe(SESSION_URI, sessions.append)
+    wait_for(lambda: mock.subscribers() == 1)
+
+    rengar.unsubscribe(PHASE_URI, phases.append)
+    mock.publish(PHASE_URI, "Lobby")
+    mock.publish(SESSION_URI, {"gameId": 8})
+    wait_for(lambda: sessions)
+
+    assert phases == []
+
+
+def test_resubscribes_after_client_restart(mock, rengar):
+    port, token = mock.port, mock.token
+    phases = []
+    rengar.subscribe(PHASE_URI, phases.append)
+    rengar.events.reconnect_delay = 0.05
+    wait_for(lambda: mock.subscribers() == 1)
+
+    mock.stop()
+    wait_for(lambda: not rengar.events.connected.is_set())
+
+    with MockLCU(port=port, token=token) as restarted:
+        wait_for(lambda: restarted.subscribers() == 1)
+        restarted.publish(PHASE_URI, "ReadyCheck")
+        wait_for(lambda: phases)
+
+    assert phases[-1]["data"] == "ReadyCheck"
+
+
+def test_waits_for_the_watcher_instead_of_rediscovering(mock, rengar, monkeypatch):
+    port, token = mock.port, mock.token
+    rediscoveries = []
+    monkeypatch.setattr(rengar, "update_league_credentials", lambda refresh=False: rediscoveries.append(refresh))
+    rengar.watcher = CredentialWatcher()
+    rengar.watcher.ready.set()
+
+    phases = []
+    rengar.subscribe(PHASE_URI, phases.append)
+    rengar.events.reconnect_delay = 0.05
+    wait_for(lambda: mock.subscribers() == 1)
+
+    rengar.watcher.ready.clear()
+    mock.stop()
+    wait_for(lambda: not rengar.events.connected.is_set())
+
+    with MockLCU(port=port, token=token) as restarted:
+        time.sleep(0.3)
+        assert restarted.subscribers() == 0
+
+        rengar.watcher.ready.set()
+        wait_for(lambda: restarted.subscribers() == 1)
+        restarted.publish(PHASE_URI, "Lobby")
+        wait_for(lambda: phases)
+
+    assert rediscoveries == []
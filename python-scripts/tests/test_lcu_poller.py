@@ -0,0 +1,33 @@
+"""LCUPoller failure handling."""
+
+from LCUPoller import MATCHMAKING, LCUPoller, Resource, MatchmakingSnapshot
+from LCUResponse import LCUResponse
+from conftest import wait_for
+
+SEARCH_STATE = "/lol-lobby/v2/lobby/matchmaking/search-state"
+
+
+class ScriptedRengar:
+    """Answers every GET with the next scripted body (the last one repeats)."""
+
+    def __init__(self, bodies):
+        self.bodies = list(bodies)
+
+    def lcu_request(self, method, endpoint, body, timeout=None):
+        content = self.bodies.pop(0) if len(self.bodies) > 1 else self.bodies[0]
+        return LCUResponse(200, content)
+
+
+def test_malformed_body_counts_as_failure_and_polling_continues():
+    rengar = ScriptedRengar([b"", b"{not json", b'{"searchState": "Found"}'])
+    poller = LCUPoller(rengar, [Resource(MATCHMAKING, SEARCH_STATE, 0.01, MatchmakingSnapshot)])
+    states = []
+    poller.subscribe(MATCHMAKING, lambda snapshot: states.append(snapshot.search_state))
+    poller.start()
+    try:
+        wait_for(lambda: "Found" in states)
+        assert poller.is_alive()
+        assert states[:2] == [None, None]
+        assert poller._failures.get(MATCHMAKING) is None
+    finally:
+        poller.stop()
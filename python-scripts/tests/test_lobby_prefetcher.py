@@ -0,0 +1,75 @@
+"""Reveal.LobbyPrefetcher against MockLCU's event socket."""
+
+import time
+
+import pytest
+
+import Reveal
+from Summoners import SummonerResolver
+from conftest import wait_for
+
+SESSION_URI = "/lol-champ-select/v1/session"
+SESSION = {
+    "gameId": 11,
+    "localPlayerCellId": 0,
+    "myTeam": [{"cellId": cell, "summonerId": cell + 1, "nameVisibilityType": "VISIBLE"}
+               for cell in range(5)],
+    "actions": [],
+}
+
+
+@pytest.fixture
+def prefetcher(mock, rengar, monkeypatch):
+    monkeypatch.setattr(Reveal, "rengar", rengar)
+    monkeypatch.setattr(Reveal, "resolver", SummonerResolver(rengar))
+    prefetcher = Reveal.LobbyPrefetcher()
+    prefetcher.start()
+    rengar.events.reconnect_delay = 0.05
+    wait_for(lambda: mock.subscribers() == 1)
+    yield mock, rengar, prefetcher
+    prefetcher.stop()
+
+
+def test_url_is_prefetched_and_cleared_on_delete(prefetcher):
+    mock, rengar, lobby = prefetcher
+    mock.publish(SESSION_URI, SESSION, event_type="Create")
+    wait_for(lambda: lobby.current_url())
+    assert "Player1%23MOCK" in lobby.current_url()
+
+    mock.publish(SESSION_URI, None, event_type="Delete")
+    wait_for(lambda: lobby.current_url() is None)
+
+
+def test_url_is_dropped_when_the_event_socket_reconnects(prefetcher):
+    mock, rengar, lobby = prefetcher
+    mock.publish(SESSION_URI, SESSION, event_type="Create")
+    wait_for(lambda: lobby.current_url())
+
+    # The Delete for this lobby would be lost while the socket is down
+    first_connection = rengar.events.connection_id
+    rengar.events.reconnect()
+    wait_for(lambda: rengar.events.connection_id > first_connection and mock.subscribers() == 1)
+
+    assert lobby.current_url() is None
+
+
+def test_timer_updates_share_one_prefetch(prefetcher, monkeypatch):
+    mock, rengar, lobby = prefetcher
+    builds = []
+
+    def slow_build(session, known=None):
+        builds.append(session)
+        time.sleep(0.1)
+        return None, False
+
+    monkeypatch.setattr(Reveal, "build_lobby_url", slow_build)
+    seen = []
+    rengar.subscribe(SESSION_URI, seen.append)
+
+    # An incomplete lobby is re-resolved on updates, but never twice at once
+    for timer in range(30):
+        mock.publish(SESSION_URI, dict(SESSION, timer={"adjustedTimeLeftInPhase": timer}))
+    wait_for(lambda: len(seen) == 30)
+    wait_for(lambda: not lobby._pending)
+
+    assert 1 <= len(builds) <= 3
@@ -0,0 +1,61 @@
+"""The scripts' own calls against MockLCU instead of a live client."""
+
+import pytest
+
+import Backgrounds
+import Badges
+import Dodge
+import Reveal
+import RestartUX
+import disconnect_reconnect_chat
+
+
+@pytest.fixture(autouse=True)
+def scripts(rengar, monkeypatch):
+    for module in (Backgrounds, Badges, Dodge, Reveal, RestartUX, disconnect_reconnect_chat):
+        monkeypatch.setattr(module, "rengar", rengar)
+
+
+def champ_select(mock):
+    mock.state["phase"] = "ChampSelect"
+    mock.state["champ_select"] = {
+        "localPlayerCellId": 0,
+        "actions": [],
+        "myTeam": [{"cellId": cell, "summonerId": cell + 1} for cell in range(5)],
+        "theirTeam": [],
+    }
+
+
+def test_profile_endpoints(mock, rengar):
+    assert Backgrounds.change_profile_background(1001)
+    assert mock.state["current_summoner"]["backgroundSkinId"] == 1001
+
+    Badges._update_player_preferences({"challengeIds": [3, 3, 3], "title": "7"})
+    data = Badges._get_player_data()
+    assert [c["id"] for c in data["topChallenges"]] == [3, 3, 3]
+    assert data["title"]["itemId"] == 7
+
+
+def test_chat_and_client_endpoints(mock, rengar):
+    chat = disconnect_reconnect_chat.Chat()
+    assert chat.return_state() == "ON"
+    assert chat.toggle_chat()
+    assert disconnect_reconnect_chat.Chat().return_state() == "OFF"
+    assert chat.toggle_chat()
+    assert mock.state["chat_session"]["state"] == "connected"
+
+    assert RestartUX.restart()
+    assert mock.state["ux_restarts"] == 1
+
+    response = rengar.lcu_request("GET", "/lol-champions/v1/inventories/local-player/champions", "")
+    assert response.status_code == 200 and len(response.json()) == 170
+
+
+def test_champ_select_endpoints(mock, rengar):
+    assert Reveal._participant_names() == []
+    champ_select(mock)
+    assert Reveal._participant_names() == [f"Player{n}%23MOCK" for n in range(1, 6)]
+
+    assert Dodge.dodge()
+    assert mock.state["champ_select"] is None
+    assert not Dodge.dodge()
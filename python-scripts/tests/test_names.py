@@ -0,0 +1,17 @@
+"""Name folding shared by champion lookup and skin search."""
+
+from Names import name_tokens, normalize_name, trigrams
+
+
+def test_champion_and_skin_names_fold_the_same_way():
+    assert name_tokens("Kai'Sa") == ["kai", "sa"]
+    assert normalize_name("Kai'Sa") == "kaisa"
+    assert name_tokens("Héartbreaker Nunu & Willump") == ["heartbreaker", "nunu", "willump"]
+    assert normalize_name("Nunu & Willump") == "nunuwillump"
+    assert normalize_name("Dr. Mundo") == normalize_name("dr mundo")
+    assert normalize_name("阿狸") == "阿狸"
+
+
+def test_trigram_padding():
+    assert trigrams("ahri") == {"^ah", "ahr", "hri", "ri$"}
+    assert trigrams("ahri", padded=False) == {"ahr", "hri"}
@@ -0,0 +1,49 @@
+"""RemoveFriends bulk deletes and which failures are retried."""
+
+from types import SimpleNamespace
+
+import pytest
+
+import RemoveFriends
+from Resilience import ClientUnavailable
+
+
+class ScriptedRengar:
+    """Answers each DELETE with the next scripted status, or raises it."""
+
+    def __init__(self, script):
+        self.script = list(script)
+        self.sent = []
+
+    def ensure_pool_size(self, workers):
+        pass
+
+    def lcu_request(self, method, endpoint, body, timeout=None):
+        self.sent.append((method, endpoint))
+        result = self.script.pop(0)
+        if isinstance(result, Exception):
+            raise result
+        return SimpleNamespace(status_code=result)
+
+
+def remove(monkeypatch, script):
+    rengar = ScriptedRengar(script)
+    monkeypatch.setattr(RemoveFriends, "rengar", rengar)
+    report = RemoveFriends.remove_friends([{"pid": "friend-1@pvp.net"}], rate=None)
+    return rengar, report.outcomes[0]
+
+
+def test_not_found_after_a_transient_failure_counts_as_removed(monkeypatch):
+    rengar, outcome = remove(monkeypatch, [503, 404])
+    assert outcome.success and outcome.attempts == 2
+
+
+def test_not_found_on_the_first_attempt_fails(monkeypatch):
+    rengar, outcome = remove(monkeypatch, [404])
+    assert not outcome.success
+
+
+@pytest.mark.parametrize("error", [ClientUnavailable("DELETE failed: Connection aborted"), OSError("reset")])
+def test_delete_rengar_gave_up_on_is_not_sent_again(monkeypatch, error):
+    rengar, outcome = remove(monkeypatch, [error, 204])
+    assert not outcome.success and len(rengar.sent) == 1
@@ -0,0 +1,81 @@
+"""Which failed requests Rengar._send repeats."""
+
+from http.client import RemoteDisconnected
+
+import pytest
+import requests
+import urllib3
+
+from Credentials import ClientCredentials, CredentialWatcher
+from Rengar import Rengar
+from Resilience import ClientUnavailable, DeadlineExceeded, RetryPolicy
+
+
+def connection_aborted():
+    return requests.exceptions.ConnectionError(
+        urllib3.exceptions.ProtocolError("Connection aborted.", RemoteDisconnected("closed")))
+
+
+def connection_refused():
+    reason = urllib3.exceptions.NewConnectionError(None, "Connection refused")
+    return requests.exceptions.ConnectionError(
+        urllib3.exceptions.MaxRetryError(None, "/", reason=reason))
+
+
+@pytest.fixture
+def rengar(monkeypatch):
+    credentials = ClientCredentials(pid=1, lcu_port="1", lcu_token="token")
+    client = Rengar(credentials=credentials, coalesce=False,
+                    retry_policy=RetryPolicy(base_delay=0.0, max_delay=0.0))
+    client.sent = []
+
+    def timed(session, base_url, method, endpoint, body, timeout):
+        client.sent.append(method)
+        raise client.failure()
+
+    monkeypatch.setattr(client, "_timed", timed)
+    yield client
+    client.close()
+
+
+@pytest.mark.parametrize("method", ["POST", "PATCH", "DELETE"])
+def test_write_is_not_repeated_after_the_connection_dropped(rengar, method):
+    rengar.failure = connection_aborted
+    with pytest.raises(ClientUnavailable):
+        rengar.lcu_request(method, "/lol-chat/v1/friends/x", "")
+    assert rengar.sent == [method]
+
+
+def test_write_is_repeated_when_it_never_left(rengar):
+    rengar.failure = connection_refused
+    with pytest.raises(ClientUnavailable):
+        rengar.lcu_request("POST", "/lol-matchmaking/v1/ready-check/accept", "")
+    assert rengar.sent == ["POST"] * rengar.retry_policy.attempts
+
+
+def test_get_is_repeated_after_the_connection_dropped(rengar):
+    rengar.failure = connection_aborted
+    with pytest.raises(ClientUnavailable):
+        rengar.lcu_request("GET", "/lol-gameflow/v1/gameflow-phase", "")
+    assert rengar.sent == ["GET"] * rengar.retry_policy.attempts
+
+
+def test_watched_rengar_waits_for_the_watcher_instead_of_rescanning(rengar, monkeypatch):
+    rescans = []
+    monkeypatch.setattr(rengar, "update_league_credentials", lambda refresh=False: rescans.append(refresh))
+    rengar.watcher = CredentialWatcher()
+    rengar.failure = connection_refused
+
+    with pytest.raises(DeadlineExceeded):
+        rengar.lcu_request("GET", "/lol-gameflow/v1/gameflow-phase", "", timeout=0.2)
+    assert rengar.sent == ["GET"] and rescans == []
+
+
+def test_watched_rengar_fails_at_once_while_the_client_is_closed(rengar):
+    rengar.watcher = CredentialWatcher()
+    rengar.apply_credentials(None)
+    rengar.failure = connection_refused
+
+    with pytest.raises(ClientUnavailable):
+        rengar.lcu_request("GET", "/lol-gameflow/v1/gameflow-phase", "", timeout=5.0)
+    assert rengar.sent == []
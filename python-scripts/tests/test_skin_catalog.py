@@ -0,0 +1,50 @@
+"""SkinCatalog loading when the skin source is unreachable."""
+
+import json
+import os
+import time
+
+import pytest
+import requests
+
+from SkinCatalog import METADATA_PATH, SKINS_PATH, MirrorSource, SkinCatalog
+
+SKINS = {
+    "103000": {"isBase": True, "name": "Ahri", "loadScreenPath": "/ASSETS/Characters/Ahri/Skins/Base/x.jpg"},
+}
+
+
+class OfflineSource:
+    def version(self):
+        raise requests.ConnectionError("offline")
+
+    def fetch_skins(self):
+        raise requests.ConnectionError("offline")
+
+
+@pytest.fixture
+def mirror(tmp_path):
+    directory = tmp_path / "cdragon"
+    (directory / os.path.dirname(SKINS_PATH)).mkdir(parents=True)
+    (directory / SKINS_PATH).write_text(json.dumps(SKINS))
+    (directory / METADATA_PATH).write_text(json.dumps({"version": "14.20.1"}))
+    return MirrorSource(str(directory))
+
+
+def test_stale_catalog_is_served_when_source_is_offline(tmp_path, mirror):
+    path = str(tmp_path / "skins.bin")
+    SkinCatalog(mirror, path).ensure_loaded()
+    two_days_ago = time.time() - 2 * 24 * 60 * 60
+    os.utime(path, (two_days_ago, two_days_ago))
+
+    catalog = SkinCatalog(OfflineSource(), path)
+    catalog.ensure_loaded()
+
+    assert [name for name, *_ in catalog.champions()] == ["Ahri"]
+    # The failed check is not retried on every load
+    assert time.time() - os.path.getmtime(path) < 24 * 60 * 60
+
+
+def test_missing_catalog_raises_when_source_is_offline(tmp_path):
+    with pytest.raises(requests.ConnectionError):
+        SkinCatalog(OfflineSource(), str(tmp_path / "skins.bin")).ensure_loaded()